@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Benchmark das ferramentas — validate, analyze e package sobre bibliotecas sintéticas
+
+Uso:
+    benchmarks/bench_ferramentas.py [--repeticoes <n>] [--ferramentas <lista>]
+        [--json <arquivo>] [--baseline <arquivo>] [--tolerancia <pct>]
+        [opções do gerador: --habilidades <n> --linhas-skill <n> ...]
+
+Exemplos:
+    benchmarks/bench_ferramentas.py --json benchmarks/baseline.json
+    benchmarks/bench_ferramentas.py --baseline benchmarks/baseline.json
+    benchmarks/bench_ferramentas.py --ferramentas validate --habilidades 1000 --repeticoes 3
+
+Mede, para cada ferramenta, o tempo de parede de um processo novo:
+    - partida: habilidade mínima (modelo do forge_init), dominada pela
+      inicialização do interpretador e pelos imports
+    - habilidade: uma habilidade gerada com os parâmetros dados
+    - biblioteca: todas as habilidades (validate --library, analyze
+      --library com índice novo a cada repetição, package de cada uma em
+      um único processo)
+    - cadeia: forge.py validate package com opções de um só comando
+      (--verbose, --output, --jobs), que cada um precisa receber sozinho
+
+A biblioteca vem de gerar_biblioteca.py (conteúdo determinístico) e o
+cache das ferramentas aponta para um diretório temporário vazio, então
+as medições não dependem do que já está em ~/.cache/skill-forge.
+
+Com --json os resultados (mediana, mínimo e amostras de cada caso) são
+gravados; com --baseline são comparados a um arquivo gravado antes, e
+casos mais lentos que a baseline além de --tolerancia (padrão 10%)
+fazem o script sair com código 1. Um caso cujo processo termina com
+erro também faz o script sair com código 1: a medição não vale nada.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+from datetime import datetime
+
+from gerar_biblioteca import SCRIPTS, ParametrosBiblioteca, gerar_biblioteca, gerar_habilidade, ler_parametros
+
+
+# Versão do formato do JSON de resultados
+VERSAO_RESULTADOS = 1
+
+FERRAMENTAS = ('validate', 'analyze', 'package')
+
+# Empacota todas as habilidades da biblioteca em um único processo
+EMPACOTAR_BIBLIOTECA = (
+    "import sys; sys.path.insert(0, sys.argv[1]); "
+    "from forge_package import empacotar_habilidade; "
+    "from forge_validate import encontrar_habilidades; "
+    "[empacotar_habilidade(str(h), sys.argv[3]) for h in encontrar_habilidades(sys.argv[2])]"
+)
+
+
+def medir(comando: list[str], repeticoes: int, ambiente: dict, antes=None) -> dict:
+    """
+    Tempo de parede de um processo novo, repetido.
+    
+    Args:
+        comando: Comando a executar
+        repeticoes: Número de execuções
+        ambiente: Variáveis de ambiente do processo
+        antes: Função chamada antes de cada execução (fora da medição)
+    
+    Returns:
+        Dicionário com mediana_ms, minimo_ms, amostras_ms e codigo (o
+        primeiro código de saída diferente de 0, ou 0)
+    """
+    amostras = []
+    codigo = 0
+    for _ in range(repeticoes):
+        if antes:
+            antes()
+        inicio = time.perf_counter()
+        processo = subprocess.run(comando, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=ambiente, check=False)
+        amostras.append(round((time.perf_counter() - inicio) * 1000, 2))
+        codigo = codigo or processo.returncode
+    return {
+        'mediana_ms': round(statistics.median(amostras), 2),
+        'minimo_ms': min(amostras),
+        'amostras_ms': amostras,
+        'codigo': codigo,
+    }
+
+
+def casos(ferramentas: list[str], minima: Path, habilidade: Path, biblioteca: Path, temporario: Path) -> dict:
+    """Comando e preparação de cada caso: nome -> (comando, antes)."""
+    python = sys.executable
+    saida = temporario / 'pacotes'
+    indice = temporario / 'indice.sqlite'
+    
+    def limpar_saida():
+        shutil.rmtree(saida, ignore_errors=True)
+        saida.mkdir()
+    
+    def limpar_indice():
+        indice.unlink(missing_ok=True)
+    
+    roteiro = {
+        'validate': {
+            'partida': ([str(minima)], None),
+            'habilidade': ([str(habilidade)], None),
+            'biblioteca': (['--library', str(biblioteca)], None),
+        },
+        'analyze': {
+            'partida': ([str(minima)], None),
+            'habilidade': ([str(habilidade)], None),
+            'biblioteca': (['--library', str(biblioteca), '--index', str(indice)], limpar_indice),
+        },
+        'package': {
+            'partida': ([str(minima), '--output', str(saida)], limpar_saida),
+            'habilidade': ([str(habilidade), '--output', str(saida)], limpar_saida),
+        },
+    }
+    resultado = {}
+    for ferramenta in ferramentas:
+        script = str(SCRIPTS / f"forge_{ferramenta}.py")
+        for caso, (argumentos, antes) in roteiro[ferramenta].items():
+            resultado[f"{ferramenta}.{caso}"] = ([python, script, *argumentos], antes)
+    if 'package' in ferramentas:
+        resultado['package.biblioteca'] = (
+            [python, '-c', EMPACOTAR_BIBLIOTECA, str(SCRIPTS), str(biblioteca), str(saida)], limpar_saida
+        )
+    if 'validate' in ferramentas and 'package' in ferramentas:
+        resultado['forge.cadeia'] = ([
+            python, str(SCRIPTS / 'forge.py'), 'validate', 'package', str(habilidade),
+            '--verbose', '--output', str(saida), '--jobs', '1',
+        ], limpar_saida)
+    return resultado
+
+
+def executar(parametros: ParametrosBiblioteca, ferramentas: list[str], repeticoes: int) -> dict:
+    """Gera a biblioteca, mede todos os casos e retorna o documento de resultados."""
+    temporario = Path(tempfile.mkdtemp(prefix='forge-bench-'))
+    try:
+        print(f"🏗️  Gerando {parametros.habilidades} habilidade(s) em {temporario}...")
+        biblioteca = temporario / 'biblioteca'
+        habilidades = gerar_biblioteca(biblioteca, parametros)
+        (temporario / 'minima').mkdir()
+        minima = gerar_habilidade(
+            temporario / 'minima', 0, ParametrosBiblioteca(linhas_skill=0, references=0, assets=0)
+        )
+        (temporario / 'pacotes').mkdir()
+        
+        # Cache vazio e isolado: mede o trabalho, não o que já estava em disco
+        ambiente = dict(os.environ)
+        ambiente['FORGE_CACHE_DIR'] = str(temporario / 'cache')
+        
+        resultados = {}
+        for nome, (comando, antes) in casos(ferramentas, minima, habilidades[0], biblioteca, temporario).items():
+            resultados[nome] = medir(comando, repeticoes, ambiente, antes)
+            falha = f"  ❌ saiu com código {resultados[nome]['codigo']}" if resultados[nome]['codigo'] else ''
+            print(f"   {nome:<22} {resultados[nome]['mediana_ms']:>10.1f} ms{falha}")
+    finally:
+        shutil.rmtree(temporario, ignore_errors=True)
+    
+    return {
+        'versao': VERSAO_RESULTADOS,
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+        'repeticoes': repeticoes,
+        'parametros': parametros.como_dict(),
+        'casos': resultados,
+    }
+
+
+def comparar(atual: dict, baseline: dict, tolerancia: float) -> tuple[list[str], int]:
+    """
+    Compara as medianas com a baseline.
+    
+    Args:
+        atual: Resultados desta execução
+        baseline: Resultados gravados antes (mesmo formato)
+        tolerancia: Aumento relativo aceito (0.1 = 10%)
+    
+    Returns:
+        Tupla (linhas do relatório, número de regressões)
+    """
+    linhas = []
+    if baseline.get('parametros') != atual['parametros']:
+        linhas.append("⚠️  Parâmetros da biblioteca diferentes dos da baseline: comparação aproximada")
+    if baseline.get('python') != atual['python'] or baseline.get('plataforma') != atual['plataforma']:
+        linhas.append(f"⚠️  Baseline medida em outro ambiente ({baseline.get('python')}, {baseline.get('plataforma')})")
+    
+    linhas.append(f"   {'caso':<22} {'baseline':>10} {'atual':>10} {'variação':>9}")
+    regressoes = 0
+    for nome, medida in atual['casos'].items():
+        base = baseline.get('casos', {}).get(nome)
+        if base is None:
+            linhas.append(f"   {nome:<22} {'—':>10} {medida['mediana_ms']:>7.1f} ms   (novo)")
+            continue
+        variacao = medida['mediana_ms'] / base['mediana_ms'] - 1 if base['mediana_ms'] else 0.0
+        marca = ''
+        if variacao > tolerancia:
+            marca = '  ⚠️  regressão'
+            regressoes += 1
+        elif variacao < -tolerancia:
+            marca = '  ✅ melhora'
+        linhas.append(
+            f"   {nome:<22} {base['mediana_ms']:>7.1f} ms {medida['mediana_ms']:>7.1f} ms {variacao:>+8.1%}{marca}"
+        )
+    return linhas, regressoes
+
+
+def main():
+    parametros, args = ler_parametros(sys.argv[1:])
+    repeticoes = 5
+    ferramentas = list(FERRAMENTAS)
+    arquivo_json = None
+    arquivo_baseline = None
+    tolerancia = 0.10
+    
+    i = 0
+    while i < len(args):
+        if args[i] == '--repeticoes' and i + 1 < len(args):
+            repeticoes = int(args[i + 1])
+        elif args[i] == '--ferramentas' and i + 1 < len(args):
+            ferramentas = [f.strip() for f in args[i + 1].split(',') if f.strip()]
+        elif args[i] == '--json' and i + 1 < len(args):
+            arquivo_json = Path(args[i + 1])
+        elif args[i] == '--baseline' and i + 1 < len(args):
+            arquivo_baseline = Path(args[i + 1])
+        elif args[i] == '--tolerancia' and i + 1 < len(args):
+            tolerancia = float(args[i + 1]) / 100
+        else:
+            print(__doc__.strip().split('\n\n')[1])
+            sys.exit(1)
+        i += 2
+    
+    desconhecidas = [f for f in ferramentas if f not in FERRAMENTAS]
+    if desconhecidas:
+        print(f"❌ Ferramenta(s) desconhecida(s): {', '.join(desconhecidas)} (use {', '.join(FERRAMENTAS)})")
+        sys.exit(1)
+    
+    baseline = None
+    if arquivo_baseline:
+        try:
+            baseline = json.loads(arquivo_baseline.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            print(f"❌ Baseline ilegível: {e}")
+            sys.exit(1)
+    
+    resultados = executar(parametros, ferramentas, repeticoes)
+    print(f"\n⏱️  Mediana de {repeticoes} execução(ões), processo novo")
+    
+    if arquivo_json:
+        arquivo_json.write_text(json.dumps(resultados, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+        print(f"💾 Resultados gravados em {arquivo_json}")
+    
+    falhas = [nome for nome, medida in resultados['casos'].items() if medida.get('codigo')]
+    if falhas:
+        print(f"\n❌ {len(falhas)} caso(s) terminaram com erro: {', '.join(falhas)}")
+        sys.exit(1)
+    
+    if baseline is not None:
+        linhas, regressoes = comparar(resultados, baseline, tolerancia)
+        print(f"\n📊 Comparação com {arquivo_baseline} (tolerância {tolerancia:.0%}):")
+        print('\n'.join(linhas))
+        if regressoes:
+            print(f"\n❌ {regressoes} caso(s) mais lento(s) que a baseline")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
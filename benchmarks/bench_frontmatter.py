@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark do frontmatter — Custo do PyYAML por execução das ferramentas
+
+Uso:
+    benchmarks/bench_frontmatter.py [caminho-da-habilidade] [--repeticoes <n>]
+
+Exemplos:
+    benchmarks/bench_frontmatter.py
+    benchmarks/bench_frontmatter.py ~/skills/minha-skill --repeticoes 30
+
+Mede:
+    - Interpretação do frontmatter em processo: forge_frontmatter,
+      yaml.safe_load e yaml.load com CSafeLoader
+    - forge_validate.py por execução (processo novo), com e sem a
+      importação do PyYAML que antes acontecia sempre
+    - O processo extra que o forge.sh criava a cada chamada só para
+      verificar se o PyYAML estava instalado
+"""
+
+import sys
+import time
+import statistics
+import subprocess
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+SCRIPTS = RAIZ / 'skill-forge' / 'scripts'
+sys.path.insert(0, str(SCRIPTS))
+
+from forge_documento import DocumentoHabilidade
+from forge_frontmatter import carregar_frontmatter
+
+
+def mediana_processo(comando: list[str], repeticoes: int) -> float:
+    """Mediana, em ms, do tempo de parede de um processo novo."""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        subprocess.run(comando, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+
+def tempo_em_processo(funcao, texto: str, repeticoes: int = 2000) -> float:
+    """Tempo médio, em µs, de uma chamada de interpretação."""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao(texto)
+    return (time.perf_counter() - inicio) / repeticoes * 1e6
+
+
+def main():
+    args = sys.argv[1:]
+    repeticoes = 20
+    if '--repeticoes' in args:
+        indice = args.index('--repeticoes')
+        repeticoes = int(args[indice + 1])
+        del args[indice:indice + 2]
+    habilidade = Path(args[0]).resolve() if args else RAIZ / 'skill-forge'
+    
+    texto = DocumentoHabilidade(habilidade).frontmatter_texto
+    if texto is None:
+        print(f"❌ Frontmatter não encontrado em {habilidade}")
+        sys.exit(1)
+    
+    import yaml
+    
+    esperado = yaml.safe_load(texto)
+    obtido, erro = carregar_frontmatter(texto)
+    print(f"📄 Habilidade: {habilidade}")
+    print(f"   Resultado idêntico ao yaml.safe_load: {'✅' if obtido == esperado and erro is None else '❌'}")
+    print()
+    
+    print("⏱️  Interpretação em processo (por chamada):")
+    print(f"   forge_frontmatter     {tempo_em_processo(carregar_frontmatter, texto):8.1f} µs")
+    print(f"   yaml.safe_load        {tempo_em_processo(yaml.safe_load, texto):8.1f} µs")
+    if hasattr(yaml, 'CSafeLoader'):
+        carregar_c = lambda t: yaml.load(t, Loader=yaml.CSafeLoader)
+        print(f"   yaml + CSafeLoader    {tempo_em_processo(carregar_c, texto):8.1f} µs")
+    print()
+    
+    # Mesmo forge_validate.py, com e sem a importação do PyYAML na frente
+    validar = (
+        "import runpy, sys; sys.argv = ['forge_validate.py', sys.argv[1]]; "
+        f"sys.path.insert(0, {str(SCRIPTS)!r}); "
+        f"runpy.run_path({str(SCRIPTS / 'forge_validate.py')!r}, run_name='__main__')"
+    )
+    python = sys.executable
+    vazio = mediana_processo([python, '-c', 'pass'], repeticoes)
+    sonda = mediana_processo([python, '-c', 'import yaml'], repeticoes)
+    atual = mediana_processo([python, '-c', validar, str(habilidade)], repeticoes)
+    com_yaml = mediana_processo([python, '-c', 'import yaml; ' + validar, str(habilidade)], repeticoes)
+    
+    print(f"🚀 Por execução (mediana de {repeticoes}, processo novo):")
+    print(f"   python vazio                          {vazio:7.1f} ms")
+    print(f"   sonda do forge.sh (import yaml)       {sonda:7.1f} ms")
+    print(f"   forge_validate.py com import yaml     {com_yaml:7.1f} ms")
+    print(f"   forge_validate.py atual               {atual:7.1f} ms")
+    print()
+    economia = (com_yaml - atual) + sonda
+    print(f"📊 Economia por chamada via forge.sh: {economia:.1f} ms "
+          f"({economia / (com_yaml + sonda) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Gerador de bibliotecas sintéticas — Habilidades determinísticas para benchmarks
+
+Uso:
+    benchmarks/gerar_biblioteca.py <destino> [--habilidades <n>] [--semente <s>]
+        [--linhas-skill <n>] [--references <n>] [--kb-reference <n>]
+        [--assets <n>] [--kb-asset <n>] [--binarios <fração>]
+
+Exemplos:
+    benchmarks/gerar_biblioteca.py /tmp/biblioteca
+    benchmarks/gerar_biblioteca.py /tmp/grande --habilidades 2000 --references 8 --kb-reference 64
+
+Cada habilidade parte do modelo de forge_init.criar_habilidade e recebe:
+    - Descrição preenchida e SKILL.md estendido até --linhas-skill linhas,
+      com seções ##, parágrafos, tabelas, blocos de código e menções às
+      references (como uma habilidade real)
+    - --references arquivos .md de ~--kb-reference KB em references/
+    - --assets arquivos de ~--kb-asset KB em assets/, dos quais a fração
+      --binarios é binária (.bin) e o restante texto (.txt)
+
+O conteúdo depende só dos parâmetros e da semente (mesma entrada, mesmos
+bytes), então medições em máquinas e dias diferentes são comparáveis.
+"""
+
+import sys
+import random
+import contextlib
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+SCRIPTS = RAIZ / 'skill-forge' / 'scripts'
+sys.path.insert(0, str(SCRIPTS))
+
+from forge_init import criar_habilidade
+
+
+# Vocabulário dos textos gerados (mistura de português e termos técnicos)
+PALAVRAS = (
+    "habilidade arquivo contexto seção referência script ativo validar analisar empacotar "
+    "quando usar fluxo etapa exemplo comando saída entrada formato tabela código resultado "
+    "configuração usuário projeto diretório caminho padrão opção erro aviso verificar criar "
+    "the skill file context when use step output input format table result config data "
+    "processo leitura escrita cache índice token modelo documento campo valor lista"
+).split()
+
+LINGUAGENS = ('bash', 'python', 'json', 'yaml')
+
+
+class ParametrosBiblioteca:
+    """Tamanho e composição das habilidades geradas."""
+    
+    def __init__(
+        self,
+        habilidades: int = 100,
+        semente: int = 0,
+        linhas_skill: int = 200,
+        references: int = 3,
+        kb_reference: int = 8,
+        assets: int = 4,
+        kb_asset: int = 16,
+        binarios: float = 0.5
+    ):
+        self.habilidades = habilidades
+        self.semente = semente
+        self.linhas_skill = linhas_skill
+        self.references = references
+        self.kb_reference = kb_reference
+        self.assets = assets
+        self.kb_asset = kb_asset
+        self.binarios = binarios
+    
+    def como_dict(self) -> dict:
+        return dict(vars(self))
+
+
+def _frase(aleatorio: random.Random, minimo: int = 6, maximo: int = 18) -> str:
+    palavras = aleatorio.choices(PALAVRAS, k=aleatorio.randint(minimo, maximo))
+    return ' '.join(palavras).capitalize() + '.'
+
+
+def _texto(aleatorio: random.Random, tamanho: int, mencoes: list[str] | None = None) -> str:
+    """Parágrafos Markdown com cerca de 'tamanho' caracteres."""
+    partes = []
+    total = 0
+    secao = 0
+    while total < tamanho:
+        if total == 0 or aleatorio.random() < 0.1:
+            secao += 1
+            partes.append(f"\n## {_frase(aleatorio, 2, 5)[:-1]} {secao}\n")
+        paragrafo = ' '.join(_frase(aleatorio) for _ in range(aleatorio.randint(2, 6)))
+        if mencoes and aleatorio.random() < 0.2:
+            paragrafo += f" Veja references/{aleatorio.choice(mencoes)}."
+        partes.append(paragrafo + '\n')
+        total += len(paragrafo) + 1
+    return '\n'.join(partes)
+
+
+def _corpo_skill(aleatorio: random.Random, linhas: int, references: list[str]) -> str:
+    """Seções adicionais do SKILL.md até somar 'linhas' linhas."""
+    partes = []
+    total = 0
+    secao = 0
+    while total < linhas:
+        secao += 1
+        bloco = [f"## {_frase(aleatorio, 2, 5)[:-1]} {secao}", ""]
+        sorteio = aleatorio.random()
+        if sorteio < 0.2:
+            bloco += ["| Situação | Ação |", "|----------|------|"]
+            bloco += [
+                f"| {_frase(aleatorio, 2, 4)} | {_frase(aleatorio, 3, 6)} |"
+                for _ in range(aleatorio.randint(2, 6))
+            ]
+        elif sorteio < 0.4:
+            bloco.append(f"```{aleatorio.choice(LINGUAGENS)}")
+            bloco += [f"# {_frase(aleatorio, 3, 8)}" for _ in range(aleatorio.randint(2, 8))]
+            bloco.append("```")
+        else:
+            bloco += [_frase(aleatorio) for _ in range(aleatorio.randint(2, 8))]
+        if references and aleatorio.random() < 0.5:
+            bloco.append(f"Detalhes em `references/{aleatorio.choice(references)}`.")
+        bloco.append("")
+        partes.extend(bloco)
+        total += len(bloco)
+    return '\n'.join(partes[:max(linhas, 0)]) + '\n'
+
+
+def gerar_habilidade(raiz: Path, indice: int, parametros: ParametrosBiblioteca) -> Path:
+    """
+    Gera uma habilidade a partir do modelo do forge_init.
+    
+    Args:
+        raiz: Diretório da biblioteca
+        indice: Número da habilidade (define o nome e a semente)
+        parametros: Tamanho e composição
+    
+    Returns:
+        Diretório da habilidade criada
+    """
+    nome = f"habilidade-{indice:05d}"
+    with contextlib.redirect_stdout(None):
+        caminho = criar_habilidade(nome, str(raiz))
+    if caminho is None:
+        raise FileExistsError(f"Não foi possível criar {raiz / nome}")
+    # Semente em texto: determinística entre execuções (não usa hash())
+    aleatorio = random.Random(f"{parametros.semente}:{indice}")
+    
+    references = [f"guia-{k:02d}.md" for k in range(parametros.references)]
+    for k, nome_ref in enumerate(references):
+        outras = references[:k] + references[k + 1:]
+        texto = f"# {_frase(aleatorio, 2, 5)[:-1]}\n" + _texto(aleatorio, parametros.kb_reference * 1024, outras)
+        (caminho / 'references' / nome_ref).write_text(texto, encoding='utf-8')
+    
+    binarios = round(parametros.assets * parametros.binarios)
+    for k in range(parametros.assets):
+        if k < binarios:
+            dados = aleatorio.randbytes(parametros.kb_asset * 1024)
+            (caminho / 'assets' / f"ativo-{k:02d}.bin").write_bytes(dados)
+        else:
+            texto = _texto(aleatorio, parametros.kb_asset * 1024)
+            (caminho / 'assets' / f"ativo-{k:02d}.txt").write_text(texto, encoding='utf-8')
+    
+    skill_md = caminho / 'SKILL.md'
+    modelo = skill_md.read_text(encoding='utf-8')
+    descricao = (
+        f"Use quando precisar de {' '.join(aleatorio.choices(PALAVRAS, k=12))}. "
+        f"Cobre {' '.join(aleatorio.choices(PALAVRAS, k=16))}."
+    )
+    inicio_descricao = modelo.index('description:')
+    fim_descricao = modelo.index('\n', inicio_descricao)
+    modelo = modelo[:inicio_descricao] + f'description: "{descricao}"' + modelo[fim_descricao:]
+    extra = parametros.linhas_skill - modelo.count('\n')
+    skill_md.write_text(modelo + '\n' + _corpo_skill(aleatorio, extra, references), encoding='utf-8')
+    return caminho
+
+
+def gerar_biblioteca(destino: Path, parametros: ParametrosBiblioteca) -> list[Path]:
+    """
+    Gera uma biblioteca de habilidades sintéticas.
+    
+    Args:
+        destino: Diretório da biblioteca (criado se não existir; as
+            habilidades não podem existir ainda)
+        parametros: Número, tamanho e composição das habilidades
+    
+    Returns:
+        Diretórios das habilidades, em ordem
+    """
+    destino = Path(destino).resolve()
+    destino.mkdir(parents=True, exist_ok=True)
+    return [gerar_habilidade(destino, i, parametros) for i in range(parametros.habilidades)]
+
+
+# Opção da linha de comando -> (atributo de ParametrosBiblioteca, conversão)
+OPCOES = {
+    '--habilidades': ('habilidades', int),
+    '--semente': ('semente', int),
+    '--linhas-skill': ('linhas_skill', int),
+    '--references': ('references', int),
+    '--kb-reference': ('kb_reference', int),
+    '--assets': ('assets', int),
+    '--kb-asset': ('kb_asset', int),
+    '--binarios': ('binarios', float),
+}
+
+
+def ler_parametros(args: list[str]) -> tuple[ParametrosBiblioteca, list[str]]:
+    """Separa as opções do gerador (OPCOES) dos demais argumentos."""
+    parametros = ParametrosBiblioteca()
+    restantes = []
+    i = 0
+    while i < len(args):
+        if args[i] in OPCOES and i + 1 < len(args):
+            atributo, conversao = OPCOES[args[i]]
+            setattr(parametros, atributo, conversao(args[i + 1]))
+            i += 2
+        else:
+            restantes.append(args[i])
+            i += 1
+    return parametros, restantes
+
+
+def main():
+    parametros, posicionais = ler_parametros(sys.argv[1:])
+    if len(posicionais) != 1:
+        print(__doc__.strip().split('\n\n')[1])
+        sys.exit(1)
+    
+    destino = Path(posicionais[0])
+    habilidades = gerar_biblioteca(destino, parametros)
+    tamanho = sum(f.stat().st_size for h in habilidades for f in h.rglob('*') if f.is_file())
+    print(f"✅ {len(habilidades)} habilidade(s) em {destino.resolve()} ({tamanho / 1024 / 1024:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Forge — Ponto de entrada único das ferramentas do skill-forge
+
+Uso:
+    forge.py <comando> [<comando> ...] [argumentos]
+
+Exemplos:
+    forge.py init minha-habilidade --path ./skills
+    forge.py validate ./minha-habilidade
+    forge.py validate analyze package ./minha-habilidade
+
+Funcionamento:
+    - Todos os comandos rodam neste mesmo processo; cada um importa seu
+      módulo (e as dependências dele) apenas quando é executado
+    - Comandos encadeados executam na ordem dada e reaproveitam a
+      habilidade já lida pelo comando anterior; o caminho vai para todos,
+      e cada opção só para os comandos que a aceitam (OPCOES)
+    - A cadeia para no primeiro comando que falhar
+    - --profile <arquivo> [--cprofile] grava a linha do tempo de toda a
+      cadeia (ver forge_perfil)
+"""
+
+import sys
+from importlib import import_module
+
+from forge_perfil import configurar, trecho
+
+
+# Comando -> (módulo com main(argv) -> int, argumentos, descrição)
+COMANDOS = {
+    'init': ('forge_init', '<nome> --path <dir>', 'Inicializa nova skill'),
+    'validate': ('forge_validate', '<caminho>', 'Valida estrutura e qualidade'),
+    'analyze': ('forge_analyze', '<caminho>', 'Analisa e sugere melhorias'),
+    'package': ('forge_package', '<caminho> [--output]', 'Empacota skill em arquivo .skill'),
+    'watch': ('forge_watch', '<caminho> [--poll]', 'Revalida a cada alteração (skill ou biblioteca)'),
+    'serve': ('forge_serve', '[--socket <caminho>]', 'Servidor JSON-RPC para editores e CI'),
+    'tokens': ('forge_tokens', '[--top <n>] [--cache]', 'Custo de contexto em tokens'),
+    'profile-scripts': ('forge_profile_scripts', '[--jobs <n>]', 'Tempo de inicialização dos scripts'),
+    'history': ('forge_history', '[--threshold <t>]', 'Crescimento do custo ao longo dos commits'),
+}
+
+# Comando -> opções que aceita (opção -> número de valores que a seguem)
+OPCOES = {
+    'init': {'--path': 1},
+    'validate': {
+        '--verbose': 0, '--timings': 0, '--library': 1, '--jobs': 1, '--cache': 0,
+        '--cache-dir': 1, '--full-hash': 0, '--only': 1, '--skip': 1, '--budget': 1,
+        '--changed-since': 1, '--staged': 0,
+    },
+    'analyze': {
+        '--timings': 0, '--library': 1, '--index': 1, '--only': 1, '--skip': 1,
+        '--changed-since': 1, '--staged': 0,
+    },
+    'package': {
+        '--output': 1, '--force': 0, '--jobs': 1, '--compress': 1,
+        '--changed-since': 1, '--staged': 0,
+    },
+    'watch': {'--poll': 0, '--interval': 1},
+    'serve': {'--socket': 1, '--full-hash': 0, '--call': 2},
+    'tokens': {'--top': 1, '--cache': 0, '--cache-dir': 1},
+    'profile-scripts': {'--jobs': 1, '--top': 1, '--timeout': 1, '--no-cache': 0, '--cache-dir': 1},
+    'history': {'--db': 1, '--threshold': 1, '--top': 1, '--max-count': 1},
+}
+
+# Opções que recebem nomes de regras: cada ferramenta tem as suas, então
+# numa cadeia com mais de uma delas a opção leva o comando no nome
+# (--validate-only, --analyze-skip)
+OPCOES_DE_REGRAS = ('--only', '--skip')
+
+# Pedidos de ajuda: tratados aqui, antes de dividir os argumentos
+AJUDA = ('--help', '-h')
+
+
+def dividir_argumentos(comandos: list[str], argumentos: list[str]) -> dict[str, list[str]]:
+    """
+    Argumentos de cada comando da cadeia.
+    
+    Posicionais (o caminho da habilidade) vão para todos os comandos; cada
+    opção, com seus valores, só para os comandos que a aceitam (--cache-dir,
+    por exemplo, para todos os que usam cache). --profile e --cprofile já
+    foram retirados e valem para a cadeia toda.
+    
+    --only e --skip recebem nomes de regras, que são diferentes em cada
+    ferramenta: se mais de um comando da cadeia os aceita, é preciso dizer
+    qual (--validate-only frontmatter --analyze-skip duplicacao).
+    
+    Args:
+        comandos: Nomes dos comandos, na ordem de execução
+        argumentos: Argumentos após os nomes dos comandos
+    
+    Returns:
+        Comando -> argumentos, na ordem em que foram dados
+    
+    Raises:
+        ValueError: Opção que nenhum comando da cadeia aceita, sem valor,
+            ou de regras sem dizer o comando
+    """
+    # --<comando>-only -> (comando, --only)
+    prefixadas = {
+        f"--{comando}-{opcao[2:]}": (comando, opcao)
+        for comando in comandos for opcao in OPCOES_DE_REGRAS if opcao in OPCOES[comando]
+    }
+    
+    divididos = {comando: [] for comando in comandos}
+    i = 0
+    while i < len(argumentos):
+        argumento = argumentos[i]
+        if not argumento.startswith('-'):
+            for comando in comandos:
+                divididos[comando].append(argumento)
+            i += 1
+            continue
+        
+        if argumento in prefixadas:
+            comando, opcao = prefixadas[argumento]
+            destinos = [comando]
+        else:
+            opcao = argumento
+            destinos = [c for c in comandos if argumento in OPCOES[c]]
+            if not destinos:
+                raise ValueError(f"Opção desconhecida para {' '.join(comandos)}: {argumento}")
+            if argumento in OPCOES_DE_REGRAS and len(destinos) > 1:
+                alternativas = ', '.join(f"--{c}-{argumento[2:]}" for c in destinos)
+                raise ValueError(
+                    f"{argumento} é ambíguo: {' e '.join(destinos)} têm regras diferentes (use {alternativas})"
+                )
+        valores = OPCOES[destinos[0]][opcao]
+        if i + valores >= len(argumentos):
+            raise ValueError(f"Opção sem valor: {argumento}")
+        for comando in destinos:
+            divididos[comando] += [opcao, *argumentos[i + 1:i + 1 + valores]]
+        i += 1 + valores
+    return divididos
+
+
+def imprimir_ajuda_cadeia(comandos: list[str]):
+    """Uso e opções de cada comando da cadeia (forge.py <comandos> --help)."""
+    com_regras = [c for c in comandos if any(o in OPCOES[c] for o in OPCOES_DE_REGRAS)]
+    for comando in comandos:
+        _, uso, descricao = COMANDOS[comando]
+        print(f"{comando} {uso}")
+        print(f"    {descricao}")
+        for opcao, valores in OPCOES[comando].items():
+            if opcao in OPCOES_DE_REGRAS and len(com_regras) > 1:
+                opcao = f"--{comando}-{opcao[2:]}"
+            print(f"    {opcao}{' <valor>' * valores}")
+        print()
+    print("O caminho vai para todos os comandos; cada opção, só para os que a aceitam.")
+
+
+def executar(comandos: list[str], argumentos: list[str]) -> int:
+    """
+    Executa comandos em sequência no processo atual.
+    
+    Args:
+        comandos: Nomes dos comandos, na ordem de execução
+        argumentos: Argumentos da cadeia (ver dividir_argumentos)
+    
+    Returns:
+        Código de saída do primeiro comando que falhar, ou 0
+    """
+    if any(argumento in AJUDA for argumento in argumentos):
+        imprimir_ajuda_cadeia(comandos)
+        return 0
+    
+    try:
+        divididos = dividir_argumentos(comandos, argumentos)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    
+    # A habilidade lida é compartilhada só dentro desta cadeia
+    from forge_documento import sessao_documentos  # só ao executar (não no --help)
+    with sessao_documentos():
+        for comando in comandos:
+            with trecho(f"import {COMANDOS[comando][0]}", 'import'):
+                modulo = import_module(COMANDOS[comando][0])
+            codigo = modulo.main(divididos[comando])
+            if codigo:
+                return codigo
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    args = configurar(args)
+    
+    comandos = []
+    while len(comandos) < len(args) and args[len(comandos)] in COMANDOS:
+        comandos.append(args[len(comandos)])
+    
+    if not comandos:
+        if args and args[0] not in AJUDA:
+            print(f"❌ Comando desconhecido: {args[0]}")
+            print("Use './forge.sh' sem argumentos para ver ajuda")
+            return 1
+        print("Skill Forge - Criador de Skills para Claude Code")
+        print()
+        print("Uso: ./forge.sh <comando> [<comando> ...] [argumentos]")
+        print()
+        print("Comandos disponíveis:")
+        for comando, (_, uso, descricao) in COMANDOS.items():
+            print(f"  {comando + ' ' + uso:<30}{descricao}")
+        print()
+        print("Comandos encadeados rodam em um único processo, na ordem dada,")
+        print("e param no primeiro que falhar. Cada opção vai só para os comandos")
+        print("que a aceitam (ex.: --output só para package).")
+        print()
+        print("Qualquer comando aceita --profile <arquivo.json> [--cprofile]: linha do")
+        print("tempo (Chrome trace-event) para abrir no Perfetto (ui.perfetto.dev).")
+        print()
+        print("Exemplos:")
+        print("  ./forge.sh init minha-skill --path ~/skills")
+        print("  ./forge.sh validate ~/skills/minha-skill")
+        print("  ./forge.sh analyze ~/skills/minha-skill")
+        print("  ./forge.sh package ~/skills/minha-skill --output ~/dist")
+        print("  ./forge.sh validate analyze package ~/skills/minha-skill")
+        print("  ./forge.sh validate package ~/skills/minha-skill --verbose --output ~/dist")
+        print("  ./forge.sh validate analyze ~/skills/minha-skill --validate-only frontmatter")
+        print("  ./forge.sh validate package --help")
+        print("  ./forge.sh watch ~/skills/minha-skill")
+        print("  ./forge.sh serve --socket /tmp/forge.sock")
+        print()
+        print("Para mais informações: https://github.com/Hackerdomarketing/claude-code-skills")
+        return 0
+    
+    return executar(comandos, args[len(comandos):])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,11 +3,16 @@
 Forge Analyze — Analisa habilidade existente e sugere melhorias
 
 Uso:
-    forge_analyze.py <caminho-da-habilidade>
+    forge_analyze.py <caminho-da-habilidade> [--only <regras>] [--skip <regras>] [--timings]
+    forge_analyze.py --library <diretorio-raiz> [--index <arquivo>]
+    forge_analyze.py [<diretorio>] --changed-since <ref> | --staged
 
 Exemplos:
     forge_analyze.py ./minha-habilidade
     forge_analyze.py /caminho/para/skill-existente
+    forge_analyze.py ./minha-habilidade --skip duplicacao --timings
+    forge_analyze.py --library ./skills
+    forge_analyze.py ./skills --changed-since origin/main
 
 Analisa:
     - Eficiência de contexto (tamanho de arquivos)
@@ -15,20 +20,46 @@ Analisa:
     - Estrutura e organização
     - Uso de recursos (scripts, references, assets)
     - Potenciais melhorias
+    - Com --library: seções quase idênticas copiadas entre habilidades,
+      via índice persistente (forge_indice) atualizado só onde mudou
+    - Com --changed-since/--staged: só as habilidades alteradas, lidas
+      direto do git (forge_git)
 """
 
 import sys
-import re
-import yaml
 from pathlib import Path
 from collections import defaultdict
 
+from forge_documento import DocumentoHabilidade, carregar_documento
+from forge_regras import (
+    MotorRegras, entradas_disponiveis, formatar_tempos, nomes_de_regras, regra, regras_de
+)
+from forge_grafo import construir_grafo
+from forge_similaridade import comparar_todos
+from forge_tokens import perfil_tokens
+from forge_perfil import configurar, trecho
+
+
+# Tokens acima dos quais o SKILL.md (carregado a cada ativação) e as
+# references (pior caso: todas carregadas) merecem ser reduzidos
+LIMITE_TOKENS_SKILL_MD = 5000
+LIMITE_TOKENS_REFERENCES = 25000
+
 
 class Analisador:
     """Analisa habilidades e gera sugestões de melhoria."""
     
-    def __init__(self, caminho: Path):
+    def __init__(
+        self,
+        caminho: Path,
+        documento: DocumentoHabilidade | None = None,
+        somente: set[str] | None = None,
+        pular: set[str] | None = None
+    ):
         self.caminho = caminho
+        self.documento = documento or carregar_documento(caminho)
+        self.motor = MotorRegras(regras_de(Analisador), somente, pular)
+        self.tempos: dict[str, float] = {}
         self.sugestoes: list[str] = []
         self.metricas: dict = {}
         self.frontmatter: dict = {}
@@ -43,20 +74,15 @@ class Analisador:
         if not self.caminho.is_dir():
             return {"erro": f"Caminho não é um diretório: {self.caminho}"}
         
-        skill_md = self.caminho / 'SKILL.md'
-        if not skill_md.exists():
+        if self.documento.texto is None:
             return {"erro": "SKILL.md não encontrado"}
         
-        self.skill_md_content = skill_md.read_text(encoding='utf-8')
-        self._extrair_frontmatter()
+        self.skill_md_content = self.documento.texto
+        self.frontmatter = self.documento.frontmatter
         
-        # Executar análises
-        self._analisar_tamanho()
-        self._analisar_descricao()
-        self._analisar_estrutura()
-        self._analisar_recursos()
-        self._analisar_codigo()
-        self._analisar_duplicacao()
+        # Executar análises (ordem de declaração, puladas sem entradas)
+        self.motor.executar(self, entradas_disponiveis(self.documento))
+        self.tempos = self.motor.tempos
         
         return {
             "caminho": str(self.caminho),
@@ -65,55 +91,53 @@ class Analisador:
             "sugestoes": self.sugestoes
         }
     
-    def _extrair_frontmatter(self):
-        """Extrai frontmatter YAML."""
-        match = re.match(r'^---\n(.*?)\n---', self.skill_md_content, re.DOTALL)
-        if match:
-            try:
-                self.frontmatter = yaml.safe_load(match.group(1)) or {}
-            except yaml.YAMLError:
-                self.frontmatter = {}
-    
+    @regra(entradas=('frontmatter', 'corpo', 'references'), requer=())
     def _analisar_tamanho(self):
         """Analisa tamanho dos arquivos para eficiência de contexto."""
         
-        # Tamanho do SKILL.md
-        skill_md_linhas = len(self.skill_md_content.split('\n'))
-        skill_md_palavras = len(self.skill_md_content.split())
-        skill_md_chars = len(self.skill_md_content)
-        
+        # Tamanho do SKILL.md (contado na mesma passada que a estrutura)
+        estrutura = self.documento.estrutura
         self.metricas['skill_md'] = {
-            'linhas': skill_md_linhas,
-            'palavras': skill_md_palavras,
-            'caracteres': skill_md_chars
+            'linhas': estrutura.linhas,
+            'palavras': estrutura.palavras,
+            'caracteres': estrutura.caracteres
         }
         
-        if skill_md_linhas > 400:
-            self.sugestoes.append(
-                f"SKILL.md tem {skill_md_linhas} linhas. Considere mover detalhes "
-                "para references/ para reduzir uso de contexto."
-            )
+        # Tamanho total de references (limites de contexto: regra tokens)
+        inventario = self.documento.inventario
+        if inventario.existe('references'):
+            self.metricas['references_bytes'] = inventario.tamanho_total('references')
+    
+    @regra(entradas=('frontmatter', 'corpo', 'references'), requer=(), custo='medio')
+    def _analisar_tokens(self):
+        """Estima o custo de contexto em tokens por arquivo, seção, código e campo."""
+        
+        perfil = perfil_tokens(self.documento)
+        self.metricas['tokens'] = {
+            'sempre': perfil['sempre'],
+            'ao_ativar': perfil['ao_ativar'],
+            'pior_caso': perfil['pior_caso'],
+            'itens': [
+                {'tipo': tipo, 'local': local, 'tokens': tokens}
+                for tipo, local, tokens in perfil['itens']
+            ],
+        }
         
-        if skill_md_palavras > 3000:
+        if perfil['ao_ativar'] > LIMITE_TOKENS_SKILL_MD:
+            secoes = [item for item in perfil['itens'] if item[0] == 'seção']
+            detalhe = f" A seção mais cara é {secoes[0][1]} ({secoes[0][2]} tokens)." if secoes else ""
             self.sugestoes.append(
-                f"SKILL.md tem {skill_md_palavras} palavras. Habilidades mais "
-                "concisas são mais eficientes. Revise se toda informação é essencial."
+                f"SKILL.md custa ~{perfil['ao_ativar']} tokens a cada ativação.{detalhe} "
+                "Considere mover detalhes para references/ para reduzir uso de contexto."
             )
         
-        # Tamanho total de references
-        refs_dir = self.caminho / 'references'
-        if refs_dir.exists():
-            total_refs = sum(
-                f.stat().st_size for f in refs_dir.rglob('*') if f.is_file()
+        if perfil['pior_caso'] - perfil['ao_ativar'] > LIMITE_TOKENS_REFERENCES:
+            self.sugestoes.append(
+                f"references/ soma ~{perfil['pior_caso'] - perfil['ao_ativar']} tokens se tudo for carregado. "
+                "Para arquivos grandes, considere adicionar padrões de grep no SKILL.md para busca eficiente."
             )
-            self.metricas['references_bytes'] = total_refs
-            
-            if total_refs > 100000:  # 100KB
-                self.sugestoes.append(
-                    f"references/ tem {total_refs // 1024}KB. Para arquivos grandes, "
-                    "considere adicionar padrões de grep no SKILL.md para busca eficiente."
-                )
     
+    @regra(entradas=('frontmatter',), requer=())
     def _analisar_descricao(self):
         """Analisa qualidade da descrição."""
         
@@ -158,12 +182,13 @@ class Analisador:
                 "100-500 caracteres com cenários de ativação detalhados."
             )
     
+    @regra(entradas=('corpo',), requer=())
     def _analisar_estrutura(self):
         """Analisa estrutura e organização do SKILL.md."""
         
         # Contar seções
-        secoes = re.findall(r'^##\s+(.+)$', self.skill_md_content, re.MULTILINE)
-        subsecoes = re.findall(r'^###\s+(.+)$', self.skill_md_content, re.MULTILINE)
+        secoes = self.documento.titulos(2)
+        subsecoes = self.documento.titulos(3)
         
         self.metricas['estrutura'] = {
             'secoes': len(secoes),
@@ -184,74 +209,94 @@ class Analisador:
             )
         
         # Verificar tabela de referência rápida
-        tem_tabela = '|' in self.skill_md_content and '---' in self.skill_md_content
-        if not tem_tabela and len(secoes) > 5:
+        if not self.documento.estrutura.tabelas and len(secoes) > 5:
             self.sugestoes.append(
                 "Considere adicionar uma tabela de Referência Rápida no início "
                 "para facilitar navegação entre as muitas seções."
             )
         
         # Verificar se tem "Quando Usar" no corpo (deveria estar na descrição)
-        if re.search(r'##.*quando usar|when to use', self.skill_md_content, re.IGNORECASE):
+        if self.documento.estrutura.quando_usar:
             self.sugestoes.append(
                 "Seção 'Quando Usar' encontrada no corpo. Esta informação "
                 "deveria estar na descrição do frontmatter para ativação correta."
             )
     
+    @regra(entradas=('frontmatter', 'corpo', 'scripts', 'references', 'assets'), requer=(), custo='medio')
     def _analisar_recursos(self):
         """Analisa uso de scripts, references e assets."""
         
+        inventario = self.documento.inventario
+        
         # Scripts
-        scripts_dir = self.caminho / 'scripts'
-        if scripts_dir.exists():
-            scripts = list(scripts_dir.glob('*.py')) + list(scripts_dir.glob('*.sh'))
-            self.metricas['scripts'] = [s.name for s in scripts]
+        if inventario.existe('scripts'):
+            scripts = inventario.arquivos_em('scripts', extensoes={'.py', '.sh'})
+            self.metricas['scripts'] = [s.nome for s in scripts]
             
             # Verificar se scripts são referenciados
             for script in scripts:
-                if script.name not in self.skill_md_content:
+                if script.nome not in self.skill_md_content:
                     self.sugestoes.append(
-                        f"Script '{script.name}' não parece ser referenciado no SKILL.md. "
+                        f"Script '{script.nome}' não parece ser referenciado no SKILL.md. "
                         "Documente seu uso ou remova se não for necessário."
                     )
         else:
             self.metricas['scripts'] = []
         
         # References
-        refs_dir = self.caminho / 'references'
-        if refs_dir.exists():
-            refs = list(refs_dir.glob('*.md'))
-            self.metricas['references'] = [r.name for r in refs]
+        if inventario.existe('references'):
+            refs = inventario.arquivos_em('references', extensoes={'.md'})
+            self.metricas['references'] = [r.nome for r in refs]
             
             for ref in refs:
-                if ref.name not in self.skill_md_content:
+                if ref.nome not in self.skill_md_content:
                     self.sugestoes.append(
-                        f"Referência '{ref.name}' não é mencionada no SKILL.md. "
+                        f"Referência '{ref.nome}' não é mencionada no SKILL.md. "
                         "Adicione indicação de quando consultar este arquivo."
                     )
         else:
             self.metricas['references'] = []
         
         # Assets
-        assets_dir = self.caminho / 'assets'
-        if assets_dir.exists():
-            assets = [f.name for f in assets_dir.rglob('*') if f.is_file()]
+        if inventario.existe('assets'):
+            assets = [f.nome for f in inventario.arquivos_em('assets', recursivo=True)]
             self.metricas['assets'] = assets[:20]  # Primeiros 20
         else:
             self.metricas['assets'] = []
     
+    @regra(entradas=('corpo', 'references'), requer=('references',), custo='medio')
+    def _analisar_carga(self):
+        """Modela quais references cada seção puxa para o contexto (menções em cadeia)."""
+        
+        grafo = construir_grafo(self.documento)
+        cargas = grafo.cargas()
+        inalcancaveis = grafo.inalcancaveis()
+        self.metricas['carga'] = {
+            'secoes': [carga.como_dict() for carga in cargas],
+            'inalcancaveis': inalcancaveis,
+        }
+        
+        for carga in cargas:
+            if carga.pior > LIMITE_TOKENS_REFERENCES:
+                self.sugestoes.append(
+                    f"A seção {carga.secao} pode puxar ~{carga.pior} tokens de references "
+                    f"({len(carga.alcance)} arquivo(s), até {carga.profundidade} salto(s)). "
+                    "Divida as references ou aponte trechos específicos (padrões de grep)."
+                )
+    
+    @regra(entradas=('corpo',), requer=())
     def _analisar_codigo(self):
         """Analisa blocos de código no SKILL.md."""
         
         # Encontrar blocos de código
-        blocos = re.findall(r'```(\w*)\n(.*?)```', self.skill_md_content, re.DOTALL)
+        blocos = self.documento.blocos_codigo
         
         linguagens = defaultdict(int)
         total_linhas_codigo = 0
         
         for linguagem, codigo in blocos:
             linguagens[linguagem or 'sem_especificar'] += 1
-            total_linhas_codigo += len(codigo.strip().split('\n'))
+            total_linhas_codigo += codigo.strip().count('\n') + 1
         
         self.metricas['codigo'] = {
             'blocos': len(blocos),
@@ -266,7 +311,7 @@ class Analisador:
             )
         
         # Verificar avisos CRITICAL
-        critical_count = len(re.findall(r'\*\*CRITICAL', self.skill_md_content, re.IGNORECASE))
+        critical_count = self.documento.estrutura.avisos_critical
         self.metricas['avisos_critical'] = critical_count
         
         if critical_count == 0 and total_linhas_codigo > 50:
@@ -275,48 +320,47 @@ class Analisador:
                 "marque-as claramente para evitar erros."
             )
     
+    @regra(entradas=('corpo', 'references'), requer=('references',), custo='alto')
     def _analisar_duplicacao(self):
-        """Verifica potencial duplicação entre SKILL.md e references."""
-        
-        refs_dir = self.caminho / 'references'
-        if not refs_dir.exists():
-            return
-        
-        # Extrair frases significativas do SKILL.md (mais de 10 palavras)
-        frases_skill = set()
-        for linha in self.skill_md_content.split('\n'):
-            palavras = linha.split()
-            if len(palavras) > 10:
-                frases_skill.add(' '.join(palavras[:10]))
-        
-        # Verificar em references
-        for ref_file in refs_dir.glob('*.md'):
-            conteudo_ref = ref_file.read_text(encoding='utf-8')
-            duplicadas = 0
-            
-            for frase in frases_skill:
-                if frase in conteudo_ref:
-                    duplicadas += 1
-            
-            if duplicadas > 3:
-                self.sugestoes.append(
-                    f"Possível duplicação entre SKILL.md e {ref_file.name}. "
-                    f"Encontradas {duplicadas} frases similares. "
-                    "Considere manter informação em apenas um lugar."
-                )
+        """Verifica trechos quase duplicados entre SKILL.md e references (e entre references)."""
+        
+        # Uma passada em blocos por arquivo (references podem ter dezenas de MB);
+        # shingles de palavras também encontram trechos com quebras de linha diferentes
+        arquivos = ['SKILL.md'] + [
+            e.relativo for e in self.documento.inventario.arquivos_em('references', extensoes={'.md'})
+        ]
+        impressoes = {relativo: self.documento.impressao(relativo) for relativo in arquivos}
+        pares = comparar_todos(impressoes)
+        self.metricas['duplicacao'] = [par.como_dict() for par in pares]
+        
+        for par in pares:
+            trecho = par.trechos[0]
+            self.sugestoes.append(
+                f"Possível duplicação entre {par.a} e {par.b}: "
+                f"~{par.contencao:.0%} do menor arquivo se repete no outro "
+                f"({len(par.trechos)} trecho(s), ex.: linhas {trecho.linhas_a[0]}-{trecho.linhas_a[1]} "
+                f"↔ {trecho.linhas_b[0]}-{trecho.linhas_b[1]}). "
+                "Considere manter informação em apenas um lugar."
+            )
 
 
-def analisar_habilidade(caminho: str) -> dict:
+def analisar_habilidade(
+    caminho: str,
+    somente: set[str] | None = None,
+    pular: set[str] | None = None
+) -> dict:
     """
     Analisa uma habilidade e retorna relatório.
     
     Args:
         caminho: Caminho para o diretório da habilidade
+        somente: Executa apenas estas análises (opcional)
+        pular: Não executa estas análises (opcional)
     
     Returns:
         Dicionário com métricas e sugestões
     """
-    analisador = Analisador(Path(caminho).resolve())
+    analisador = Analisador(Path(caminho).resolve(), somente=somente, pular=pular)
     return analisador.analisar()
 
 
@@ -341,6 +385,23 @@ def formatar_relatorio(relatorio: dict) -> str:
         linhas.append(f"   • {sm['palavras']} palavras")
         linhas.append(f"   • {sm['caracteres']} caracteres")
     
+    if 'tokens' in metricas:
+        tok = metricas['tokens']
+        linhas.append(f"\n💰 Tokens estimados:")
+        linhas.append(f"   • Sempre carregado: {tok['sempre']}")
+        linhas.append(f"   • Ao ativar (SKILL.md): {tok['ao_ativar']}")
+        linhas.append(f"   • Pior caso (+ references): {tok['pior_caso']}")
+        for item in tok['itens'][:3]:
+            linhas.append(f"     {item['tokens']:>7}  {item['tipo']:<11} {item['local']}")
+    
+    if metricas.get('carga', {}).get('secoes'):
+        linhas.append(f"\n🧭 Carga de references por seção (esperada / pior caso, tokens):")
+        for carga in metricas['carga']['secoes'][:5]:
+            linhas.append(
+                f"   • {carga['esperada']:>7} / {carga['pior']:<7} "
+                f"{carga['alcancaveis']} arquivo(s), {carga['profundidade']} salto(s) — {carga['secao']}"
+            )
+    
     if 'descricao_caracteres' in metricas:
         linhas.append(f"\n📝 Descrição: {metricas['descricao_caracteres']} caracteres")
         qual = metricas.get('descricao_qualidade', {})
@@ -371,6 +432,17 @@ def formatar_relatorio(relatorio: dict) -> str:
     if metricas.get('assets'):
         linhas.append(f"🎨 Assets: {len(metricas['assets'])} arquivo(s)")
     
+    if metricas.get('duplicacao'):
+        linhas.append(f"\n🔁 Duplicação:")
+        for par in metricas['duplicacao']:
+            linhas.append(
+                f"   • {par['a']} ↔ {par['b']}: contenção {par['contencao']:.0%}, "
+                f"Jaccard {par['jaccard']:.0%}"
+            )
+            for trecho in par['trechos']:
+                (a0, a1), (b0, b1) = trecho['linhas_a'], trecho['linhas_b']
+                linhas.append(f"     linhas {a0}-{a1} ↔ {b0}-{b1}")
+    
     # Sugestões
     sugestoes = relatorio.get('sugestoes', [])
     if sugestoes:
@@ -383,25 +455,184 @@ def formatar_relatorio(relatorio: dict) -> str:
     return '\n'.join(linhas)
 
 
-def main():
-    if len(sys.argv) != 2:
+def main(argv: list[str] | None = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    args = configurar(args)
+    mostrar_tempos = '--timings' in args
+    args = [a for a in args if a != '--timings']
+    
+    somente = None
+    pular = None
+    biblioteca = None
+    caminho_indice = None
+    desde = None
+    indice = False
+    posicionais = []
+    
+    i = 0
+    while i < len(args):
+        if args[i] == '--library' and i + 1 < len(args):
+            biblioteca = args[i + 1]
+            i += 2
+        elif args[i] == '--index' and i + 1 < len(args):
+            caminho_indice = args[i + 1]
+            i += 2
+        elif args[i] == '--only' and i + 1 < len(args):
+            somente = nomes_de_regras(args[i + 1])
+            i += 2
+        elif args[i] == '--skip' and i + 1 < len(args):
+            pular = nomes_de_regras(args[i + 1])
+            i += 2
+        elif args[i] == '--changed-since' and i + 1 < len(args):
+            desde = args[i + 1]
+            i += 2
+        elif args[i] == '--staged':
+            indice = True
+            i += 1
+        else:
+            posicionais.append(args[i])
+            i += 1
+    
+    if biblioteca and not posicionais:
+        return _main_biblioteca(biblioteca, caminho_indice)
+    
+    modo_git = (desde is not None) != indice
+    if modo_git and len(posicionais) <= 1:
+        return _main_git(posicionais[0] if posicionais else '.', desde, indice, somente, pular, mostrar_tempos)
+    
+    if len(posicionais) != 1 or desde is not None or indice:
         print("Forge Analyze — Analisa habilidade e sugere melhorias")
         print()
-        print("Uso: forge_analyze.py <caminho-da-habilidade>")
+        print("Uso: forge_analyze.py <caminho-da-habilidade> [--only <regras>] [--skip <regras>] [--timings]")
+        print("     forge_analyze.py --library <diretorio-raiz> [--index <arquivo>]")
+        print("     forge_analyze.py [<diretorio>] --changed-since <ref> | --staged")
+        print()
+        print(f"Análises: {', '.join(r.nome for r in regras_de(Analisador))}")
         print()
         print("Exemplos:")
         print("  forge_analyze.py ./minha-habilidade")
         print("  forge_analyze.py /caminho/para/skill")
-        sys.exit(1)
+        print("  forge_analyze.py ./minha-habilidade --skip duplicacao --timings")
+        print("  forge_analyze.py --library ./skills")
+        print("  forge_analyze.py ./skills --staged")
+        return 1
     
-    caminho = sys.argv[1]
+    caminho = posicionais[0]
+    
+    try:
+        analisador = Analisador(Path(caminho).resolve(), somente=somente, pular=pular)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
     
     print(f"🔍 Analisando: {caminho}")
     print()
     
-    relatorio = analisar_habilidade(caminho)
-    print(formatar_relatorio(relatorio))
+    relatorio = analisador.analisar()
+    with trecho('saída', 'saída'):
+        print(formatar_relatorio(relatorio))
+    
+    if mostrar_tempos and analisador.tempos:
+        print()
+        print(formatar_tempos(analisador.tempos, regras_de(Analisador)))
+    
+    return 0
+
+
+def _main_git(
+    caminho: str,
+    desde: str | None,
+    indice: bool,
+    somente: set[str] | None,
+    pular: set[str] | None,
+    mostrar_tempos: bool
+) -> int:
+    """Analisa só as habilidades alteradas (--changed-since / --staged)."""
+    from forge_git import ErroGit, habilidades_do_git  # só nos modos git
+    
+    try:
+        MotorRegras(regras_de(Analisador), somente, pular)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    
+    origem = "preparadas para commit" if indice else f"alteradas desde {desde}"
+    print(f"🔍 Analisando habilidades {origem}: {caminho}")
+    
+    try:
+        with habilidades_do_git(Path(caminho), desde, indice) as habilidades:
+            if not habilidades:
+                print()
+                print("✅ Nenhuma habilidade alterada")
+            for relativo, copia in habilidades:
+                copia = copia.resolve()
+                analisador = Analisador(copia, DocumentoHabilidade(copia), somente, pular)
+                relatorio = analisador.analisar()
+                relatorio['caminho'] = relativo or '.'
+                print()
+                with trecho('saída', 'saída'):
+                    print(formatar_relatorio(relatorio))
+                if mostrar_tempos and analisador.tempos:
+                    print()
+                    print(formatar_tempos(analisador.tempos, regras_de(Analisador)))
+    except ErroGit as e:
+        print(f"❌ {e}")
+        return 1
+    return 0
+
+
+def formatar_grupos(grupos: list, raiz: Path) -> str:
+    """Formata os grupos de seções duplicadas entre habilidades."""
+    if not grupos:
+        return "✅ Nenhuma seção quase idêntica entre habilidades"
+    
+    linhas = [f"🔁 {len(grupos)} grupo(s) de seções quase idênticas entre habilidades:"]
+    for i, grupo in enumerate(grupos, 1):
+        titulo = next((s.titulo for s in grupo.secoes if s.titulo), '(sem título)')
+        linhas.append("")
+        linhas.append(
+            f"   {i}. \"{titulo}\" — {len(grupo.secoes)} cópia(s) em "
+            f"{len(grupo.habilidades)} habilidade(s), ~{grupo.palavras_repetidas} palavras repetidas"
+        )
+        for secao in grupo.secoes:
+            local = Path(secao.habilidade, secao.relativo)
+            try:
+                local = local.relative_to(raiz)
+            except ValueError:
+                pass
+            linhas.append(f"      {local}:{secao.linha}")
+    linhas.append("")
+    linhas.append("💡 Considere mover cada grupo para um único arquivo compartilhado")
+    linhas.append("   e referenciá-lo nas habilidades.")
+    return '\n'.join(linhas)
+
+
+def _main_biblioteca(raiz: str, caminho_indice: str | None) -> int:
+    """Atualiza o índice da biblioteca e lista seções duplicadas entre habilidades."""
+    from forge_indice import IndiceDuplicacao  # só na análise de biblioteca (sqlite3)
+    
+    raiz = Path(raiz).resolve()
+    if not raiz.is_dir():
+        print(f"❌ Caminho não é um diretório: {raiz}")
+        return 1
+    
+    print(f"📚 Analisando biblioteca: {raiz}")
+    with IndiceDuplicacao.padrao(caminho_indice) as indice:
+        with trecho('índice de duplicação', 'habilidade', raiz=str(raiz)):
+            contagens = indice.atualizar_biblioteca(raiz)
+        if contagens['habilidades'] == 0:
+            print("❌ Nenhuma habilidade (SKILL.md) encontrada")
+            return 1
+        print(f"🗂️  Índice: {indice.caminho}")
+        print(f"   {contagens['habilidades']} habilidade(s); arquivos: "
+              f"{contagens['reindexados']} reindexado(s), {contagens['inalterados']} inalterado(s), "
+              f"{contagens['removidos']} removido(s)")
+        print()
+        grupos = indice.grupos(raiz)
+        with trecho('saída', 'saída'):
+            print(formatar_grupos(grupos, raiz))
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
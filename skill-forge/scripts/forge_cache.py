@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Forge Cache — Cache em disco de resultados das ferramentas do skill-forge
+
+Uso (como módulo):
+    from forge_cache import CacheResultados
+
+    cache = CacheResultados.padrao('validate')
+    chave = cache.chave('v1', inventario.digest(cache.hash_completo))
+    resultado = cache.obter(chave)
+    if resultado is None:
+        resultado = calcular()
+        cache.gravar(chave, resultado)
+
+Características:
+    - Entradas JSON endereçadas por hash (SHA-256) do conteúdo
+    - Limite de tamanho com despejo LRU (menos recentemente usadas primeiro)
+    - Trava de arquivo para vários processos compartilharem o diretório
+    - Diretório padrão: $FORGE_CACHE_DIR ou ~/.cache/skill-forge
+"""
+
+import os
+from pathlib import Path
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava entre processos
+    fcntl = None
+
+
+# Tamanho máximo padrão do diretório de cache (pode ser alterado por
+# FORGE_CACHE_MAX_MB)
+LIMITE_PADRAO_BYTES = 64 * 1024 * 1024
+
+
+def diretorio_cache_padrao() -> Path:
+    """Retorna o diretório raiz do cache ($FORGE_CACHE_DIR ou ~/.cache/skill-forge)."""
+    if os.environ.get('FORGE_CACHE_DIR'):
+        return Path(os.environ['FORGE_CACHE_DIR']).expanduser()
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'skill-forge'
+
+
+def hash_arquivo(caminho: Path, bloco: int = 1024 * 1024) -> str:
+    """Calcula SHA-256 do conteúdo de um arquivo lendo em blocos."""
+    # json e hashlib são importados sob demanda: quem só importa o módulo
+    # (toda validação sem --cache) não paga pela inicialização deles
+    import hashlib
+    h = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        while dados := f.read(bloco):
+            h.update(dados)
+    return h.hexdigest()
+
+
+class CacheResultados:
+    """Cache de resultados em disco com limite de tamanho e despejo LRU."""
+    
+    def __init__(
+        self,
+        diretorio: Path,
+        limite_bytes: int = LIMITE_PADRAO_BYTES,
+        hash_completo: bool = False
+    ):
+        self.diretorio = Path(diretorio)
+        self.limite_bytes = limite_bytes
+        self.hash_completo = hash_completo
+        self._gravados_desde_despejo = 0
+        self._despejo_pendente = True
+    
+    @classmethod
+    def padrao(
+        cls, namespace: str, diretorio: str | None = None, hash_completo: bool = False
+    ) -> 'CacheResultados':
+        """Cria cache no diretório indicado (ou no padrão), separado por namespace."""
+        limite = LIMITE_PADRAO_BYTES
+        if os.environ.get('FORGE_CACHE_MAX_MB', '').isdigit():
+            limite = int(os.environ['FORGE_CACHE_MAX_MB']) * 1024 * 1024
+        raiz = Path(diretorio).expanduser() if diretorio else diretorio_cache_padrao()
+        return cls(raiz / namespace, limite, hash_completo)
+    
+    @staticmethod
+    def chave(*partes: str | bytes) -> str:
+        """Combina partes (versão de regras, conteúdo, digests) em uma chave."""
+        import hashlib
+        h = hashlib.sha256()
+        for parte in partes:
+            if isinstance(parte, str):
+                parte = parte.encode('utf-8', 'surrogateescape')
+            h.update(len(parte).to_bytes(8, 'little'))
+            h.update(parte)
+        return h.hexdigest()
+    
+    def _caminho_entrada(self, chave: str) -> Path:
+        return self.diretorio / chave[:2] / f"{chave}.json"
+    
+    def obter(self, chave: str) -> dict | None:
+        """Retorna a entrada da chave ou None. Marca a entrada como recém-usada."""
+        import json
+        arquivo = self._caminho_entrada(chave)
+        try:
+            with open(arquivo, encoding='utf-8') as f:
+                valor = json.load(f)
+            os.utime(arquivo)
+        except (OSError, ValueError):
+            return None
+        return valor
+    
+    def gravar(self, chave: str, valor: dict):
+        """Grava a entrada de forma atômica e despeja entradas antigas se necessário."""
+        import json
+        arquivo = self._caminho_entrada(chave)
+        temporario = arquivo.with_name(f".{arquivo.name}.{os.getpid()}.tmp")
+        dados = json.dumps(valor, ensure_ascii=False).encode('utf-8')
+        try:
+            arquivo.parent.mkdir(parents=True, exist_ok=True)
+            temporario.write_bytes(dados)
+            os.replace(temporario, arquivo)
+        except OSError:
+            # Cache é otimização: falha de escrita não interrompe a ferramenta
+            temporario.unlink(missing_ok=True)
+            return
+        
+        # Varredura completa do diretório só de tempos em tempos
+        self._gravados_desde_despejo += len(dados)
+        if self._despejo_pendente or self._gravados_desde_despejo > self.limite_bytes // 10:
+            self.despejar()
+    
+    @contextmanager
+    def _trava(self):
+        """Trava exclusiva entre processos sobre o diretório do cache."""
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        with open(self.diretorio / '.lock', 'a') as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+    
+    def despejar(self):
+        """Remove as entradas menos recentemente usadas até caber no limite."""
+        self._despejo_pendente = False
+        self._gravados_desde_despejo = 0
+        
+        with self._trava():
+            entradas = []
+            total = 0
+            for subdiretorio in os.scandir(self.diretorio):
+                if not subdiretorio.is_dir():
+                    continue
+                for entrada in os.scandir(subdiretorio.path):
+                    try:
+                        info = entrada.stat()
+                    except OSError:
+                        continue
+                    entradas.append((info.st_mtime_ns, info.st_size, entrada.path))
+                    total += info.st_size
+            
+            if total <= self.limite_bytes:
+                return
+            
+            # Folga de 10% para não despejar a cada gravação
+            alvo = self.limite_bytes * 9 // 10
+            for _, tamanho, caminho in sorted(entradas):
+                if total <= alvo:
+                    break
+                try:
+                    os.unlink(caminho)
+                except OSError:
+                    continue
+                total -= tamanho
+
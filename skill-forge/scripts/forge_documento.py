@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Forge Documento — Modelo compartilhado de uma habilidade lida do disco
+
+Uso (como módulo):
+    from forge_documento import carregar_documento
+
+    documento = carregar_documento(Path('./minha-habilidade'))
+    documento.frontmatter      # dict do frontmatter YAML
+    documento.corpo            # texto após o frontmatter
+    documento.estrutura        # estrutura e métricas do SKILL.md (forge_markdown)
+    documento.secoes           # títulos Markdown em ordem, com filhos
+    documento.blocos_codigo    # [(linguagem, código), ...]
+    documento.inventario       # inventário de arquivos (forge_inventario)
+
+Cada parte é calculada na primeira vez que é acessada e reaproveitada
+depois, de modo que validate, analyze e package encadeados (forge.py,
+dentro de sessao_documentos()) leem e interpretam cada arquivo uma única
+vez. Fora de uma sessão, cada carregar_documento() relê a habilidade, e
+nada fica desatualizado em um processo longo. Quando o SKILL.md muda, a
+nova estrutura reaproveita as seções que não mudaram.
+"""
+
+import re
+from pathlib import Path
+from functools import cached_property
+from contextlib import contextmanager
+from collections.abc import Iterable
+
+from forge_frontmatter import carregar_frontmatter
+from forge_inventario import Inventario
+from forge_leitura import ler_prefixo, procurar
+from forge_markdown import EstruturaMarkdown, ParserMarkdown, Secao
+from forge_perfil import trecho
+
+# Como typing.TYPE_CHECKING (que os verificadores de tipo reconhecem pelo
+# nome), sem pagar a importação de typing em toda ferramenta
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    # Em execução, forge_similaridade só é importado na primeira impressão
+    from forge_similaridade import Impressao
+
+
+class DocumentoHabilidade:
+    """Habilidade lida e interpretada sob demanda, uma única vez por parte."""
+    
+    def __init__(self, caminho: Path):
+        self.caminho = caminho
+        self._textos: dict[str, str] = {}
+        self._impressoes: dict[str, 'Impressao'] = {}
+        # Sobrevive a invalidar(): guarda os segmentos da última análise
+        self._markdown = ParserMarkdown()
+    
+    @cached_property
+    def texto(self) -> str | None:
+        """Conteúdo do SKILL.md, ou None se não existir."""
+        try:
+            return (self.caminho / 'SKILL.md').read_text(encoding='utf-8')
+        except FileNotFoundError:
+            return None
+    
+    @cached_property
+    def frontmatter_texto(self) -> str | None:
+        """Texto YAML entre os delimitadores ---, ou None se mal formatado."""
+        if not self.texto:
+            return None
+        match = re.match(r'^---\n(.*?)\n---', self.texto, re.DOTALL)
+        return match.group(1) if match else None
+    
+    @cached_property
+    def _frontmatter_carregado(self) -> tuple[object, Exception | None]:
+        if self.frontmatter_texto is None:
+            return None, None
+        # Subconjunto simples sem PyYAML; o restante via yaml (forge_frontmatter)
+        with trecho('frontmatter', 'yaml'):
+            return carregar_frontmatter(self.frontmatter_texto)
+    
+    @property
+    def frontmatter_yaml(self) -> object:
+        """Valor YAML do frontmatter como carregado (pode não ser dict)."""
+        return self._frontmatter_carregado[0]
+    
+    @property
+    def erro_frontmatter(self) -> Exception | None:
+        """Erro de sintaxe YAML do frontmatter (ou PyYAML ausente), se houver."""
+        return self._frontmatter_carregado[1]
+    
+    @property
+    def frontmatter(self) -> dict:
+        """Frontmatter como dicionário ({} se ausente ou inválido)."""
+        valor = self.frontmatter_yaml
+        return valor if isinstance(valor, dict) else {}
+    
+    @cached_property
+    def corpo(self) -> str | None:
+        """Texto após o frontmatter, ou None se não houver frontmatter."""
+        if not self.texto:
+            return None
+        match = re.match(r'^---\n.*?\n---\n?(.*)', self.texto, re.DOTALL)
+        return match.group(1) if match else None
+    
+    @cached_property
+    def estrutura(self) -> EstruturaMarkdown:
+        """Seções, blocos de código, tabelas e marcadores do corpo, em uma passada."""
+        texto = self.texto or ''
+        inicio_corpo = len(texto) - len(self.corpo) if self.corpo is not None else 0
+        with trecho('estrutura do Markdown', 'markdown'):
+            return self._markdown.analisar(texto, inicio_corpo)
+    
+    @property
+    def secoes(self) -> list[Secao]:
+        """Títulos do SKILL.md (fora de blocos de código) em ordem, com filhos."""
+        return self.estrutura.secoes
+    
+    def titulos(self, nivel: int) -> list[str]:
+        """Títulos das seções de um nível (2 para ##, 3 para ###...)."""
+        return self.estrutura.titulos(nivel)
+    
+    @property
+    def blocos_codigo(self) -> list[tuple[str, str]]:
+        """Blocos de código cercados do SKILL.md como (linguagem, código)."""
+        return [(bloco.linguagem, bloco.codigo) for bloco in self.estrutura.blocos]
+    
+    @cached_property
+    def inventario(self) -> Inventario:
+        """Inventário de arquivos da habilidade (uma única varredura)."""
+        return Inventario(self.caminho)
+    
+    def invalidar(self, relativos: Iterable[str]):
+        """
+        Descarta as partes calculadas que dependem dos caminhos alterados.
+        
+        Args:
+            relativos: Caminhos relativos (formato POSIX) criados, alterados
+                ou removidos
+        """
+        relativos = list(relativos)
+        if 'SKILL.md' in relativos:
+            for parte in ('texto', 'frontmatter_texto', '_frontmatter_carregado',
+                          'corpo', 'estrutura'):
+                self.__dict__.pop(parte, None)
+        
+        for relativo in relativos:
+            prefixo = relativo + '/'
+            for cache in (self._textos, self._impressoes):
+                for chave in [c for c in cache if c == relativo or c.startswith(prefixo)]:
+                    del cache[chave]
+        
+        if 'inventario' in self.__dict__:
+            self.inventario.atualizar(relativos)
+    
+    def ler_texto(self, relativo: str | Path) -> str:
+        """Lê (uma única vez) o texto de um arquivo da habilidade."""
+        chave = str(relativo)
+        if chave not in self._textos:
+            self._textos[chave] = (self.caminho / relativo).read_text(encoding='utf-8')
+        return self._textos[chave]
+    
+    def ler_prefixo(self, relativo: str | Path, caracteres: int) -> str:
+        """Lê só o início de um arquivo da habilidade (sem carregá-lo inteiro)."""
+        return ler_prefixo(self.caminho / relativo, caracteres)
+    
+    def procurar(self, relativo: str | Path, termos: Iterable[str], ignorar_caixa: bool = False) -> set[str]:
+        """Termos que ocorrem em um arquivo da habilidade, lido em blocos."""
+        return procurar(self.caminho / relativo, termos, ignorar_caixa)
+    
+    def impressao(self, relativo: str) -> 'Impressao':
+        """Impressão para detecção de duplicação (calculada uma vez por arquivo)."""
+        if relativo not in self._impressoes:
+            from forge_similaridade import impressao_digital  # só na análise de duplicação
+            self._impressoes[relativo] = impressao_digital(self.caminho / relativo)
+        return self._impressoes[relativo]
+
+
+# Documentos carregados na sessão ativa, por caminho absoluto (None: sem sessão)
+_DOCUMENTOS: dict[Path, DocumentoHabilidade] | None = None
+
+
+@contextmanager
+def sessao_documentos():
+    """
+    Compartilha os documentos carregados dentro do bloco (uma cadeia de comandos).
+    
+    Ao sair, os documentos são descartados: a próxima execução no mesmo
+    processo relê a habilidade do disco. Sessões aninhadas usam a externa.
+    """
+    global _DOCUMENTOS
+    if _DOCUMENTOS is not None:
+        yield
+        return
+    _DOCUMENTOS = {}
+    try:
+        yield
+    finally:
+        _DOCUMENTOS = None
+
+
+def carregar_documento(caminho: Path) -> DocumentoHabilidade:
+    """
+    Retorna o documento da habilidade, reaproveitando o já carregado na sessão.
+    
+    Args:
+        caminho: Diretório da habilidade
+    
+    Returns:
+        DocumentoHabilidade compartilhado pelas ferramentas da mesma
+        sessão_documentos(); fora de uma sessão, um documento novo
+    """
+    caminho = Path(caminho).resolve()
+    if _DOCUMENTOS is None:
+        return DocumentoHabilidade(caminho)
+    if caminho not in _DOCUMENTOS:
+        _DOCUMENTOS[caminho] = DocumentoHabilidade(caminho)
+    return _DOCUMENTOS[caminho]
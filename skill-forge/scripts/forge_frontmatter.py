@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Forge Frontmatter — Interpretador rápido do frontmatter das habilidades
+
+Uso (como módulo):
+    from forge_frontmatter import carregar_frontmatter
+
+    valor, erro = carregar_frontmatter('name: minha-skill\\ndescription: "..."')
+    valor    # {'name': 'minha-skill', 'description': '...'}
+    erro     # None, yaml.YAMLError se o YAML for inválido, ou ImportError
+             # se precisar do PyYAML e ele não estiver instalado
+
+Quase todo frontmatter tem a forma simples name/description/license/
+allowed-tools/metadata: chaves de primeiro nível com escalares, listas
+(em bloco ou simples como [Read, Grep]) ou um mapeamento de um nível.
+Esse subconjunto é interpretado aqui, sem importar o PyYAML (cuja
+importação domina o tempo de inicialização de cada ferramenta).
+Qualquer coisa fora dele — blocos | e >, mapas entre chaves, âncoras,
+tags, comentários no fim da linha, números de ponto flutuante, datas —
+vai para o PyYAML: primeiro o CSafeLoader (libyaml) e, só se este não
+existir, o SafeLoader em Python. Sem o PyYAML instalado, esse
+frontmatter volta como erro (ImportError), reportado como um erro de
+YAML.
+
+No subconjunto aceito o resultado é idêntico ao de yaml.safe_load.
+"""
+
+import re
+
+
+# Escalares sem aspas que o YAML 1.1 (PyYAML) converte em outros tipos
+NULOS = {'~', 'null', 'Null', 'NULL'}
+BOOLEANOS = {
+    'yes': True, 'Yes': True, 'YES': True, 'no': False, 'No': False, 'NO': False,
+    'true': True, 'True': True, 'TRUE': True, 'false': False, 'False': False, 'FALSE': False,
+    'on': True, 'On': True, 'ON': True, 'off': False, 'Off': False, 'OFF': False,
+}
+
+# Chave simples seguida de ':' e do valor (ou fim de linha)
+PADRAO_CHAVE = re.compile(r'([A-Za-z_][A-Za-z0-9_-]*):(?: +(.*))?$')
+
+# Inteiro decimal sem sublinhados (o único formato numérico aceito aqui)
+PADRAO_INTEIRO = re.compile(r'[-+]?(?:0|[1-9][0-9]*)')
+
+# Caracteres que não podem iniciar um escalar simples no subconjunto:
+# indicadores do YAML e início de números, datas, .inf/.nan, '=' e '<<'
+INICIO_RESERVADO = set('-?:,[]{}#&*!|>\'"%@`') | set('0123456789+.~=<')
+
+
+class _ForaDoSubconjunto(Exception):
+    """O texto usa recursos do YAML que este interpretador não cobre."""
+
+
+def _escalar(texto: str) -> object:
+    """Converte um valor de uma linha como o yaml.safe_load faria."""
+    if texto.startswith('"'):
+        conteudo = texto[1:-1]
+        if len(texto) < 2 or not texto.endswith('"') or '"' in conteudo or '\\' in conteudo:
+            raise _ForaDoSubconjunto
+        return conteudo
+    
+    if texto.startswith("'"):
+        conteudo = texto[1:-1]
+        if len(texto) < 2 or not texto.endswith("'") or "'" in conteudo.replace("''", ''):
+            raise _ForaDoSubconjunto
+        return conteudo.replace("''", "'")
+    
+    if texto.startswith('['):
+        return _lista_fluxo(texto)
+    
+    if texto in NULOS:
+        return None
+    if texto in BOOLEANOS:
+        return BOOLEANOS[texto]
+    if PADRAO_INTEIRO.fullmatch(texto):
+        return int(texto)
+    if texto[0] in INICIO_RESERVADO or ': ' in texto or ' #' in texto or texto.endswith(':'):
+        raise _ForaDoSubconjunto
+    return texto
+
+
+def _lista_fluxo(texto: str) -> list:
+    """Converte uma lista entre colchetes de escalares simples ([Read, Grep])."""
+    if not texto.endswith(']'):
+        raise _ForaDoSubconjunto
+    interno = texto[1:-1].strip(' ')
+    if not interno:
+        return []
+    itens = []
+    for item in interno.split(','):
+        item = item.strip(' ')
+        # Itens vazios, aninhados ou com ':'/'#' ficam para o PyYAML
+        if not item or any(c in item for c in '[]{}:#'):
+            raise _ForaDoSubconjunto
+        itens.append(_escalar(item))
+    return itens
+
+
+def _chave(linha: str) -> tuple[str, str | None]:
+    """Separa 'chave: valor' em (chave, valor sem espaços nas pontas ou None)."""
+    match = PADRAO_CHAVE.match(linha)
+    if not match or match.group(1) in NULOS or match.group(1) in BOOLEANOS:
+        raise _ForaDoSubconjunto
+    valor = (match.group(2) or '').strip()
+    return match.group(1), valor or None
+
+
+def _analisar_simples(texto: str) -> dict | None:
+    """Interpreta o subconjunto simples; levanta _ForaDoSubconjunto fora dele."""
+    resultado: dict = {}
+    bloco = None          # lista ou dict aberto por uma chave sem valor
+    chave_bloco = None
+    recuo_bloco = None
+    
+    for linha in texto.split('\n'):
+        conteudo = linha.strip(' ')
+        if not conteudo or conteudo.startswith('#'):
+            continue
+        if not linha.isprintable():
+            raise _ForaDoSubconjunto
+        recuo = len(linha) - len(linha.lstrip(' '))
+        
+        if recuo == 0:
+            chave, valor = _chave(conteudo)
+            resultado[chave] = None if valor is None else _escalar(valor)
+            chave_bloco = chave if valor is None else None
+            bloco = recuo_bloco = None
+            continue
+        
+        # Linha recuada: só como item do bloco aberto pela chave anterior
+        if chave_bloco is None or (recuo_bloco is not None and recuo != recuo_bloco):
+            raise _ForaDoSubconjunto
+        
+        if conteudo == '-' or conteudo.startswith('- '):
+            if bloco is None:
+                bloco = resultado[chave_bloco] = []
+            elif not isinstance(bloco, list):
+                raise _ForaDoSubconjunto
+            item = conteudo[1:].strip(' ')
+            bloco.append(_escalar(item) if item else None)
+        else:
+            if bloco is None:
+                bloco = resultado[chave_bloco] = {}
+            elif not isinstance(bloco, dict):
+                raise _ForaDoSubconjunto
+            chave, valor = _chave(conteudo)
+            # Valor vazio em mapa aninhado pode abrir outro nível: deixar ao PyYAML
+            if valor is None:
+                raise _ForaDoSubconjunto
+            bloco[chave] = _escalar(valor)
+        recuo_bloco = recuo
+    
+    return resultado or None
+
+
+def _carregar_com_yaml(texto: str) -> tuple[object, Exception | None]:
+    """Carrega com PyYAML (importado só aqui), preferindo a libyaml."""
+    try:
+        import yaml
+    except ImportError:
+        return None, ImportError(
+            "frontmatter fora do formato simples (ex.: blocos | e >) requer o PyYAML, "
+            "que não está instalado — instale com: pip install pyyaml"
+        )
+    
+    loader = getattr(yaml, 'CSafeLoader', None)
+    if loader is not None:
+        try:
+            return yaml.load(texto, Loader=loader), None
+        except yaml.YAMLError:
+            # Reinterpretar com o SafeLoader para reportar o mesmo erro
+            # (mensagem e posição) que yaml.safe_load
+            pass
+    try:
+        return yaml.load(texto, Loader=yaml.SafeLoader), None
+    except yaml.YAMLError as e:
+        return None, e
+
+
+def carregar_frontmatter(texto: str) -> tuple[object, Exception | None]:
+    """
+    Interpreta o texto YAML do frontmatter.
+    
+    Args:
+        texto: Conteúdo entre os delimitadores ---
+    
+    Returns:
+        Tupla (valor como em yaml.safe_load, erro yaml.YAMLError,
+        ImportError sem PyYAML, ou None)
+    """
+    try:
+        return _analisar_simples(texto), None
+    except _ForaDoSubconjunto:
+        return _carregar_com_yaml(texto)
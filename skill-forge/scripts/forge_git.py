@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Forge Git — Habilidades alteradas lidas direto do git (--changed-since, --staged)
+
+Uso (como módulo):
+    from forge_git import habilidades_do_git
+
+    with habilidades_do_git(Path('./skills'), desde='origin/main') as habilidades:
+        for relativo, caminho in habilidades:
+            ...   # caminho: cópia da habilidade fora da árvore de trabalho
+
+Os caminhos alterados vêm de `git diff --name-only` (entre <ref> e HEAD
+ou, com --staged, entre HEAD e o índice). Cada caminho é levado à raiz
+da sua habilidade subindo pelos diretórios até um SKILL.md que exista na
+revisão lida (HEAD ou índice). A lista de arquivos dessas habilidades
+vem de uma única chamada a ls-tree/ls-files e o conteúdo de um único
+processo `git cat-file --batch`, gravado em um diretório temporário.
+
+A árvore de trabalho não é lida nem alterada (o pre-commit valida o que
+será de fato commitado) e o custo depende do número de habilidades
+alteradas, não do tamanho da biblioteca.
+
+listar_commits() e LeitorObjetos.arvore() servem ao forge_history, que
+percorre o histórico lendo árvores e blobs pelo mesmo processo.
+"""
+
+import os
+import shutil
+import tempfile
+import subprocess
+from pathlib import Path
+from datetime import datetime
+from contextlib import contextmanager
+from collections.abc import Iterator
+
+from forge_validate import DIRETORIOS_IGNORADOS_BUSCA
+
+
+# Modos de arquivo comuns e executáveis (links simbólicos e submódulos ficam de fora)
+MODO_ARQUIVO = '100644'
+MODO_EXECUTAVEL = '100755'
+
+# Bytes copiados por vez de um objeto grande para o disco
+TAMANHO_COPIA = 1024 * 1024
+
+
+class ErroGit(Exception):
+    """Falha ao executar um comando git (repositório ou revisão inválidos)."""
+
+
+def _git(repositorio: Path, *argumentos: str) -> bytes:
+    """Executa um comando git no repositório e retorna a saída."""
+    try:
+        resultado = subprocess.run(
+            ['git', *argumentos], cwd=repositorio, capture_output=True, check=True
+        )
+    except FileNotFoundError:
+        raise ErroGit("git não encontrado no PATH")
+    except subprocess.CalledProcessError as e:
+        mensagem = e.stderr.decode('utf-8', 'replace').strip()
+        raise ErroGit(f"git {argumentos[0]}: {mensagem}")
+    return resultado.stdout
+
+
+def raiz_repositorio(caminho: Path) -> Path:
+    """Diretório raiz do repositório git que contém o caminho."""
+    if not caminho.is_dir():
+        raise ErroGit(f"Caminho não é um diretório: {caminho}")
+    return Path(_git(caminho, 'rev-parse', '--show-toplevel').decode('utf-8').strip()).resolve()
+
+
+def caminhos_alterados(repositorio: Path, desde: str | None = None, indice: bool = False) -> list[str]:
+    """
+    Caminhos (relativos à raiz do repositório) alterados.
+    
+    Args:
+        repositorio: Raiz do repositório
+        desde: Revisão de comparação com HEAD (--changed-since)
+        indice: Se True, alterações do índice em relação a HEAD (--staged)
+    
+    Returns:
+        Caminhos criados, alterados ou removidos
+    """
+    if indice:
+        saida = _git(repositorio, 'diff', '--cached', '--name-only', '--no-renames', '-z')
+    else:
+        saida = _git(repositorio, 'diff', '--name-only', '--no-renames', '-z', desde, 'HEAD', '--')
+    return [c for c in saida.decode('utf-8', 'surrogateescape').split('\0') if c]
+
+
+class Commit:
+    """Commit do histórico (hash, data e assunto)."""
+    
+    __slots__ = ('hash', 'data', 'assunto')
+    
+    def __init__(self, hash: str, data: int, assunto: str):
+        self.hash = hash
+        self.data = data
+        self.assunto = assunto
+    
+    @property
+    def dia(self) -> str:
+        return datetime.fromtimestamp(self.data).date().isoformat()
+
+
+def listar_commits(repositorio: Path, prefixo: str, max_commits: int | None = None) -> list[Commit]:
+    """
+    Commits que tocam o caminho, do mais antigo ao mais novo.
+    
+    Args:
+        repositorio: Raiz do repositório
+        prefixo: Caminho relativo à raiz ('' para o repositório todo)
+        max_commits: Só os N commits mais recentes
+    
+    Returns:
+        Lista de commits (primeiro pai)
+    """
+    argumentos = ['log', '--first-parent', '--reverse', '-z', '--format=%H%x1f%ct%x1f%s']
+    if max_commits:
+        argumentos.append(f'--max-count={max_commits}')
+    argumentos += ['HEAD', '--', prefixo or '.']
+    commits = []
+    for registro in _git(repositorio, *argumentos).decode('utf-8', 'replace').split('\0'):
+        if registro:
+            hash, data, assunto = registro.split('\x1f', 2)
+            commits.append(Commit(hash, int(data), assunto))
+    return commits
+
+
+class LeitorObjetos:
+    """Um único processo `git cat-file --batch` para ler muitos objetos."""
+    
+    def __init__(self, repositorio: Path):
+        self.processo = subprocess.Popen(
+            ['git', 'cat-file', '--batch'], cwd=repositorio,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE
+        )
+    
+    def _pedir(self, objeto: str) -> tuple[str, int, int] | None:
+        """Envia o pedido e lê o cabeçalho: (tipo, tamanho, bytes do hash) ou None se não existir."""
+        if '\n' in objeto:
+            return None
+        self.processo.stdin.write(objeto.encode('utf-8', 'surrogateescape') + b'\n')
+        self.processo.stdin.flush()
+        cabecalho = self.processo.stdout.readline().split()
+        if len(cabecalho) != 3:
+            return None
+        return cabecalho[1].decode('ascii'), int(cabecalho[2]), len(cabecalho[0]) // 2
+    
+    def ler(self, objeto: str) -> tuple[str, bytes] | None:
+        """
+        Tipo e conteúdo de um objeto.
+        
+        Args:
+            objeto: Nome do objeto (hash, 'HEAD:caminho' ou ':caminho' no índice)
+        
+        Returns:
+            Tupla (tipo, conteúdo), ou None se o objeto não existir
+        """
+        pedido = self._pedir(objeto)
+        if pedido is None:
+            return None
+        tipo, tamanho, _ = pedido
+        conteudo = self.processo.stdout.read(tamanho)
+        self.processo.stdout.read(1)  # quebra de linha após o conteúdo
+        return tipo, conteudo
+    
+    def arvore(self, objeto: str) -> list[tuple[str, str, str]] | None:
+        """
+        Entradas de uma árvore (diretório) do git.
+        
+        Args:
+            objeto: Hash da árvore ou nome como 'HEAD:skills', '<commit>^{tree}'
+        
+        Returns:
+            Lista (modo, nome, hash) em ordem, ou None se não for uma árvore
+        """
+        pedido = self._pedir(objeto)
+        if pedido is None:
+            return None
+        tipo, tamanho, bytes_hash = pedido
+        dados = self.processo.stdout.read(tamanho)
+        self.processo.stdout.read(1)
+        if tipo != 'tree':
+            return None
+        # Formato binário: "<modo> <nome>\0<hash>" repetido
+        entradas = []
+        posicao = 0
+        while posicao < len(dados):
+            espaco = dados.index(b' ', posicao)
+            nulo = dados.index(b'\0', espaco)
+            fim = nulo + 1 + bytes_hash
+            entradas.append((
+                dados[posicao:espaco].decode('ascii'),
+                dados[espaco + 1:nulo].decode('utf-8', 'surrogateescape'),
+                dados[nulo + 1:fim].hex(),
+            ))
+            posicao = fim
+        return entradas
+    
+    def copiar(self, objeto: str, destino: Path) -> bool:
+        """Grava o conteúdo de um objeto em um arquivo, em blocos."""
+        pedido = self._pedir(objeto)
+        if pedido is None:
+            return False
+        restante = pedido[1]
+        with open(destino, 'wb') as f:
+            while restante:
+                bloco = self.processo.stdout.read(min(restante, TAMANHO_COPIA))
+                f.write(bloco)
+                restante -= len(bloco)
+        self.processo.stdout.read(1)
+        return True
+    
+    def fechar(self):
+        self.processo.stdin.close()
+        self.processo.wait()
+    
+    def __enter__(self) -> 'LeitorObjetos':
+        return self
+    
+    def __exit__(self, *_):
+        self.fechar()
+
+
+def raizes_de_habilidades(
+    caminhos: list[str],
+    leitor: LeitorObjetos,
+    revisao: str,
+    prefixo: str = ''
+) -> list[str]:
+    """
+    Raízes das habilidades que contêm os caminhos.
+    
+    Como encontrar_habilidades(), vale o SKILL.md mais externo abaixo do
+    prefixo, e diretórios ocultos ou de dependências são ignorados.
+    
+    Args:
+        caminhos: Caminhos alterados, relativos à raiz do repositório
+        leitor: Leitor de objetos do repositório
+        revisao: 'HEAD:' para o último commit, ':' para o índice
+        prefixo: Só habilidades abaixo deste diretório ('' para todas)
+    
+    Returns:
+        Raízes das habilidades (relativas à raiz do repositório), ordenadas
+    """
+    partes_prefixo = prefixo.split('/') if prefixo else []
+    tem_skill_md: dict[str, bool] = {}
+    raizes = set()
+    for caminho in caminhos:
+        partes = caminho.split('/')[:-1]
+        if partes[:len(partes_prefixo)] != partes_prefixo:
+            continue
+        abaixo = partes[len(partes_prefixo):]
+        if any(p in DIRETORIOS_IGNORADOS_BUSCA or p.startswith('.') for p in abaixo):
+            continue
+        for n in range(len(partes_prefixo), len(partes) + 1):
+            diretorio = '/'.join(partes[:n])
+            if diretorio not in tem_skill_md:
+                objeto = leitor.ler(f"{revisao}{diretorio}/SKILL.md" if diretorio else f"{revisao}SKILL.md")
+                tem_skill_md[diretorio] = objeto is not None and objeto[0] == 'blob'
+            if tem_skill_md[diretorio]:
+                raizes.add(diretorio)
+                break
+    return sorted(raizes)
+
+
+def _listar(repositorio: Path, raizes: list[str], indice: bool) -> Iterator[tuple[str, str, str]]:
+    """(modo, objeto, caminho) dos arquivos das habilidades em HEAD ou no índice."""
+    especificacoes = [raiz or '.' for raiz in raizes]
+    if indice:
+        saida = _git(repositorio, 'ls-files', '-s', '-z', '--', *especificacoes)
+    else:
+        saida = _git(repositorio, 'ls-tree', '-r', '-z', 'HEAD', '--', *especificacoes)
+    for registro in saida.decode('utf-8', 'surrogateescape').split('\0'):
+        if not registro:
+            continue
+        cabecalho, _, caminho = registro.partition('\t')
+        campos = cabecalho.split()
+        if indice:
+            modo, objeto, estagio = campos
+            if estagio != '0':
+                continue
+        else:
+            modo, _, objeto = campos
+        yield modo, objeto, caminho
+
+
+def extrair_habilidades(
+    repositorio: Path,
+    raizes: list[str],
+    leitor: LeitorObjetos,
+    destino: Path,
+    indice: bool = False
+) -> list[tuple[str, Path]]:
+    """
+    Grava os arquivos das habilidades (de HEAD ou do índice) em um diretório.
+    
+    Cada habilidade vai para destino/<n>/<nome-do-diretório>, preservando o
+    nome usado nas validações (name = nome do diretório) e no pacote.
+    
+    Returns:
+        Lista (raiz relativa ao repositório, cópia gravada)
+    """
+    copias = {
+        raiz: destino / str(n) / (raiz.rpartition('/')[2] or repositorio.name)
+        for n, raiz in enumerate(raizes)
+    }
+    for copia in copias.values():
+        copia.mkdir(parents=True)
+    
+    for modo, objeto, caminho in _listar(repositorio, raizes, indice):
+        if modo not in (MODO_ARQUIVO, MODO_EXECUTAVEL):
+            continue
+        # Raiz da habilidade: o diretório ancestral que está na lista
+        diretorio = caminho
+        while diretorio and diretorio not in copias:
+            diretorio = diretorio.rpartition('/')[0]
+        if diretorio not in copias:
+            continue
+        relativo = caminho[len(diretorio) + 1:] if diretorio else caminho
+        arquivo = copias[diretorio] / relativo
+        arquivo.parent.mkdir(parents=True, exist_ok=True)
+        if leitor.copiar(objeto, arquivo) and modo == MODO_EXECUTAVEL:
+            os.chmod(arquivo, 0o755)
+    
+    return list(copias.items())
+
+
+@contextmanager
+def habilidades_do_git(
+    caminho: Path,
+    desde: str | None = None,
+    indice: bool = False
+) -> Iterator[list[tuple[str, Path]]]:
+    """
+    Habilidades alteradas, copiadas de HEAD (--changed-since) ou do índice (--staged).
+    
+    Args:
+        caminho: Diretório no repositório; só habilidades abaixo dele contam
+        desde: Revisão de comparação (--changed-since <ref>)
+        indice: Se True, usa as alterações preparadas para commit (--staged)
+    
+    Yields:
+        Lista (raiz relativa ao repositório, cópia temporária); as cópias
+        são apagadas ao sair do bloco
+    """
+    caminho = Path(caminho).resolve()
+    repositorio = raiz_repositorio(caminho)
+    prefixo = caminho.relative_to(repositorio).as_posix()
+    prefixo = '' if prefixo == '.' else prefixo
+    
+    alterados = caminhos_alterados(repositorio, desde, indice)
+    destino = Path(tempfile.mkdtemp(prefix='forge-git-'))
+    try:
+        with LeitorObjetos(repositorio) as leitor:
+            raizes = raizes_de_habilidades(alterados, leitor, ':' if indice else 'HEAD:', prefixo)
+            habilidades = extrair_habilidades(repositorio, raizes, leitor, destino, indice) if raizes else []
+        yield habilidades
+    finally:
+        shutil.rmtree(destino, ignore_errors=True)
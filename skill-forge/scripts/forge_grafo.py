@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Forge Grafo — Grafo de carga progressiva das references
+
+Uso (como módulo):
+    from forge_grafo import construir_grafo
+
+    grafo = construir_grafo(documento)
+    grafo.secoes                 # seção ## do SKILL.md -> references citadas
+    grafo.arestas                # reference -> references citadas por ela
+    grafo.carga(secao)           # CargaSecao: esperada, pior caso, profundidade
+
+Uma reference entra no contexto quando o SKILL.md (ou outra reference
+já carregada) aponta para ela: links Markdown, "veja references/x.md",
+comandos como `grep ... references/x.md`. O grafo resolve essas menções
+contra o inventário e calcula, para cada seção ## do SKILL.md, quais
+arquivos podem ser puxados e a quantos saltos de distância.
+
+A carga no pior caso soma os tokens de tudo que é alcançável. A carga
+esperada supõe que as references citadas diretamente pela seção são
+lidas e que cada salto seguinte só é seguido com PROBABILIDADE_SALTO.
+
+As menções são procuradas a partir da extensão dos arquivos existentes
+(busca literal em C) e o caminho é lido para trás a partir dela, em
+blocos: references de dezenas de MB não são carregadas inteiras.
+"""
+
+import re
+import posixpath
+from bisect import bisect_right
+from collections import deque
+
+from forge_documento import DocumentoHabilidade
+from forge_leitura import blocos
+from forge_tokens import ContadorTokens
+
+
+# Probabilidade de seguir uma menção a partir de uma reference já carregada
+PROBABILIDADE_SALTO = 0.5
+
+# Maior caminho lido para trás a partir da extensão (também a sobreposição dos blocos)
+MAX_CAMINHO = 256
+
+# Caracteres de um caminho citado no texto (termina na extensão)
+PADRAO_CAMINHO = re.compile(rb'[\w./-]+$')
+
+# Entrada do SKILL.md antes da primeira seção ##
+INICIO = 'SKILL.md (antes da primeira seção ##)'
+
+
+class CargaSecao:
+    """Carga de contexto das references alcançáveis a partir de uma seção."""
+    
+    def __init__(self, secao: str, diretos: list[str], alcance: dict[str, int], tokens: dict[str, int]):
+        self.secao = secao
+        self.diretos = diretos
+        self.alcance = alcance      # arquivo -> saltos a partir da seção (1 = citado nela)
+        self.pior = sum(tokens[arquivo] for arquivo in alcance)
+        self.esperada = round(sum(
+            tokens[arquivo] * PROBABILIDADE_SALTO ** (saltos - 1)
+            for arquivo, saltos in alcance.items()
+        ))
+        self.profundidade = max(alcance.values(), default=0)
+    
+    def como_dict(self) -> dict:
+        return {
+            'secao': self.secao,
+            'diretos': self.diretos,
+            'alcancaveis': len(self.alcance),
+            'profundidade': self.profundidade,
+            'esperada': self.esperada,
+            'pior': self.pior,
+        }
+
+
+class GrafoCarga:
+    """Menções entre SKILL.md (por seção ##) e references, com tokens por arquivo."""
+    
+    def __init__(self):
+        self.secoes: dict[str, set[str]] = {}
+        self.arestas: dict[str, set[str]] = {}
+        self.tokens: dict[str, int] = {}
+    
+    def alcance(self, origens: set[str]) -> dict[str, int]:
+        """
+        Arquivos alcançáveis e a menor distância em saltos (busca em largura).
+        
+        Args:
+            origens: References citadas diretamente (distância 1)
+        
+        Returns:
+            Dicionário arquivo -> número de saltos
+        """
+        distancias = {arquivo: 1 for arquivo in origens}
+        fila = deque(origens)
+        while fila:
+            arquivo = fila.popleft()
+            for destino in self.arestas.get(arquivo, ()):
+                if destino not in distancias:
+                    distancias[destino] = distancias[arquivo] + 1
+                    fila.append(destino)
+        return distancias
+    
+    def carga(self, secao: str) -> CargaSecao:
+        """Carga esperada e no pior caso de uma seção do SKILL.md."""
+        diretos = self.secoes.get(secao, set())
+        return CargaSecao(secao, sorted(diretos), self.alcance(diretos), self.tokens)
+    
+    def cargas(self) -> list[CargaSecao]:
+        """Carga de cada seção que cita alguma reference, da mais pesada para a mais leve."""
+        cargas = [self.carga(secao) for secao, diretos in self.secoes.items() if diretos]
+        cargas.sort(key=lambda carga: (-carga.pior, carga.secao))
+        return cargas
+    
+    def inalcancaveis(self) -> list[str]:
+        """References que nenhuma seção do SKILL.md alcança, nem indiretamente."""
+        alcancados = self.alcance(set().union(*self.secoes.values()))
+        return sorted(arquivo for arquivo in self.arestas if arquivo not in alcancados)
+
+
+class _Resolvedor:
+    """Resolve caminhos citados contra as references do inventário."""
+    
+    def __init__(self, nos: list[str]):
+        self.nos = set(nos)
+        self.por_nome: dict[str, list[str]] = {}
+        for no in nos:
+            self.por_nome.setdefault(posixpath.basename(no), []).append(no)
+        extensoes = sorted({posixpath.splitext(no)[1][1:] for no in nos} - {''})
+        # Sem \w depois da extensão: "x.md" sim, "x.mdx" não
+        self.padrao = re.compile(
+            rb'\.(?:' + b'|'.join(re.escape(e.encode('utf-8')) for e in extensoes) + rb')(?![\w])'
+        ) if extensoes else None
+    
+    def resolver(self, citado: str, origem: str) -> str | None:
+        """Reference citada, relativa ao arquivo que cita, à raiz ou pelo nome (se único)."""
+        for base in (posixpath.dirname(origem), ''):
+            caminho = posixpath.normpath(posixpath.join(base, citado))
+            if caminho in self.nos and caminho != origem:
+                return caminho
+        candidatos = self.por_nome.get(posixpath.basename(citado), [])
+        if len(candidatos) == 1 and candidatos[0] != origem:
+            return candidatos[0]
+        return None
+    
+    def citacoes(self, dados: bytes) -> list[tuple[int, str]]:
+        """(posição, caminho) de cada caminho terminado em extensão conhecida."""
+        if self.padrao is None:
+            return []
+        encontrados = []
+        for match in self.padrao.finditer(dados):
+            inicio = max(0, match.start() - MAX_CAMINHO)
+            caminho = PADRAO_CAMINHO.search(dados, inicio, match.start())
+            if caminho:
+                citado = dados[caminho.start():match.end()].decode('utf-8', 'replace')
+                encontrados.append((caminho.start(), citado))
+        return encontrados
+
+
+def construir_grafo(documento: DocumentoHabilidade, contador: ContadorTokens | None = None) -> GrafoCarga:
+    """
+    Grafo de carga de uma habilidade.
+    
+    Args:
+        documento: Habilidade lida (forge_documento)
+        contador: Contador de tokens com cache (opcional)
+    
+    Returns:
+        GrafoCarga com seções ##, arestas entre references e tokens
+    """
+    contador = contador or ContadorTokens()
+    grafo = GrafoCarga()
+    nos = [e.relativo for e in documento.inventario.arquivos_em('references', recursivo=True)]
+    resolvedor = _Resolvedor(nos)
+    
+    # SKILL.md: cada menção pertence à seção ## em que aparece
+    secoes = [s for s in documento.estrutura.secoes if s.nivel == 2]
+    linhas = [s.linha for s in secoes]
+    nomes = [f"SKILL.md:{s.linha} ## {s.titulo}" for s in secoes]
+    grafo.secoes = {INICIO: set(), **{nome: set() for nome in nomes}}
+    dados = (documento.texto or '').encode('utf-8')
+    linha, anterior = 1, 0
+    for posicao, citado in resolvedor.citacoes(dados):
+        linha += dados.count(b'\n', anterior, posicao)
+        anterior = posicao
+        destino = resolvedor.resolver(citado, 'SKILL.md')
+        if destino:
+            indice = bisect_right(linhas, linha) - 1
+            grafo.secoes[nomes[indice] if indice >= 0 else INICIO].add(destino)
+    
+    # References: menções em blocos (a sobreposição cobre caminhos na fronteira)
+    for no in nos:
+        destinos = grafo.arestas[no] = set()
+        grafo.tokens[no] = contador.tokens_arquivo(documento.caminho / no)
+        if grafo.tokens[no] == 0:
+            continue
+        for bloco in blocos(documento.caminho / no, MAX_CAMINHO):
+            for _, citado in resolvedor.citacoes(bloco):
+                destino = resolvedor.resolver(citado, no)
+                if destino:
+                    destinos.add(destino)
+    
+    return grafo
@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""
+Forge History — Evolução do custo de contexto das habilidades no git
+
+Uso:
+    forge_history.py <habilidade-ou-biblioteca> [--max-count <n>] [--threshold <tokens>]
+                     [--top <n>] [--db <arquivo>]
+
+Exemplos:
+    forge_history.py ./minha-habilidade
+    forge_history.py ./skills --max-count 500 --threshold 1000
+
+Mostra:
+    - Crescimento de cada habilidade entre o primeiro e o último commit:
+      linhas e tokens do SKILL.md e pior caso com as references
+    - Commits que aumentaram o custo ao ativar em --threshold tokens ou
+      mais (padrão LIMIAR_AUMENTO), ou que o levaram além do limite da
+      análise (LIMITE_TOKENS_SKILL_MD)
+
+Os commits que tocam o caminho (primeiro pai, do mais antigo ao mais
+novo) são lidos por um único processo `git cat-file --batch`, sem
+checkout. As árvores do git identificam o conteúdo: cada versão de uma
+habilidade (hash da árvore do diretório) é analisada uma única vez pelo
+Analisador de forge_analyze, e a cópia em disco usada na análise só
+regrava os blobs que mudaram desde a versão anterior.
+
+As métricas ficam em SQLite ($FORGE_CACHE_DIR/historico.sqlite por
+padrão), com as alterações de cada commit em relação ao anterior da
+lista. Rodar de novo só processa os commits novos; se o histórico foi
+reescrito, os commits cujo antecessor mudou são processados outra vez.
+"""
+
+import os
+import sys
+import json
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from forge_analyze import Analisador, LIMITE_TOKENS_SKILL_MD
+from forge_cache import diretorio_cache_padrao
+from forge_documento import DocumentoHabilidade
+from forge_git import (
+    Commit, ErroGit, LeitorObjetos, MODO_ARQUIVO, MODO_EXECUTAVEL, listar_commits, raiz_repositorio
+)
+from forge_tokens import VERSAO_TOKENIZADOR
+from forge_validate import DIRETORIOS_IGNORADOS_BUSCA
+from forge_perfil import configurar, trecho
+
+
+# Versão das métricas gravadas: incrementar ao mudar as regras de análise
+VERSAO_HISTORICO = 1
+
+# Modo das árvores (diretórios) dentro de um objeto tree
+MODO_ARVORE = '40000'
+
+# Aumento do custo ao ativar, em tokens, que marca um commit como regressão
+LIMIAR_AUMENTO = 500
+
+# Habilidades listadas no relatório de crescimento
+TOP_PADRAO = 20
+
+# Commits processados entre gravações no banco
+COMMITS_POR_TRANSACAO = 100
+
+
+class Ponto:
+    """Métricas de uma versão de uma habilidade, no commit que a criou."""
+    
+    __slots__ = ('commit', 'linhas', 'tokens_ativar', 'tokens_pior')
+    
+    def __init__(self, commit: Commit, linhas: int, tokens_ativar: int, tokens_pior: int):
+        self.commit = commit
+        self.linhas = linhas
+        self.tokens_ativar = tokens_ativar
+        self.tokens_pior = tokens_pior
+
+
+class _Arvores:
+    """Habilidades e arquivos de árvores do git, memorizados pelo hash da árvore."""
+    
+    def __init__(self, leitor: LeitorObjetos):
+        self.leitor = leitor
+        self._habilidades: dict[str, list[tuple[str, str]]] = {}
+        self._arquivos: dict[str, dict[str, tuple[str, str]]] = {}
+    
+    def do_commit(self, commit: str, prefixo: str) -> str | None:
+        """Hash da árvore do prefixo no commit, ou None se ele não existir."""
+        objeto = self.leitor.ler(commit)
+        if objeto is None or objeto[0] != 'commit':
+            return None
+        arvore = objeto[1].split(b'\n', 1)[0].split()[1].decode('ascii')
+        for parte in prefixo.split('/') if prefixo else []:
+            entradas = self.leitor.arvore(arvore) or []
+            arvore = next((h for modo, nome, h in entradas if nome == parte and modo == MODO_ARVORE), None)
+            if arvore is None:
+                return None
+        return arvore
+    
+    def habilidades(self, arvore: str) -> list[tuple[str, str]]:
+        """
+        Habilidades abaixo de uma árvore, como encontrar_habilidades().
+        
+        Returns:
+            Lista (caminho relativo, hash da árvore da habilidade); o
+            caminho é '' se a própria árvore for uma habilidade
+        """
+        if arvore in self._habilidades:
+            return self._habilidades[arvore]
+        entradas = self.leitor.arvore(arvore) or []
+        if any(nome == 'SKILL.md' and modo in (MODO_ARQUIVO, MODO_EXECUTAVEL) for modo, nome, _ in entradas):
+            encontradas = [('', arvore)]
+        else:
+            encontradas = []
+            for modo, nome, hash in entradas:
+                if modo != MODO_ARVORE or nome in DIRETORIOS_IGNORADOS_BUSCA or nome.startswith('.'):
+                    continue
+                for relativo, habilidade in self.habilidades(hash):
+                    encontradas.append((f"{nome}/{relativo}" if relativo else nome, habilidade))
+        self._habilidades[arvore] = encontradas
+        return encontradas
+    
+    def arquivos(self, arvore: str) -> dict[str, tuple[str, str]]:
+        """Arquivos comuns e executáveis da árvore: caminho relativo -> (modo, blob)."""
+        if arvore in self._arquivos:
+            return self._arquivos[arvore]
+        arquivos = {}
+        for modo, nome, hash in self.leitor.arvore(arvore) or []:
+            if modo == MODO_ARVORE:
+                for relativo, entrada in self.arquivos(hash).items():
+                    arquivos[f"{nome}/{relativo}"] = entrada
+            elif modo in (MODO_ARQUIVO, MODO_EXECUTAVEL):
+                arquivos[nome] = (modo, hash)
+        self._arquivos[arvore] = arquivos
+        return arquivos
+
+
+class _Copia:
+    """Cópia em disco de uma habilidade, atualizada só nos arquivos que mudaram."""
+    
+    def __init__(self, diretorio: Path):
+        self.diretorio = diretorio
+        self.arquivos: dict[str, tuple[str, str]] = {}
+        diretorio.mkdir(parents=True)
+    
+    def atualizar(self, arquivos: dict[str, tuple[str, str]], leitor: LeitorObjetos):
+        """Apaga os arquivos removidos e grava os blobs novos ou alterados."""
+        # Remoções antes das gravações: um arquivo pode virar diretório e vice-versa
+        for relativo in self.arquivos.keys() - arquivos.keys():
+            arquivo = self.diretorio / relativo
+            arquivo.unlink()
+            # Diretórios vazios mudariam o inventário (ex.: scripts/ sem arquivos)
+            pai = arquivo.parent
+            while pai != self.diretorio and not any(pai.iterdir()):
+                pai.rmdir()
+                pai = pai.parent
+        
+        for relativo, (modo, blob) in arquivos.items():
+            if self.arquivos.get(relativo) == (modo, blob):
+                continue
+            arquivo = self.diretorio / relativo
+            arquivo.parent.mkdir(parents=True, exist_ok=True)
+            leitor.copiar(blob, arquivo)
+            os.chmod(arquivo, 0o755 if modo == MODO_EXECUTAVEL else 0o644)
+        self.arquivos = dict(arquivos)
+
+
+class HistoricoMetricas:
+    """Série temporal das métricas das habilidades em SQLite, atualizada por commit."""
+    
+    def __init__(self, caminho: Path):
+        self.caminho = caminho
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        self.conexao = sqlite3.connect(str(caminho), timeout=30)
+        self._preparar()
+    
+    @classmethod
+    def padrao(cls, caminho: str | None = None) -> 'HistoricoMetricas':
+        """Abre o banco indicado ou o padrão, no diretório de cache."""
+        if caminho:
+            return cls(Path(caminho).expanduser())
+        return cls(diretorio_cache_padrao() / 'historico.sqlite')
+    
+    def __enter__(self) -> 'HistoricoMetricas':
+        return self
+    
+    def __exit__(self, *_):
+        self.conexao.close()
+    
+    def _preparar(self):
+        """Cria as tabelas; recomeça o histórico se o formato das métricas mudou."""
+        c = self.conexao
+        c.execute("CREATE TABLE IF NOT EXISTS meta (chave TEXT PRIMARY KEY, valor TEXT)")
+        versao = c.execute("SELECT valor FROM meta WHERE chave = 'versao'").fetchone()
+        formato = f"{VERSAO_HISTORICO}:{VERSAO_TOKENIZADOR}"
+        if versao is not None and versao[0] != formato:
+            c.executescript("DROP TABLE IF EXISTS analises; DROP TABLE IF EXISTS commits; "
+                            "DROP TABLE IF EXISTS alteracoes;")
+        c.executescript("""
+            CREATE TABLE IF NOT EXISTS analises (
+                arvore TEXT PRIMARY KEY,
+                linhas INTEGER NOT NULL,
+                tokens_ativar INTEGER NOT NULL,
+                tokens_pior INTEGER NOT NULL,
+                metricas TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS commits (
+                repositorio TEXT NOT NULL,
+                prefixo TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                anterior TEXT NOT NULL,
+                PRIMARY KEY (repositorio, prefixo, hash)
+            );
+            CREATE TABLE IF NOT EXISTS alteracoes (
+                repositorio TEXT NOT NULL,
+                prefixo TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                habilidade TEXT NOT NULL,
+                arvore TEXT,
+                PRIMARY KEY (repositorio, prefixo, hash, habilidade)
+            );
+        """)
+        c.execute("INSERT OR REPLACE INTO meta VALUES ('versao', ?)", (formato,))
+        c.commit()
+    
+    def _analise(self, arvore: str) -> tuple[int, int, int] | None:
+        return self.conexao.execute(
+            "SELECT linhas, tokens_ativar, tokens_pior FROM analises WHERE arvore = ?", (arvore,)
+        ).fetchone()
+    
+    def _analisar(self, arvore: str, arquivos: dict, copia: _Copia, leitor: LeitorObjetos) -> tuple[int, int, int]:
+        """Atualiza a cópia para a versão da árvore e grava as métricas do Analisador."""
+        copia.atualizar(arquivos, leitor)
+        caminho = copia.diretorio.resolve()
+        metricas = Analisador(caminho, DocumentoHabilidade(caminho)).analisar().get('metricas', {})
+        valores = (
+            metricas.get('skill_md', {}).get('linhas', 0),
+            metricas.get('tokens', {}).get('ao_ativar', 0),
+            metricas.get('tokens', {}).get('pior_caso', 0),
+        )
+        self.conexao.execute(
+            "INSERT OR REPLACE INTO analises VALUES (?, ?, ?, ?, ?)",
+            (arvore, *valores, json.dumps(metricas, ensure_ascii=False))
+        )
+        return valores
+    
+    def atualizar(
+        self,
+        caminho: Path,
+        max_commits: int | None = None
+    ) -> tuple[dict[str, list[Ponto]], dict[str, Commit], dict[str, int]]:
+        """
+        Processa os commits novos e monta a série de cada habilidade.
+        
+        Args:
+            caminho: Habilidade ou biblioteca dentro de um repositório git
+            max_commits: Só os N commits mais recentes que tocam o caminho
+        
+        Returns:
+            Tupla (habilidade -> pontos em ordem, habilidade removida ->
+            commit da remoção, contagens: commits, processados, analisadas)
+        """
+        caminho = Path(caminho).resolve()
+        repositorio = raiz_repositorio(caminho)
+        prefixo = caminho.relative_to(repositorio).as_posix()
+        prefixo = '' if prefixo == '.' else prefixo
+        commits = listar_commits(repositorio, prefixo, max_commits)
+        
+        c = self.conexao
+        chave = (str(repositorio), prefixo)
+        gravados = dict(c.execute(
+            "SELECT hash, anterior FROM commits WHERE repositorio = ? AND prefixo = ?", chave
+        ))
+        
+        serie: dict[str, list[Ponto]] = {}
+        removidas: dict[str, Commit] = {}
+        estado: dict[str, str] = {}
+        analises: dict[str, tuple[int, int, int]] = {}
+        processados = analisadas = 0
+        temporario = Path(tempfile.mkdtemp(prefix='forge-history-'))
+        try:
+            with LeitorObjetos(repositorio) as leitor:
+                arvores = _Arvores(leitor)
+                copias: dict[str, _Copia] = {}
+                anterior = ''
+                for commit in commits:
+                    if gravados.get(commit.hash) == anterior:
+                        # Já processado com o mesmo antecessor: aplicar as alterações gravadas
+                        alteracoes = dict(c.execute(
+                            "SELECT habilidade, arvore FROM alteracoes "
+                            "WHERE repositorio = ? AND prefixo = ? AND hash = ?", (*chave, commit.hash)
+                        ))
+                    else:
+                        raiz = arvores.do_commit(commit.hash, prefixo)
+                        atual = {
+                            '/'.join(p for p in (prefixo, relativo) if p): arvore
+                            for relativo, arvore in (arvores.habilidades(raiz) if raiz else [])
+                        }
+                        alteracoes = {h: a for h, a in atual.items() if estado.get(h) != a}
+                        alteracoes.update({h: None for h in estado if h not in atual})
+                        c.execute("DELETE FROM alteracoes WHERE repositorio = ? AND prefixo = ? AND hash = ?",
+                                  (*chave, commit.hash))
+                        c.executemany("INSERT INTO alteracoes VALUES (?, ?, ?, ?, ?)", [
+                            (*chave, commit.hash, habilidade, arvore) for habilidade, arvore in alteracoes.items()
+                        ])
+                        c.execute("INSERT OR REPLACE INTO commits VALUES (?, ?, ?, ?)",
+                                  (*chave, commit.hash, anterior))
+                        processados += 1
+                    
+                    for habilidade, arvore in sorted(alteracoes.items()):
+                        if arvore is None:
+                            estado.pop(habilidade, None)
+                            removidas[habilidade] = commit
+                            continue
+                        estado[habilidade] = arvore
+                        removidas.pop(habilidade, None)
+                        if arvore not in analises:
+                            analises[arvore] = self._analise(arvore)
+                        if analises[arvore] is None:
+                            if habilidade not in copias:
+                                nome = habilidade.rpartition('/')[2] or repositorio.name
+                                copias[habilidade] = _Copia(temporario / str(len(copias)) / nome)
+                            analises[arvore] = self._analisar(
+                                arvore, arvores.arquivos(arvore), copias[habilidade], leitor
+                            )
+                            analisadas += 1
+                        serie.setdefault(habilidade, []).append(Ponto(commit, *analises[arvore]))
+                    
+                    if processados and processados % COMMITS_POR_TRANSACAO == 0:
+                        c.commit()
+                    anterior = commit.hash
+            c.commit()
+        finally:
+            shutil.rmtree(temporario, ignore_errors=True)
+        
+        return serie, removidas, {'commits': len(commits), 'processados': processados, 'analisadas': analisadas}
+
+
+def regressoes(serie: dict[str, list[Ponto]], limiar: int = LIMIAR_AUMENTO) -> list[tuple[str, Ponto, Ponto]]:
+    """
+    Versões que aumentaram o custo ao ativar em 'limiar' tokens ou mais,
+    ou que passaram de LIMITE_TOKENS_SKILL_MD.
+    
+    Returns:
+        Lista (habilidade, versão anterior, versão nova) em ordem de commit
+    """
+    marcadas = []
+    for habilidade, pontos in serie.items():
+        for antes, depois in zip(pontos, pontos[1:]):
+            aumento = depois.tokens_ativar - antes.tokens_ativar
+            cruzou = antes.tokens_ativar <= LIMITE_TOKENS_SKILL_MD < depois.tokens_ativar
+            if aumento >= limiar or cruzou:
+                marcadas.append((habilidade, antes, depois))
+    marcadas.sort(key=lambda m: (m[2].commit.data, m[0]))
+    return marcadas
+
+
+def _variacao(antes: int, depois: int) -> str:
+    return f"{(depois - antes) / antes:+.0%}" if antes else "novo"
+
+
+def formatar_historico(
+    serie: dict[str, list[Ponto]],
+    removidas: dict[str, Commit],
+    limiar: int = LIMIAR_AUMENTO,
+    top: int | None = TOP_PADRAO
+) -> str:
+    """Formata o crescimento das habilidades e os commits marcados como regressão."""
+    if not serie:
+        return "❌ Nenhuma habilidade (SKILL.md) encontrada no histórico"
+    
+    # Maior crescimento absoluto do custo ao ativar primeiro
+    ordem = sorted(serie, key=lambda h: (serie[h][0].tokens_ativar - serie[h][-1].tokens_ativar, h))
+    listadas = ordem[:top] if top else ordem
+    linhas = [f"📈 Crescimento por habilidade (primeira → última versão, {len(serie)} habilidade(s)):"]
+    for habilidade in listadas:
+        primeiro, ultimo = serie[habilidade][0], serie[habilidade][-1]
+        linhas.append("")
+        removida = removidas.get(habilidade)
+        linhas.append(
+            f"   {habilidade or '.'} — {len(serie[habilidade])} versão(ões), "
+            f"{primeiro.commit.dia} → {ultimo.commit.dia}"
+            + (f" (removida em {removida.hash[:10]})" if removida else "")
+        )
+        linhas.append(
+            f"      SKILL.md:        {primeiro.linhas:>7} → {ultimo.linhas:<7} linhas "
+            f"({_variacao(primeiro.linhas, ultimo.linhas)})"
+        )
+        linhas.append(
+            f"      Ao ativar:       {primeiro.tokens_ativar:>7} → {ultimo.tokens_ativar:<7} tokens "
+            f"({_variacao(primeiro.tokens_ativar, ultimo.tokens_ativar)})"
+        )
+        linhas.append(
+            f"      Pior caso:       {primeiro.tokens_pior:>7} → {ultimo.tokens_pior:<7} tokens "
+            f"({_variacao(primeiro.tokens_pior, ultimo.tokens_pior)})"
+        )
+    if len(ordem) > len(listadas):
+        linhas.append("")
+        linhas.append(f"   ... e mais {len(ordem) - len(listadas)} habilidade(s)")
+    
+    marcadas = regressoes(serie, limiar)
+    linhas.append("")
+    if not marcadas:
+        linhas.append(f"✅ Nenhum commit aumentou o custo ao ativar em {limiar} tokens ou mais")
+        return '\n'.join(linhas)
+    linhas.append(
+        f"⚠️  {len(marcadas)} aumento(s) de {limiar}+ tokens ao ativar "
+        f"ou acima de {LIMITE_TOKENS_SKILL_MD}:"
+    )
+    for habilidade, antes, depois in marcadas:
+        linhas.append(
+            f"   {depois.commit.hash[:10]} {depois.commit.dia} {habilidade or '.'}: "
+            f"{antes.tokens_ativar} → {depois.tokens_ativar} tokens "
+            f"({depois.tokens_ativar - antes.tokens_ativar:+}) — {depois.commit.assunto}"
+        )
+    return '\n'.join(linhas)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    args = configurar(args)
+    
+    max_commits = None
+    limiar = LIMIAR_AUMENTO
+    top = TOP_PADRAO
+    caminho_banco = None
+    posicionais = []
+    
+    i = 0
+    while i < len(args):
+        if args[i] == '--max-count' and i + 1 < len(args) and args[i + 1].isdigit():
+            max_commits = int(args[i + 1])
+            i += 2
+        elif args[i] == '--threshold' and i + 1 < len(args) and args[i + 1].isdigit():
+            limiar = int(args[i + 1])
+            i += 2
+        elif args[i] == '--top' and i + 1 < len(args) and args[i + 1].isdigit():
+            top = int(args[i + 1])
+            i += 2
+        elif args[i] == '--db' and i + 1 < len(args):
+            caminho_banco = args[i + 1]
+            i += 2
+        else:
+            posicionais.append(args[i])
+            i += 1
+    
+    if len(posicionais) != 1:
+        print("Forge History — Evolução do custo de contexto das habilidades no git")
+        print()
+        print("Uso: forge_history.py <habilidade-ou-biblioteca> [--max-count <n>] [--threshold <tokens>]")
+        print("                      [--top <n>] [--db <arquivo>]")
+        print()
+        print("Opções:")
+        print("  --max-count <n>     Só os N commits mais recentes que tocam o caminho")
+        print(f"  --threshold <t>     Aumento de tokens ao ativar que marca o commit (padrão: {LIMIAR_AUMENTO})")
+        print(f"  --top <n>           Habilidades listadas no crescimento (padrão: {TOP_PADRAO})")
+        print("  --db <arquivo>      Banco SQLite do histórico (padrão: no diretório de cache)")
+        print()
+        print("Exemplos:")
+        print("  forge_history.py ./minha-habilidade")
+        print("  forge_history.py ./skills --max-count 500 --threshold 1000")
+        return 1
+    
+    caminho = Path(posicionais[0]).resolve()
+    print(f"🕰️  Histórico: {caminho}")
+    
+    try:
+        with HistoricoMetricas.padrao(caminho_banco) as historico:
+            with trecho('histórico', 'habilidade', caminho=str(caminho)):
+                serie, removidas, contagens = historico.atualizar(caminho, max_commits)
+    except ErroGit as e:
+        print(f"❌ {e}")
+        return 1
+    
+    print(
+        f"   {contagens['commits']} commit(s), {contagens['processados']} novo(s) processado(s), "
+        f"{contagens['analisadas']} versão(ões) analisada(s)"
+    )
+    print()
+    with trecho('saída', 'saída'):
+        print(formatar_historico(serie, removidas, limiar, top))
+    return 0 if serie else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
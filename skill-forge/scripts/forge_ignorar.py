@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Forge Ignorar — Arquivos fora da habilidade: padrões fixos e .forgeignore
+
+Uso (como módulo):
+    from forge_ignorar import carregar_filtro
+
+    filtro = carregar_filtro(Path('./minha-habilidade'))    # padrões + .forgeignore
+    filtro.ignorado('node_modules', diretorio=True)         # True
+    filtro.ignorado('references/rascunho.md')
+    filtro.caminho_ignorado('assets/node_modules/x/y.js')   # algum ancestral ignorado
+
+O .forgeignore fica na raiz da habilidade e segue a semântica do
+.gitignore:
+    - linhas vazias e comentários (#) não contam; \\# e \\! escapam
+    - '*' e '?' não cruzam '/'; [a-z] e [!a-z] são classes
+    - '**/' no início casa em qualquer nível, '/**' no fim casa tudo
+      dentro, '/**/' casa zero ou mais diretórios
+    - padrão com '/' no início ou no meio é relativo à raiz; sem '/',
+      casa o nome em qualquer nível
+    - '/' no fim casa só diretórios; '!' reinclui o que um padrão
+      anterior excluiu (o último padrão que casa decide), mas não dentro
+      de um diretório excluído, que nem é percorrido
+
+Os padrões fixos (PADROES_PADRAO) vêm antes dos do arquivo, que podem
+reincluí-los com '!'. Cada padrão vira uma expressão regular, e todas
+são unidas em uma só: a maioria dos caminhos, que não casa com nada, é
+descartada com uma única busca.
+"""
+
+import re
+from pathlib import Path
+from collections.abc import Iterable
+
+
+# Arquivo de padrões na raiz da habilidade
+ARQUIVO_IGNORAR = '.forgeignore'
+
+# Sempre fora do pacote, da validação e da análise (antes do .forgeignore)
+PADROES_PADRAO = [
+    # Arquivos ocultos fora da raiz; diretórios ocultos são percorridos e
+    # só os arquivos ocultos dentro deles ficam de fora. Vêm primeiro para
+    # que os nomes abaixo (.git em qualquer nível) continuem excluídos
+    '*/**/.*', '!*/**/.*/',
+    # Controle de versão, dependências e caches
+    '.git', 'node_modules', '__pycache__',
+    # Lixo do sistema e arquivos de ambiente
+    '.DS_Store', 'Thumbs.db', '.gitignore', '.env', ARQUIVO_IGNORAR,
+    # Compilados e temporários
+    '*.pyc', '*.pyo', '*.tmp', '*.bak', '*.swp',
+]
+
+
+def _traduzir(padrao: str) -> str:
+    """Expressão regular (sem âncoras) equivalente a um padrão do .gitignore."""
+    partes = []
+    i = 0
+    n = len(padrao)
+    while i < n:
+        c = padrao[i]
+        if padrao.startswith('**', i) and (i == 0 or padrao[i - 1] == '/'):
+            if i + 2 == n:
+                # '/**' no fim: tudo dentro
+                partes.append('.*')
+                i += 2
+                continue
+            if padrao[i + 2] == '/':
+                # '**/': zero ou mais diretórios
+                partes.append('(?:.*/)?')
+                i += 3
+                continue
+        if c == '*':
+            while i + 1 < n and padrao[i + 1] == '*':
+                i += 1
+            partes.append('[^/]*')
+        elif c == '?':
+            partes.append('[^/]')
+        elif c == '[':
+            # ']' logo após '[' ou '[!' é parte da classe
+            inicio = i + 2 if padrao[i + 1:i + 2] in ('!', '^') else i + 1
+            fim = padrao.find(']', inicio + 1)
+            if fim == -1:
+                partes.append(re.escape(c))
+            else:
+                classe = padrao[i + 1:fim]
+                if classe[0] in '!^':
+                    classe = '^' + classe[1:]
+                partes.append('[' + classe.replace('\\', '\\\\') + ']')
+                i = fim
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            partes.append(re.escape(padrao[i]))
+        else:
+            partes.append(re.escape(c))
+        i += 1
+    return ''.join(partes)
+
+
+class FiltroIgnorar:
+    """Padrões do .gitignore compilados: diz se um caminho relativo fica de fora."""
+    
+    def __init__(self, padroes: Iterable[str] = ()):
+        """
+        Args:
+            padroes: Linhas no formato do .gitignore, em ordem de prioridade
+                crescente (a última que casa decide)
+        """
+        self.padroes: list[str] = []
+        self.regras: list[tuple[re.Pattern, bool, bool]] = []  # (regex, negar, só diretório)
+        expressoes = []
+        for linha in padroes:
+            regra = self._compilar(linha)
+            if regra is None:
+                continue
+            expressao, negar, so_diretorio = regra
+            self.padroes.append(linha)
+            self.regras.append((re.compile(expressao), negar, so_diretorio))
+            expressoes.append(expressao)
+        
+        # Triagem: caminho que não casa com nenhum padrão não é ignorado
+        self._qualquer = re.compile('|'.join(f"(?:{e})" for e in expressoes)) if expressoes else None
+    
+    @staticmethod
+    def _compilar(linha: str) -> tuple[str, bool, bool] | None:
+        """Linha do .gitignore como (regex, negar, só diretório); None se não for padrão."""
+        linha = linha.rstrip('\n\r')
+        # Espaços no fim não contam, a menos que escapados
+        while linha.endswith(' ') and not linha.endswith('\\ '):
+            linha = linha[:-1]
+        if not linha or linha.startswith('#'):
+            return None
+        
+        negar = linha.startswith('!')
+        if negar:
+            linha = linha[1:]
+        elif linha.startswith(('\\!', '\\#')):
+            linha = linha[1:]
+        
+        so_diretorio = linha.endswith('/')
+        linha = linha.rstrip('/')
+        if not linha:
+            return None
+        
+        # Com '/' no início ou no meio: relativo à raiz; senão, em qualquer nível
+        ancorado = '/' in linha
+        linha = linha.lstrip('/')
+        expressao = _traduzir(linha)
+        if not ancorado:
+            expressao = '(?:.*/)?' + expressao
+        return expressao, negar, so_diretorio
+    
+    def ignorado(self, relativo: str, diretorio: bool = False) -> bool:
+        """
+        Se o caminho casa com os padrões (sem olhar os diretórios acima dele).
+        
+        Args:
+            relativo: Caminho relativo à raiz da habilidade, com '/'
+            diretorio: Se o caminho é um diretório (para padrões com '/' no fim)
+        
+        Returns:
+            True se o último padrão que casa exclui o caminho
+        """
+        if self._qualquer is None or self._qualquer.fullmatch(relativo) is None:
+            return False
+        for expressao, negar, so_diretorio in reversed(self.regras):
+            if so_diretorio and not diretorio:
+                continue
+            if expressao.fullmatch(relativo):
+                return not negar
+        return False
+    
+    def caminho_ignorado(self, relativo: str, diretorio: bool = False) -> bool:
+        """Se o caminho ou algum diretório acima dele é ignorado."""
+        partes = relativo.split('/')
+        for n in range(1, len(partes)):
+            if self.ignorado('/'.join(partes[:n]), diretorio=True):
+                return True
+        return self.ignorado(relativo, diretorio)
+
+
+def carregar_filtro(raiz: Path) -> FiltroIgnorar:
+    """
+    Filtro da habilidade: PADROES_PADRAO seguidos do .forgeignore da raiz, se houver.
+    
+    Args:
+        raiz: Diretório da habilidade
+    
+    Returns:
+        Filtro compilado
+    """
+    try:
+        linhas = (raiz / ARQUIVO_IGNORAR).read_text(encoding='utf-8').splitlines()
+    except (OSError, UnicodeDecodeError):
+        linhas = []
+    return FiltroIgnorar(PADROES_PADRAO + linhas)
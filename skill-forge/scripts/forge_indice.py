@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Forge Índice — Índice persistente de seções duplicadas entre habilidades
+
+Uso (como módulo):
+    from forge_indice import IndiceDuplicacao
+
+    with IndiceDuplicacao.padrao() as indice:
+        estatisticas = indice.atualizar_biblioteca(Path('./skills'))
+        for grupo in indice.grupos(Path('./skills')):
+            grupo.secoes     # [SecaoIndexada(habilidade, relativo, linha, titulo), ...]
+
+Cada SKILL.md e cada .md de references/ é dividido em seções (pelos
+títulos Markdown fora de blocos de código). Cada seção recebe uma
+assinatura MinHash (forge_similaridade) dividida em BANDAS bandas de
+LINHAS_POR_BANDA valores; seções que coincidem em alguma banda são
+candidatas (LSH) e viram grupo se a similaridade estimada passar de
+LIMIAR_SIMILARIDADE.
+
+O índice fica em SQLite ($FORGE_CACHE_DIR/indice-secoes.sqlite por
+padrão). A atualização compara tamanho e mtime de cada arquivo com o que
+está gravado: só arquivos novos ou alterados são reindexados, e arquivos
+ou habilidades removidos saem do índice.
+"""
+
+import os
+import re
+import sqlite3
+from array import array
+from pathlib import Path
+from collections import defaultdict
+from collections.abc import Iterator
+
+from forge_cache import diretorio_cache_padrao
+from forge_inventario import Inventario
+from forge_similaridade import (
+    SEMENTES_MINHASH, assinatura_minhash, hashes_shingles, palavras, similaridade_assinaturas
+)
+from forge_validate import encontrar_habilidades
+
+
+# Versão do formato: incrementar ao mudar seções, assinaturas ou bandas
+VERSAO_INDICE = 2
+
+# LSH: BANDAS × LINHAS_POR_BANDA = tamanho da assinatura. Com 8 × 8, pares
+# com Jaccard 0,8 colidem em alguma banda com ~94% de chance; com 0,5, ~3%
+BANDAS = 8
+LINHAS_POR_BANDA = len(SEMENTES_MINHASH) // BANDAS
+
+# Similaridade estimada mínima para duas seções serem "quase idênticas"
+LIMIAR_SIMILARIDADE = 0.8
+
+# Seções menores não valem a extração; maiores não são seções de boilerplate
+# (e limitam a memória e o custo da assinatura)
+MIN_PALAVRAS_SECAO = 30
+MAX_PALAVRAS_SECAO = 5000
+
+PADRAO_TITULO = re.compile(rb'#{1,6}[ \t]+(.*?)[ \t#]*$')
+
+
+class SecaoIndexada:
+    """Seção de um arquivo de uma habilidade gravada no índice."""
+    
+    def __init__(self, habilidade: str, relativo: str, linha: int, titulo: str, palavras: int):
+        self.habilidade = habilidade
+        self.relativo = relativo
+        self.linha = linha
+        self.titulo = titulo
+        self.palavras = palavras
+    
+    def __repr__(self) -> str:
+        return f"SecaoIndexada({self.habilidade}/{self.relativo}:{self.linha}, {self.titulo!r})"
+
+
+class Grupo:
+    """Seções quase idênticas encontradas em mais de uma habilidade."""
+    
+    def __init__(self, secoes: list[SecaoIndexada]):
+        self.secoes = secoes
+    
+    @property
+    def habilidades(self) -> set[str]:
+        return {s.habilidade for s in self.secoes}
+    
+    @property
+    def palavras_repetidas(self) -> int:
+        """Palavras que sobrariam se a seção existisse uma única vez."""
+        return sum(s.palavras for s in self.secoes) - max(s.palavras for s in self.secoes)
+
+
+def secoes_markdown(caminho: Path) -> Iterator[tuple[int, str, list[bytes] | None]]:
+    """
+    Divide um arquivo Markdown em seções, lendo linha a linha.
+    
+    Args:
+        caminho: Arquivo .md
+    
+    Yields:
+        (linha do título, título, palavras da seção ou None se passar de
+        MAX_PALAVRAS_SECAO). O trecho antes do primeiro título tem título ''
+    """
+    linha_secao, titulo, lista = 1, '', []
+    em_codigo = False
+    with open(caminho, 'rb') as f:
+        for numero, linha in enumerate(f, 1):
+            conteudo = linha.strip()
+            if conteudo.startswith((b'```', b'~~~')):
+                em_codigo = not em_codigo
+            elif not em_codigo and (match := PADRAO_TITULO.fullmatch(conteudo)):
+                yield linha_secao, titulo, lista
+                titulo = match.group(1).decode('utf-8', 'replace')
+                linha_secao, lista = numero, []
+                continue
+            if lista is not None:
+                lista += palavras(linha)
+                if len(lista) > MAX_PALAVRAS_SECAO:
+                    lista = None
+    yield linha_secao, titulo, lista
+
+
+def arquivos_indexaveis(inventario: Inventario) -> list:
+    """SKILL.md e Markdown de references/ (recursivo) de uma habilidade."""
+    arquivos = [e for e in inventario.arquivos_em('') if e.nome == 'SKILL.md']
+    return arquivos + inventario.arquivos_em('references', recursivo=True, extensoes={'.md'})
+
+
+class IndiceDuplicacao:
+    """Índice LSH de seções em SQLite, atualizado por arquivo."""
+    
+    def __init__(self, caminho: Path):
+        self.caminho = caminho
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        # Vários processos podem atualizar o mesmo índice: esperar a trava
+        self.conexao = sqlite3.connect(str(caminho), timeout=30)
+        self._preparar()
+    
+    @classmethod
+    def padrao(cls, caminho: str | None = None) -> 'IndiceDuplicacao':
+        """Abre o índice indicado ou o padrão, no diretório de cache."""
+        if caminho:
+            return cls(Path(caminho).expanduser())
+        return cls(diretorio_cache_padrao() / 'indice-secoes.sqlite')
+    
+    def __enter__(self) -> 'IndiceDuplicacao':
+        return self
+    
+    def __exit__(self, *_):
+        self.conexao.close()
+    
+    def _preparar(self):
+        """Cria as tabelas; recria o índice se o formato mudou."""
+        c = self.conexao
+        c.execute("CREATE TABLE IF NOT EXISTS meta (chave TEXT PRIMARY KEY, valor TEXT)")
+        versao = c.execute("SELECT valor FROM meta WHERE chave = 'versao'").fetchone()
+        formato = f"{VERSAO_INDICE}:{BANDAS}x{LINHAS_POR_BANDA}:{MIN_PALAVRAS_SECAO}:{MAX_PALAVRAS_SECAO}"
+        if versao is not None and versao[0] != formato:
+            c.executescript("DROP TABLE IF EXISTS arquivos; DROP TABLE IF EXISTS secoes; "
+                            "DROP TABLE IF EXISTS bandas;")
+        c.executescript("""
+            CREATE TABLE IF NOT EXISTS arquivos (
+                id INTEGER PRIMARY KEY,
+                habilidade TEXT NOT NULL,
+                relativo TEXT NOT NULL,
+                tamanho INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                UNIQUE (habilidade, relativo)
+            );
+            CREATE TABLE IF NOT EXISTS secoes (
+                id INTEGER PRIMARY KEY,
+                arquivo INTEGER NOT NULL,
+                linha INTEGER NOT NULL,
+                titulo TEXT NOT NULL,
+                palavras INTEGER NOT NULL,
+                assinatura BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS secoes_arquivo ON secoes (arquivo);
+            CREATE TABLE IF NOT EXISTS bandas (
+                banda INTEGER NOT NULL,
+                chave INTEGER NOT NULL,
+                secao INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS bandas_chave ON bandas (banda, chave);
+            CREATE INDEX IF NOT EXISTS bandas_secao ON bandas (secao);
+        """)
+        c.execute("INSERT OR REPLACE INTO meta VALUES ('versao', ?)", (formato,))
+        c.commit()
+    
+    def _remover_arquivo(self, arquivo_id: int):
+        c = self.conexao
+        c.execute("DELETE FROM bandas WHERE secao IN (SELECT id FROM secoes WHERE arquivo = ?)",
+                  (arquivo_id,))
+        c.execute("DELETE FROM secoes WHERE arquivo = ?", (arquivo_id,))
+        c.execute("DELETE FROM arquivos WHERE id = ?", (arquivo_id,))
+    
+    def _indexar_arquivo(self, habilidade: str, raiz: Path, entrada) -> int:
+        """Grava as seções de um arquivo; retorna quantas foram indexadas."""
+        c = self.conexao
+        cursor = c.execute(
+            "INSERT INTO arquivos (habilidade, relativo, tamanho, mtime_ns) VALUES (?, ?, ?, ?)",
+            (habilidade, entrada.relativo, entrada.tamanho, entrada.mtime_ns)
+        )
+        arquivo_id = cursor.lastrowid
+        indexadas = 0
+        for linha, titulo, lista in secoes_markdown(raiz / entrada.relativo):
+            if lista is None or len(lista) < MIN_PALAVRAS_SECAO:
+                continue
+            assinatura = assinatura_minhash(hashes_shingles(lista))
+            secao_id = c.execute(
+                "INSERT INTO secoes (arquivo, linha, titulo, palavras, assinatura) VALUES (?, ?, ?, ?, ?)",
+                (arquivo_id, linha, titulo, len(lista), array('q', assinatura).tobytes())
+            ).lastrowid
+            c.executemany("INSERT INTO bandas VALUES (?, ?, ?)", [
+                (banda, hash(tuple(assinatura[inicio:inicio + LINHAS_POR_BANDA])), secao_id)
+                for banda, inicio in enumerate(range(0, len(assinatura), LINHAS_POR_BANDA))
+            ])
+            indexadas += 1
+        return indexadas
+    
+    def atualizar_habilidade(self, caminho: Path) -> tuple[int, int]:
+        """
+        Reindexa apenas os arquivos novos ou alterados de uma habilidade.
+        
+        Args:
+            caminho: Diretório da habilidade
+        
+        Returns:
+            Tupla (arquivos reindexados, arquivos removidos do índice)
+        """
+        caminho = caminho.resolve()
+        habilidade = str(caminho)
+        c = self.conexao
+        gravados = {
+            relativo: (arquivo_id, tamanho, mtime_ns)
+            for arquivo_id, relativo, tamanho, mtime_ns in c.execute(
+                "SELECT id, relativo, tamanho, mtime_ns FROM arquivos WHERE habilidade = ?",
+                (habilidade,)
+            )
+        }
+        
+        reindexados = 0
+        with c:
+            for entrada in arquivos_indexaveis(Inventario(caminho)):
+                anterior = gravados.pop(entrada.relativo, None)
+                if anterior is not None and anterior[1:] == (entrada.tamanho, entrada.mtime_ns):
+                    continue
+                if anterior is not None:
+                    self._remover_arquivo(anterior[0])
+                self._indexar_arquivo(habilidade, caminho, entrada)
+                reindexados += 1
+            for arquivo_id, _, _ in gravados.values():
+                self._remover_arquivo(arquivo_id)
+        return reindexados, len(gravados)
+    
+    def atualizar_biblioteca(self, raiz: Path) -> dict[str, int]:
+        """
+        Atualiza o índice para todas as habilidades abaixo da raiz.
+        
+        Habilidades que estavam no índice sob esta raiz e não existem mais
+        são removidas.
+        
+        Args:
+            raiz: Diretório raiz da biblioteca
+        
+        Returns:
+            Contagens: habilidades, reindexados, removidos, inalterados
+        """
+        raiz = raiz.resolve()
+        habilidades = encontrar_habilidades(raiz)
+        reindexados = removidos = 0
+        for caminho in habilidades:
+            novos, apagados = self.atualizar_habilidade(caminho)
+            reindexados += novos
+            removidos += apagados
+        
+        atuais = {str(c.resolve()) for c in habilidades}
+        with self.conexao as c:
+            for (habilidade,) in c.execute(
+                "SELECT DISTINCT habilidade FROM arquivos WHERE " + _FILTRO_RAIZ, _parametros_raiz(raiz)
+            ).fetchall():
+                if habilidade not in atuais:
+                    for (arquivo_id,) in c.execute(
+                        "SELECT id FROM arquivos WHERE habilidade = ?", (habilidade,)
+                    ).fetchall():
+                        self._remover_arquivo(arquivo_id)
+                        removidos += 1
+        
+        total = self.conexao.execute(
+            "SELECT count(*) FROM arquivos WHERE " + _FILTRO_RAIZ, _parametros_raiz(raiz)
+        ).fetchone()[0]
+        return {
+            'habilidades': len(habilidades),
+            'reindexados': reindexados,
+            'removidos': removidos,
+            'inalterados': total - reindexados,
+        }
+    
+    def grupos(self, raiz: Path) -> list[Grupo]:
+        """
+        Grupos de seções quase idênticas em mais de uma habilidade da raiz.
+        
+        Args:
+            raiz: Diretório raiz da biblioteca (já atualizada no índice)
+        
+        Returns:
+            Grupos do que mais repete palavras para o que menos repete
+        """
+        c = self.conexao
+        # Baldes LSH com mais de uma seção (só das habilidades sob a raiz)
+        baldes = c.execute(f"""
+            SELECT group_concat(b.secao) FROM bandas b
+            JOIN secoes s ON s.id = b.secao JOIN arquivos a ON a.id = s.arquivo
+            WHERE {_FILTRO_RAIZ.replace('habilidade', 'a.habilidade')}
+            GROUP BY b.banda, b.chave HAVING count(*) > 1
+        """, _parametros_raiz(raiz.resolve())).fetchall()
+        
+        candidatas = sorted({int(i) for (ids,) in baldes for i in ids.split(',')})
+        assinaturas: dict[int, list[int]] = {}
+        for inicio in range(0, len(candidatas), 500):
+            lote = candidatas[inicio:inicio + 500]
+            for secao_id, blob in c.execute(
+                f"SELECT id, assinatura FROM secoes WHERE id IN ({','.join('?' * len(lote))})", lote
+            ):
+                assinaturas[secao_id] = array('q', blob).tolist()
+        
+        # União das seções similares; cada balde é comparado ao seu primeiro
+        # membro, para que baldes grandes (boilerplate copiado em centenas de
+        # habilidades) custem O(n) e não O(n²)
+        pai = {i: i for i in assinaturas}
+        
+        def raiz_de(i: int) -> int:
+            while pai[i] != i:
+                pai[i] = pai[pai[i]]
+                i = pai[i]
+            return i
+        
+        for (ids,) in baldes:
+            primeiro, *outros = [int(i) for i in ids.split(',')]
+            for outro in outros:
+                if similaridade_assinaturas(assinaturas[primeiro], assinaturas[outro]) >= LIMIAR_SIMILARIDADE:
+                    pai[raiz_de(outro)] = raiz_de(primeiro)
+        
+        membros: dict[int, list[int]] = defaultdict(list)
+        for secao_id in assinaturas:
+            membros[raiz_de(secao_id)].append(secao_id)
+        
+        grupos = []
+        for ids in membros.values():
+            if len(ids) < 2:
+                continue
+            secoes = [
+                SecaoIndexada(*linha) for linha in c.execute(f"""
+                    SELECT a.habilidade, a.relativo, s.linha, s.titulo, s.palavras
+                    FROM secoes s JOIN arquivos a ON a.id = s.arquivo
+                    WHERE s.id IN ({','.join('?' * len(ids))})
+                    ORDER BY a.habilidade, a.relativo, s.linha
+                """, ids)
+            ]
+            grupo = Grupo(secoes)
+            if len(grupo.habilidades) > 1:
+                grupos.append(grupo)
+        grupos.sort(key=lambda g: -g.palavras_repetidas)
+        return grupos
+
+
+# Habilidades sob a raiz: o próprio caminho ou o intervalo [raiz/, raiz0)
+# ('0' sucede '/'), que usa o índice de (habilidade, relativo)
+_FILTRO_RAIZ = "(habilidade = ? OR (habilidade >= ? AND habilidade < ?))"
+
+
+def _parametros_raiz(raiz: Path) -> tuple[str, str, str]:
+    texto = str(raiz).rstrip(os.sep)
+    return texto, texto + os.sep, texto + chr(ord(os.sep) + 1)
@@ -22,6 +22,8 @@ import re
 from pathlib import Path
 from datetime import datetime
 
+from forge_perfil import configurar
+
 
 SKILL_TEMPLATE = '''---
 name: {skill_name}
@@ -311,8 +313,11 @@ def criar_habilidade(nome: str, caminho: str) -> Path | None:
     return diretorio_habilidade
 
 
-def main():
-    if len(sys.argv) < 4 or sys.argv[2] != '--path':
+def main(argv: list[str] | None = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    args = configurar(args)
+    
+    if len(args) < 3 or args[1] != '--path':
         print("Forge Init — Inicializa estrutura de nova habilidade")
         print()
         print("Uso: forge_init.py <nome-da-habilidade> --path <diretorio-destino>")
@@ -326,10 +331,10 @@ def main():
         print("Exemplos:")
         print("  forge_init.py minha-habilidade --path ./skills")
         print("  forge_init.py processador-pdf --path /home/usuario/skills")
-        sys.exit(1)
+        return 1
     
-    nome = sys.argv[1]
-    caminho = sys.argv[3]
+    nome = args[0]
+    caminho = args[2]
     
     print(f"🔨 Forge Init: Criando habilidade '{nome}'")
     print(f"   Destino: {caminho}")
@@ -348,10 +353,10 @@ def main():
         print("  4. Criar/remover assets conforme necessidade")
         print("  5. Validar: python forge_validate.py " + str(resultado))
         print("  6. Empacotar: python forge_package.py " + str(resultado))
-        sys.exit(0)
+        return 0
     else:
-        sys.exit(1)
+        return 1
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
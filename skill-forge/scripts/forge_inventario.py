@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Forge Inventário — Inventário de arquivos de uma habilidade em uma única varredura
+
+Uso (como módulo):
+    from forge_inventario import Inventario
+
+    inventario = Inventario(Path('./minha-habilidade'))
+    inventario.existe('scripts')                         # arquivo ou diretório
+    inventario.arquivos_em('scripts', extensoes={'.py', '.sh'})
+    inventario.arquivos_em('assets', recursivo=True)
+    inventario.com_extensao('.tmp', '.bak')
+
+A árvore é percorrida uma vez com os.scandir (nome, tamanho, mtime e tipo
+vêm da própria listagem do diretório). Todas as regras de validação e
+análise consultam os índices em memória em vez de voltar ao disco.
+
+O que o filtro da habilidade ignora (padrões fixos como .git e
+node_modules, mais o .forgeignore; ver forge_ignorar) fica fora do
+inventário: diretórios ignorados não são percorridos, e só o caminho de
+cada item ignorado é guardado em ignorados. Validação, análise e pacote
+veem, assim, o mesmo conjunto de arquivos.
+"""
+
+import os
+import stat
+from bisect import bisect_left
+from pathlib import Path
+from collections import defaultdict
+from collections.abc import Iterable
+
+from forge_cache import hash_arquivo
+from forge_ignorar import FiltroIgnorar, ARQUIVO_IGNORAR, carregar_filtro
+from forge_perfil import trecho
+
+
+class Entrada:
+    """Arquivo do inventário, com caminho relativo no formato POSIX."""
+    
+    __slots__ = ('relativo', 'nome', 'diretorio', 'sufixo', 'tamanho', 'mtime_ns')
+    
+    def __init__(self, relativo: str, nome: str, diretorio: str, tamanho: int, mtime_ns: int):
+        self.relativo = relativo
+        self.nome = nome
+        self.diretorio = diretorio
+        self.sufixo = os.path.splitext(nome)[1]
+        self.tamanho = tamanho
+        self.mtime_ns = mtime_ns
+    
+    def __repr__(self) -> str:
+        return f"Entrada({self.relativo!r}, {self.tamanho})"
+
+
+class Inventario:
+    """Arquivos e diretórios de uma habilidade, indexados por diretório e extensão."""
+    
+    def __init__(self, raiz: Path, filtro: FiltroIgnorar | None = None):
+        """
+        Args:
+            raiz: Diretório da habilidade
+            filtro: Caminhos a deixar de fora (padrão: os da habilidade,
+                relidos quando o .forgeignore muda)
+        """
+        self.raiz = raiz
+        self._filtro_da_raiz = filtro is None
+        self.filtro = carregar_filtro(raiz) if filtro is None else filtro
+        self.arquivos: list[Entrada] = []
+        self.diretorios: set[str] = set()
+        # Arquivos e diretórios ignorados (sem o conteúdo dos diretórios)
+        self.ignorados: set[str] = set()
+        
+        with trecho('inventário', 'arquivos', raiz=str(raiz)):
+            self._varrer('')
+            self._indexar()
+    
+    def _indexar(self):
+        """Ordena os arquivos e reconstrói os índices em memória."""
+        self.arquivos.sort(key=lambda e: e.relativo)
+        self._chaves = [e.relativo for e in self.arquivos]
+        self.por_diretorio: dict[str, list[Entrada]] = defaultdict(list)
+        self.por_extensao: dict[str, list[Entrada]] = defaultdict(list)
+        for entrada in self.arquivos:
+            self.por_diretorio[entrada.diretorio].append(entrada)
+            self.por_extensao[entrada.sufixo].append(entrada)
+    
+    def _varrer(self, inicio: str):
+        """Percorre a subárvore a partir de inicio ('' para a raiz) com os.scandir."""
+        pendentes = [inicio]
+        while pendentes:
+            diretorio = pendentes.pop()
+            try:
+                iterador = os.scandir(os.path.join(self.raiz, diretorio))
+            except OSError:
+                continue
+            with iterador:
+                for item in iterador:
+                    relativo = f"{diretorio}/{item.name}" if diretorio else item.name
+                    try:
+                        e_diretorio = item.is_dir(follow_symlinks=False)
+                        if self.filtro.ignorado(relativo, e_diretorio):
+                            # Diretório ignorado: não é percorrido
+                            self.ignorados.add(relativo)
+                        elif e_diretorio:
+                            self.diretorios.add(relativo)
+                            pendentes.append(relativo)
+                        elif item.is_file():
+                            info = item.stat()
+                            self.arquivos.append(Entrada(
+                                relativo, item.name, diretorio,
+                                info.st_size, info.st_mtime_ns
+                            ))
+                    except OSError:
+                        continue
+    
+    def atualizar(self, relativos: Iterable[str]):
+        """
+        Atualiza o inventário para caminhos alterados, sem varrer a árvore toda.
+        
+        Args:
+            relativos: Caminhos relativos criados, alterados ou removidos
+        """
+        relativos = list(relativos)
+        if self._filtro_da_raiz and ARQUIVO_IGNORAR in relativos:
+            filtro = carregar_filtro(self.raiz)
+            if filtro.padroes != self.filtro.padroes:
+                # Outros padrões: o conjunto de arquivos pode mudar em qualquer lugar
+                self.filtro = filtro
+                self.arquivos = []
+                self.diretorios = set()
+                self.ignorados = set()
+                self._varrer('')
+                self._indexar()
+                return
+        
+        for relativo in relativos:
+            # Descartar o estado anterior do caminho (e da subárvore, se diretório)
+            prefixo = relativo + '/'
+            self.arquivos = [
+                e for e in self.arquivos
+                if e.relativo != relativo and not e.relativo.startswith(prefixo)
+            ]
+            self.diretorios = {
+                d for d in self.diretorios
+                if d != relativo and not d.startswith(prefixo)
+            }
+            self.ignorados = {
+                i for i in self.ignorados
+                if i != relativo and not i.startswith(prefixo)
+            }
+            
+            # Reler o estado atual (caminho removido: nada a acrescentar)
+            completo = os.path.join(self.raiz, relativo)
+            try:
+                info = os.lstat(completo)
+            except OSError:
+                continue
+            pai = relativo.rpartition('/')[0]
+            if pai and self.filtro.caminho_ignorado(pai, diretorio=True):
+                continue  # dentro de um diretório ignorado
+            if self.filtro.ignorado(relativo, stat.S_ISDIR(info.st_mode)):
+                self.ignorados.add(relativo)
+                continue
+            if stat.S_ISDIR(info.st_mode):
+                self.diretorios.add(relativo)
+                self._varrer(relativo)
+            elif os.path.isfile(completo):
+                info = os.stat(completo)
+                diretorio, _, nome = relativo.rpartition('/')
+                self.arquivos.append(Entrada(
+                    relativo, nome, diretorio, info.st_size, info.st_mtime_ns
+                ))
+        
+        self._indexar()
+    
+    def existe(self, relativo: str) -> bool:
+        """Verifica se existe arquivo ou diretório no caminho relativo."""
+        if relativo in self.diretorios:
+            return True
+        indice = bisect_left(self._chaves, relativo)
+        return indice < len(self._chaves) and self._chaves[indice] == relativo
+    
+    def arquivos_em(
+        self, diretorio: str, recursivo: bool = False, extensoes: set[str] | None = None
+    ) -> list[Entrada]:
+        """
+        Arquivos de um diretório, em ordem de caminho.
+        
+        Args:
+            diretorio: Diretório relativo à raiz ('' para a raiz)
+            recursivo: Se True, inclui arquivos de subdiretórios
+            extensoes: Filtra por sufixo (ex.: {'.py', '.sh'})
+        
+        Returns:
+            Lista de entradas
+        """
+        if not recursivo:
+            arquivos = self.por_diretorio.get(diretorio, [])
+        elif not diretorio:
+            arquivos = self.arquivos
+        else:
+            # Caminhos ordenados: a subárvore é um intervalo contíguo
+            inicio = bisect_left(self._chaves, diretorio + '/')
+            fim = bisect_left(self._chaves, diretorio + '0')  # '0' sucede '/'
+            arquivos = self.arquivos[inicio:fim]
+        
+        if extensoes is not None:
+            arquivos = [e for e in arquivos if e.sufixo in extensoes]
+        return arquivos
+    
+    def com_extensao(self, *extensoes: str) -> list[Entrada]:
+        """Arquivos de toda a árvore com as extensões indicadas."""
+        return [e for ext in extensoes for e in self.por_extensao.get(ext, [])]
+    
+    def tamanho_total(self, diretorio: str) -> int:
+        """Soma dos tamanhos dos arquivos sob um diretório (recursivo)."""
+        return sum(e.tamanho for e in self.arquivos_em(diretorio, recursivo=True))
+    
+    def digest(self, hash_completo: bool = False) -> str:
+        """
+        Digest do inventário para chaves de cache.
+        
+        Args:
+            hash_completo: Se True, inclui hash do conteúdo de cada arquivo
+                (estável entre checkouts); senão usa tamanho e mtime
+        
+        Returns:
+            Digest hexadecimal SHA-256
+        """
+        import hashlib  # só ao calcular chaves de cache
+        h = hashlib.sha256()
+        for entrada in self.arquivos:
+            h.update(entrada.relativo.encode('utf-8', 'surrogateescape'))
+            h.update(f"\0{entrada.tamanho}\0".encode())
+            if hash_completo:
+                h.update(hash_arquivo(self.raiz / entrada.relativo).encode())
+            else:
+                h.update(str(entrada.mtime_ns).encode())
+            h.update(b'\n')
+        # Itens ignorados ainda geram avisos na validação
+        for relativo in sorted(self.ignorados):
+            h.update(f"-{relativo}\n".encode('utf-8', 'surrogateescape'))
+        return h.hexdigest()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Forge Leitura — Leitura de arquivos com memória limitada
+
+Uso (como módulo):
+    from forge_leitura import ler_prefixo, procurar
+
+    ler_prefixo(Path('scripts/x.py'), 500)          # só os primeiros 500 caracteres
+    procurar(Path('references/api.md'), ['todo', 'fixme'], ignorar_caixa=True)
+
+Arquivos de references/ e scripts/ podem ter centenas de MB (schemas,
+logs). Em vez de carregar o arquivo inteiro, as regras leem apenas o
+prefixo de que precisam ou percorrem o arquivo em blocos de tamanho
+fixo, de modo que o pico de memória não cresce com o tamanho do arquivo.
+"""
+
+import codecs
+from pathlib import Path
+from collections.abc import Iterable, Iterator
+
+
+# Tamanho de cada bloco lido do disco
+TAMANHO_BLOCO = 1024 * 1024
+
+
+def ler_prefixo(caminho: Path, caracteres: int) -> str:
+    """
+    Lê apenas o início de um arquivo de texto UTF-8.
+    
+    Args:
+        caminho: Arquivo a ler
+        caracteres: Número máximo de caracteres a retornar
+    
+    Returns:
+        Até `caracteres` caracteres do início do arquivo
+    """
+    with open(caminho, 'rb') as f:
+        dados = f.read(caracteres * 4)  # até 4 bytes por caractere em UTF-8
+    # Decodificador incremental: um caractere cortado no fim do prefixo
+    # fica retido em vez de virar erro
+    return codecs.getincrementaldecoder('utf-8')('replace').decode(dados)[:caracteres]
+
+
+def blocos(caminho: Path, sobreposicao: int = 0, tamanho: int = TAMANHO_BLOCO) -> Iterator[bytes]:
+    """
+    Percorre um arquivo em blocos de tamanho fixo.
+    
+    Args:
+        caminho: Arquivo a ler
+        sobreposicao: Bytes finais de cada bloco repetidos no início do
+            seguinte, para que ocorrências na fronteira não se percam
+        tamanho: Bytes lidos do disco por bloco
+    
+    Yields:
+        Blocos de bytes
+    """
+    with open(caminho, 'rb') as f:
+        cauda = b''
+        while dados := f.read(tamanho):
+            bloco = cauda + dados
+            yield bloco
+            cauda = bloco[-sobreposicao:] if sobreposicao else b''
+
+
+def procurar(caminho: Path, termos: Iterable[str], ignorar_caixa: bool = False) -> set[str]:
+    """
+    Verifica quais termos ocorrem em um arquivo, lendo-o em blocos.
+    
+    Args:
+        caminho: Arquivo a examinar
+        termos: Textos a procurar
+        ignorar_caixa: Se True, compara sem diferenciar maiúsculas
+            (apenas letras ASCII)
+    
+    Returns:
+        Conjunto dos termos encontrados
+    """
+    pendentes = {
+        (termo.lower() if ignorar_caixa else termo).encode('utf-8'): termo
+        for termo in termos
+    }
+    encontrados = set()
+    if not pendentes:
+        return encontrados
+    
+    sobreposicao = max(len(padrao) for padrao in pendentes) - 1
+    for bloco in blocos(caminho, sobreposicao):
+        if ignorar_caixa:
+            bloco = bloco.lower()
+        for padrao in [p for p in pendentes if p in bloco]:
+            encontrados.add(pendentes.pop(padrao))
+        # Todos encontrados: o resto do arquivo não precisa ser lido
+        if not pendentes:
+            break
+    return encontrados
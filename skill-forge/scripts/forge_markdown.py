@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Forge Markdown — Estrutura do SKILL.md em uma única passada
+
+Uso (como módulo):
+    from forge_markdown import ParserMarkdown
+
+    parser = ParserMarkdown()
+    estrutura = parser.analisar(texto, inicio_corpo)
+    estrutura.secoes          # títulos fora de blocos de código, com filhos
+    estrutura.blocos          # blocos de código cercados (``` ou ~~~)
+    estrutura.tabelas         # (primeira linha, última linha) de cada tabela
+    estrutura.palavras        # e linhas, avisos_critical, todos, quando_usar
+
+O texto é dividido em segmentos nos títulos # e ## (fora de blocos de
+código) e cada segmento é percorrido uma vez por uma expressão regular
+que encontra títulos, cercas de código e linhas de tabela; os marcadores
+(**CRITICAL, TODO, "quando usar") são contados por buscas em C com
+prefixo literal, sem laço em Python. O parser guarda os segmentos da última análise pelo texto: ao
+reanalisar um SKILL.md em que só uma seção mudou, apenas ela é percorrida
+de novo e o restante é reaproveitado.
+"""
+
+import re
+
+
+# Títulos, cercas de código e linhas de tabela (sempre no início da linha)
+PADRAO_LINHA = re.compile(
+    r'^(?:(?P<nivel>#{1,6})[ \t]+(?P<titulo>[^\n]+)$'
+    r'|[ \t]*(?P<cerca>`{3,}|~{3,})(?P<info>[^\n]*)$'
+    r'|[ \t]*(?P<tabela>\|))',
+    re.MULTILINE
+)
+
+# Só as cercas, para achar os trechos de código antes de segmentar
+PADRAO_CERCA = re.compile(r'^[ \t]*(`{3,}|~{3,})([^\n]*)$', re.MULTILINE)
+
+# Início de segmento: títulos # e ## (seções que costumam ser editadas isoladamente)
+PADRAO_FRONTEIRA = re.compile(r'^#{1,2}[ \t]', re.MULTILINE)
+
+# Marcadores contados no texto todo (inclusive dentro de títulos e de código);
+# o prefixo literal deixa a busca em C saltar direto para os candidatos
+PADRAO_CRITICAL = re.compile(r'\*\*(?i:critical)')
+PADRAO_TODO = re.compile(r'\[TODO[^\n]*?\]|TODO:')
+PADRAO_QUANDO_USAR = re.compile(r'##[^\n]*quando usar')     # sobre o texto em minúsculas
+
+
+def _fecha(aberta: str, marca: str, info: str) -> bool:
+    """Se a cerca (marca, info) fecha o bloco aberto com a cerca 'aberta'."""
+    return marca[0] == aberta[0] and len(marca) >= len(aberta) and not info.strip()
+
+
+def trechos_codigo(texto: str, inicio: int = 0) -> list[tuple[int, int]]:
+    """
+    Posições (início, fim) dos blocos de código cercados.
+    
+    Args:
+        texto: Texto Markdown
+        inicio: Posição a partir da qual procurar
+    
+    Returns:
+        Trechos da cerca de abertura ao fim da cerca de fechamento (ou ao
+        fim do texto, se o bloco não for fechado)
+    """
+    trechos = []
+    aberta = None
+    for match in PADRAO_CERCA.finditer(texto, inicio):
+        if aberta is None:
+            aberta = (match.group(1), match.start())
+        elif _fecha(aberta[0], match.group(1), match.group(2)):
+            trechos.append((aberta[1], match.end()))
+            aberta = None
+    if aberta is not None:
+        trechos.append((aberta[1], len(texto)))
+    return trechos
+
+
+class Secao:
+    """Seção do SKILL.md delimitada por um título Markdown."""
+    
+    def __init__(self, nivel: int, titulo: str, linha: int, inicio: int = 0):
+        self.nivel = nivel
+        self.titulo = titulo
+        self.linha = linha
+        self.inicio = inicio      # posição do título no texto
+        self.fim = inicio         # posição do próximo título de nível igual ou maior
+        self.filhos: list['Secao'] = []
+    
+    def __repr__(self) -> str:
+        return f"Secao({self.nivel}, {self.titulo!r}, linha={self.linha})"
+
+
+class BlocoCodigo:
+    """Bloco de código cercado (linha da cerca de abertura e conteúdo)."""
+    
+    __slots__ = ('linha', 'linguagem', 'codigo')
+    
+    def __init__(self, linha: int, linguagem: str, codigo: str):
+        self.linha = linha
+        self.linguagem = linguagem
+        self.codigo = codigo
+    
+    def __repr__(self) -> str:
+        return f"BlocoCodigo(linha={self.linha}, {self.linguagem!r})"
+
+
+class _Segmento:
+    """Resultado da passada sobre um segmento (linhas e posições relativas)."""
+    
+    __slots__ = ('linhas', 'palavras', 'titulos', 'blocos', 'tabelas',
+                 'avisos_critical', 'todos', 'quando_usar')
+    
+    def __init__(self, texto: str):
+        self.linhas = texto.count('\n')
+        self.palavras = len(texto.split())
+        self.titulos: list[tuple[int, int, str, int]] = []    # (linha, nível, título, posição)
+        self.blocos: list[BlocoCodigo] = []
+        self.tabelas: list[tuple[int, int]] = []
+        
+        linha = 0
+        anterior = 0
+        cerca = None          # (marca, linha, linguagem, início do código)
+        for match in PADRAO_LINHA.finditer(texto):
+            inicio = match.start()
+            linha += texto.count('\n', anterior, inicio)
+            anterior = inicio
+            tipo = match.lastgroup
+            
+            if tipo == 'info':
+                marca = match.group('cerca')
+                if cerca is None:
+                    linguagem = match.group('info').strip().split(' ')[0]
+                    cerca = (marca, linha, linguagem, match.end() + 1)
+                elif _fecha(cerca[0], marca, match.group('info')):
+                    self.blocos.append(BlocoCodigo(cerca[1], cerca[2], texto[cerca[3]:inicio]))
+                    cerca = None
+            elif cerca is not None:
+                continue
+            elif tipo == 'titulo':
+                self.titulos.append((linha, len(match.group('nivel')), match.group('titulo'), inicio))
+            elif self.tabelas and self.tabelas[-1][1] == linha - 1:
+                self.tabelas[-1] = (self.tabelas[-1][0], linha)
+            else:
+                self.tabelas.append((linha, linha))
+        
+        self.avisos_critical = len(PADRAO_CRITICAL.findall(texto))
+        self.todos = len(PADRAO_TODO.findall(texto)) if 'TODO' in texto else 0
+        minusculo = texto.lower()
+        self.quando_usar = 'when to use' in minusculo or PADRAO_QUANDO_USAR.search(minusculo) is not None
+        
+        # Tabela Markdown precisa de cabeçalho e separador: ao menos duas linhas
+        self.tabelas = [(a, b) for a, b in self.tabelas if b > a]
+
+
+class EstruturaMarkdown:
+    """Estrutura e métricas do SKILL.md, montadas a partir dos segmentos."""
+    
+    def __init__(self):
+        self.secoes: list[Secao] = []
+        self.blocos: list[BlocoCodigo] = []
+        self.tabelas: list[tuple[int, int]] = []
+        self.linhas = 1
+        self.palavras = 0
+        self.caracteres = 0
+        self.avisos_critical = 0
+        self.todos = 0
+        self.quando_usar = False
+        self.segmentos = 0
+        self.reaproveitados = 0
+    
+    def titulos(self, nivel: int) -> list[str]:
+        """Títulos das seções de um nível (2 para ##, 3 para ###...)."""
+        return [s.titulo for s in self.secoes if s.nivel == nivel]
+
+
+class ParserMarkdown:
+    """Analisa o SKILL.md reaproveitando os segmentos inalterados da última análise."""
+    
+    def __init__(self):
+        self._segmentos: dict[str, _Segmento] = {}
+    
+    def _segmento(self, texto: str, novos: dict[str, _Segmento], estrutura: EstruturaMarkdown) -> _Segmento:
+        segmento = self._segmentos.get(texto)
+        if segmento is None:
+            segmento = novos.get(texto) or _Segmento(texto)
+        else:
+            estrutura.reaproveitados += 1
+        novos[texto] = segmento
+        estrutura.segmentos += 1
+        return segmento
+    
+    def analisar(self, texto: str, inicio_corpo: int = 0) -> EstruturaMarkdown:
+        """
+        Estrutura do texto em uma passada (por segmento alterado).
+        
+        Args:
+            texto: Conteúdo do SKILL.md
+            inicio_corpo: Posição onde termina o frontmatter (só contado em
+                linhas e palavras, sem estrutura)
+        
+        Returns:
+            EstruturaMarkdown com seções, blocos, tabelas e métricas
+        """
+        estrutura = EstruturaMarkdown()
+        estrutura.caracteres = len(texto)
+        estrutura.linhas = texto.count('\n', 0, inicio_corpo) + 1
+        estrutura.palavras = len(texto[:inicio_corpo].split())
+        
+        # Títulos dentro de blocos de código não dividem segmentos: assim
+        # nenhum segmento começa ou termina no meio de um bloco
+        codigo = trechos_codigo(texto, inicio_corpo)
+        fronteiras = [inicio_corpo]
+        k = 0
+        for match in PADRAO_FRONTEIRA.finditer(texto, inicio_corpo + 1):
+            posicao = match.start()
+            while k < len(codigo) and codigo[k][1] <= posicao:
+                k += 1
+            if k == len(codigo) or posicao < codigo[k][0]:
+                fronteiras.append(posicao)
+        fronteiras.append(len(texto))
+        
+        novos: dict[str, _Segmento] = {}
+        pilha: list[Secao] = []
+        for inicio, fim in zip(fronteiras, fronteiras[1:]):
+            segmento = self._segmento(texto[inicio:fim], novos, estrutura)
+            
+            deslocamento = estrutura.linhas
+            for linha, nivel, titulo, posicao in segmento.titulos:
+                secao = Secao(nivel, titulo, deslocamento + linha, inicio + posicao)
+                while pilha and pilha[-1].nivel >= secao.nivel:
+                    pilha.pop().fim = secao.inicio
+                if pilha:
+                    pilha[-1].filhos.append(secao)
+                pilha.append(secao)
+                estrutura.secoes.append(secao)
+            for bloco in segmento.blocos:
+                estrutura.blocos.append(BlocoCodigo(deslocamento + bloco.linha, bloco.linguagem, bloco.codigo))
+            for primeira, ultima in segmento.tabelas:
+                estrutura.tabelas.append((deslocamento + primeira, deslocamento + ultima))
+            
+            estrutura.linhas += segmento.linhas
+            estrutura.palavras += segmento.palavras
+            estrutura.avisos_critical += segmento.avisos_critical
+            estrutura.todos += segmento.todos
+            estrutura.quando_usar = estrutura.quando_usar or segmento.quando_usar
+        
+        for secao in pilha:
+            secao.fim = len(texto)
+        
+        # Só os segmentos desta análise ficam guardados (memória proporcional ao texto)
+        self._segmentos = novos
+        return estrutura
+
+
+def analisar_markdown(texto: str, inicio_corpo: int = 0) -> EstruturaMarkdown:
+    """Estrutura de um texto Markdown, sem reaproveitamento entre análises."""
+    return ParserMarkdown().analisar(texto, inicio_corpo)
@@ -3,37 +3,289 @@
 Forge Package — Empacota habilidade em arquivo .skill distribuível
 
 Uso:
-    forge_package.py <caminho-da-habilidade> [--output <diretorio>]
+    forge_package.py <caminho-da-habilidade> [--output <diretorio>] [--force] [--compress <glob>=<nível>]
+    forge_package.py [<diretorio>] --changed-since <ref> | --staged [--output <diretorio>]
 
 Exemplos:
     forge_package.py ./minha-habilidade
     forge_package.py ./minha-habilidade --output ./dist
+    forge_package.py ./skills --changed-since v1.2.0 --output ./dist
+    forge_package.py ./minha-habilidade --compress '*.bin=store' --compress 'references/*=max'
 
 O script:
     1. Valida a habilidade automaticamente
     2. Cria arquivo .skill (formato ZIP) com toda a estrutura
     3. Salva no diretório atual ou especificado
+
+O .skill é reproduzível: membros em ordem de nome, data fixa (1980-01-01
+ou $SOURCE_DATE_EPOCH) e permissões normalizadas (755/644), então as
+mesmas entradas geram os mesmos bytes em qualquer máquina (com a mesma
+zlib). O comentário do ZIP guarda o manifesto (SHA-256 dos nomes, modos
+e conteúdos); se o .skill de destino já tem o manifesto atual, nada é
+regravado. Se mudou, o .skill anterior é atualizado: os membros com o
+mesmo conteúdo têm os bytes comprimidos copiados como estão e só os
+novos ou alterados passam pelo deflate (forge_zip). --force refaz tudo.
+
+Cada arquivo recebe o nível de compressão pela amostra dos primeiros
+8 KB: o que já vem comprimido (PNG, JPEG, PDF, fontes, zip) vai sem
+deflate, o pouco compressível com deflate rápido e o texto com deflate
+máximo (padrão acima de 1 MB); --compress '<glob>=<nível>' força o nível. O relatório mostra a
+decisão e a razão obtida de cada arquivo.
+
+O deflate roda em várias threads (--jobs; o zlib libera o GIL), com os
+arquivos grandes divididos em pedaços de 1 MB comprimidos de forma
+independente; a saída é gravada em ordem e é a mesma para qualquer
+número de threads.
+
+Com --changed-since ou --staged, empacota só as habilidades alteradas,
+com o conteúdo de HEAD ou do índice lido direto do git (forge_git).
 """
 
+import os
 import sys
+import time
 import zipfile
 from pathlib import Path
 from datetime import datetime
+from contextlib import nullcontext
+
+from forge_documento import DocumentoHabilidade, carregar_documento
+from forge_perfil import configurar, trecho
+from forge_zip import (
+    NOMES_NIVEIS, EscritorZip, PoliticaCompressao, formato_compressao, membros_anteriores
+)
+
+
+# Versão do formato do pacote (entra no manifesto: mudar refaz todos os pacotes)
+VERSAO_PACOTE = 3
+
+# Início do comentário do ZIP que guarda o manifesto das entradas
+PREFIXO_MANIFESTO = b'skill-forge-manifest sha256:'
+
+# Data fixa dos membros (a menor aceita pelo formato ZIP)
+DATA_PADRAO = (1980, 1, 1, 0, 0, 0)
+
+# Versão das entradas de SHA-256 por arquivo no cache
+VERSAO_HASHES = 1
+
+# Arquivos modificados há menos que isto não têm o hash guardado: uma
+# escrita no mesmo tique do relógio não mudaria o mtime
+JANELA_MTIME_NS = 2 * 10**9
+
+
+def data_reproduzivel() -> tuple[int, int, int, int, int, int]:
+    """Data gravada em todos os membros: $SOURCE_DATE_EPOCH, se definido, ou DATA_PADRAO."""
+    epoca = os.environ.get('SOURCE_DATE_EPOCH', '')
+    if not epoca.isdigit():
+        return DATA_PADRAO
+    return max(DATA_PADRAO, tuple(time.gmtime(int(epoca))[:6]))
+
+
+def arquivos_do_pacote(documento: DocumentoHabilidade) -> list[Path]:
+    """
+    Arquivos da habilidade que entram no .skill, em ordem de caminho.
+    
+    São os do inventário, que já deixa de fora o que o filtro da
+    habilidade ignora (forge_ignorar): os mesmos que a validação vê.
+    """
+    raiz = documento.caminho
+    return [raiz / entrada.relativo for entrada in documento.inventario.arquivos]
+
+
+class MembroPacote:
+    """Arquivo que entra no .skill, com o que define seus bytes no pacote."""
+    
+    __slots__ = ('arquivo', 'nome', 'modo', 'tamanho', 'sha256', 'nivel', 'motivo')
+    
+    def __init__(self, arquivo: Path, nome: str, modo: int, tamanho: int, sha256: str, nivel: int, motivo: str):
+        self.arquivo = arquivo
+        self.nome = nome
+        self.modo = modo
+        self.tamanho = tamanho
+        self.sha256 = sha256
+        self.nivel = nivel
+        self.motivo = motivo
+    
+    def __repr__(self) -> str:
+        return f"MembroPacote({self.nome!r}, {NOMES_NIVEIS[self.nivel]})"
+
+
+def membros_do_pacote(
+    documento: DocumentoHabilidade,
+    excluir: Path | None = None,
+    politica: PoliticaCompressao | None = None
+) -> list[MembroPacote]:
+    """
+    Membros do .skill em ordem de nome, com permissões normalizadas.
+    
+    Args:
+        documento: Habilidade a empacotar
+        excluir: Arquivo que não entra no pacote (o próprio .skill, se
+            gravado dentro da habilidade)
+        politica: Escolha do nível de compressão (padrão: pela amostra)
+    
+    Returns:
+        Membros com modo 0o755 ou 0o644, SHA-256 e nível de compressão
+    
+    O SHA-256 de cada arquivo fica no cache (namespace 'package') com o
+    tamanho e o mtime: só os arquivos cujo stat mudou são lidos de novo, e
+    um pacote inalterado custa um stat por arquivo, não uma leitura.
+    """
+    from forge_cache import CacheResultados, hash_arquivo  # só ao empacotar
+    politica = politica or PoliticaCompressao()
+    raiz = documento.caminho
+    cache = CacheResultados.padrao('package')
+    chave = CacheResultados.chave(f"hashes v{VERSAO_HASHES}", str(raiz))
+    conhecidos = cache.obter(chave) or {}
+    # Arquivo alterado no mesmo instante do stat pode mudar sem mudar o mtime
+    recente_ns = time.time_ns() - JANELA_MTIME_NS
+    hashes = {}
+    membros = []
+    for arquivo in arquivos_do_pacote(documento):
+        if arquivo == excluir:
+            continue
+        info = os.stat(arquivo)
+        modo = 0o755 if info.st_mode & 0o111 else 0o644
+        relativo = arquivo.relative_to(raiz).as_posix()
+        anterior = conhecidos.get(relativo)
+        if anterior and anterior[:2] == [info.st_size, info.st_mtime_ns]:
+            sha256 = anterior[2]
+        else:
+            sha256 = hash_arquivo(arquivo)
+        if info.st_mtime_ns < recente_ns:
+            hashes[relativo] = [info.st_size, info.st_mtime_ns, sha256]
+        nivel, motivo = politica.escolher(arquivo, relativo)
+        membros.append(MembroPacote(
+            arquivo, arquivo.relative_to(raiz.parent).as_posix(), modo,
+            info.st_size, sha256, nivel, motivo
+        ))
+    if hashes != conhecidos:
+        cache.gravar(chave, hashes)
+    membros.sort(key=lambda membro: membro.nome)
+    return membros
+
+
+def manifesto(membros: list[MembroPacote], data: tuple[int, ...]) -> str:
+    """
+    Digest das entradas do pacote: nome, modo, conteúdo e compressão de cada membro.
+    
+    Não depende de mtime, dono ou máquina: a mesma árvore gera o mesmo
+    manifesto em qualquer checkout.
+    
+    Returns:
+        Digest hexadecimal SHA-256
+    """
+    from forge_cache import CacheResultados  # só ao empacotar
+    partes = [f"pacote v{VERSAO_PACOTE}", repr(data)]
+    for membro in membros:
+        partes += [membro.nome, f"{membro.modo:o}", membro.sha256, formato_compressao(membro.nivel)]
+    return CacheResultados.chave(*partes)
 
-# Importar validador do mesmo diretório
-from forge_validate import validar_habilidade
+
+def manifesto_gravado(arquivo_skill: Path) -> str | None:
+    """Manifesto do comentário de um .skill existente (None se ausente ou ilegível)."""
+    try:
+        with zipfile.ZipFile(arquivo_skill) as zipf:
+            comentario = zipf.comment
+    except (OSError, zipfile.BadZipFile):
+        return None
+    if not comentario.startswith(PREFIXO_MANIFESTO):
+        return None
+    return comentario[len(PREFIXO_MANIFESTO):].decode('ascii', 'replace')
+
+
+def formatar_tamanho(tamanho_bytes: int) -> str:
+    """Tamanho legível (bytes, KB ou MB)."""
+    if tamanho_bytes < 1024:
+        return f"{tamanho_bytes} bytes"
+    elif tamanho_bytes < 1024 * 1024:
+        return f"{tamanho_bytes / 1024:.1f} KB"
+    else:
+        return f"{tamanho_bytes / (1024 * 1024):.1f} MB"
+
+
+def escrever_pacote(
+    arquivo_skill: Path,
+    membros: list[MembroPacote],
+    digest: str,
+    data: tuple[int, ...],
+    incremental: bool = True,
+    tarefas: int = 1
+) -> int:
+    """
+    Grava o .skill de forma reproduzível e atômica e imprime o relatório por membro.
+    
+    Membros em ordem, todos com a mesma data, permissões normalizadas e
+    sistema de origem Unix; o manifesto vai no comentário do ZIP. O
+    arquivo é escrito ao lado e renomeado: um .skill anterior nunca fica
+    pela metade.
+    
+    Args:
+        arquivo_skill: Destino (se já existir, é a base da atualização)
+        membros: Ver membros_do_pacote
+        digest: Manifesto das entradas
+        data: Data de todos os membros
+        incremental: Copia do .skill existente os bytes comprimidos dos
+            membros com o mesmo conteúdo e compressão, em vez de
+            recomprimi-los
+        tarefas: Threads de compressão (não altera os bytes gravados)
+    
+    Returns:
+        Número de membros copiados sem recomprimir
+    """
+    anteriores = membros_anteriores(arquivo_skill) if incremental else {}
+    temporario = arquivo_skill.with_name(f".{arquivo_skill.name}.{os.getpid()}.tmp")
+    copiados = set()
+    try:
+        with trecho('zip', 'zip', arquivo=str(arquivo_skill)), \
+                open(arquivo_skill, 'rb') if anteriores else nullcontext() as zip_anterior, \
+                EscritorZip(temporario, data, tarefas=tarefas) as zipf:
+            for membro in membros:
+                with trecho(membro.nome, 'zip'):
+                    anterior = anteriores.get((formato_compressao(membro.nivel), membro.sha256))
+                    if anterior is not None:
+                        zipf.copiar(zip_anterior, anterior, membro.nome, membro.modo, membro.sha256)
+                        copiados.add(membro.nome)
+                    else:
+                        zipf.adicionar(membro.arquivo, membro.nome, membro.modo, membro.sha256, membro.nivel)
+            zipf.comentario = PREFIXO_MANIFESTO + digest.encode('ascii')
+        os.replace(temporario, arquivo_skill)
+    finally:
+        temporario.unlink(missing_ok=True)
+    
+    # Decisão e razão obtida de cada membro (gravados na mesma ordem)
+    largura = min(max((len(m.nome) for m in membros), default=0), 60)
+    for membro, gravado in zip(membros, zipf.membros):
+        razao = f"{gravado.comprimido / gravado.tamanho:6.1%}" if gravado.tamanho else f"{'—':>6}"
+        marca = '=' if membro.nome in copiados else '+'
+        print(f"  {marca} {membro.nome:<{largura}}  {NOMES_NIVEIS[membro.nivel]:<7} {razao}  ({membro.motivo})")
+    return len(copiados)
 
 
-def empacotar_habilidade(caminho_habilidade: str, diretorio_saida: str | None = None) -> Path | None:
+def empacotar_habilidade(
+    caminho_habilidade: str,
+    diretorio_saida: str | None = None,
+    forcar: bool = False,
+    tarefas: int | None = None,
+    politica: PoliticaCompressao | None = None
+) -> Path | None:
     """
     Empacota uma habilidade em arquivo .skill.
     
+    Se o .skill de destino já tem o manifesto das entradas atuais, nada é
+    regravado; senão, só os membros novos ou alterados são comprimidos e
+    os demais são copiados dele como estão.
+    
     Args:
         caminho_habilidade: Caminho para o diretório da habilidade
         diretorio_saida: Diretório onde salvar o .skill (opcional)
+        forcar: Regrava o .skill do zero, recomprimindo todos os membros
+        tarefas: Threads de compressão (padrão: núcleos disponíveis)
+        politica: Nível de compressão de cada arquivo (padrão: pela
+            amostra do início do arquivo)
     
     Returns:
-        Path do arquivo .skill criado, ou None se erro
+        Path do arquivo .skill criado (ou já atualizado), ou None se erro
     """
     caminho = Path(caminho_habilidade).resolve()
     
@@ -46,15 +298,17 @@ def empacotar_habilidade(caminho_habilidade: str, diretorio_saida: str | None =
         print(f"❌ Erro: Caminho não é um diretório: {caminho}")
         return None
     
-    # Verificar SKILL.md
-    skill_md = caminho / 'SKILL.md'
-    if not skill_md.exists():
+    # Verificar SKILL.md (documento compartilhado com a validação)
+    documento = carregar_documento(caminho)
+    if documento.texto is None:
         print(f"❌ Erro: SKILL.md não encontrado em {caminho}")
         return None
     
     # Validar antes de empacotar
     print("🔍 Validando habilidade...")
-    valido, mensagem = validar_habilidade(caminho, verbose=False)
+    from forge_validate import Validador, processos_disponiveis  # importado só quando usado
+    with trecho('validação', 'regra'):
+        valido, mensagem = Validador(caminho, documento=documento).validar()
     
     if not valido:
         print(f"❌ Validação falhou: {mensagem}")
@@ -75,117 +329,180 @@ def empacotar_habilidade(caminho_habilidade: str, diretorio_saida: str | None =
     
     arquivo_skill = destino / f"{nome_habilidade}.skill"
     
-    # Arquivos a ignorar
-    IGNORAR = {
-        '__pycache__', '.git', 'node_modules', '.DS_Store', 
-        'Thumbs.db', '.gitignore', '.env'
-    }
-    
-    EXTENSOES_IGNORAR = {'.pyc', '.pyo', '.tmp', '.bak', '.swp'}
-    
-    def deve_incluir(arquivo: Path) -> bool:
-        """Verifica se arquivo deve ser incluído no pacote."""
-        # Ignorar diretórios/arquivos específicos
-        for parte in arquivo.parts:
-            if parte in IGNORAR:
-                return False
-        
-        # Ignorar extensões específicas
-        if arquivo.suffix in EXTENSOES_IGNORAR:
-            return False
-        
-        # Ignorar arquivos ocultos (exceto na raiz)
-        if arquivo.name.startswith('.') and arquivo.parent != caminho:
-            return False
-        
-        return True
-    
-    # Criar arquivo .skill
-    print(f"📦 Empacotando: {nome_habilidade}")
-    
     try:
-        arquivos_incluidos = 0
+        data = data_reproduzivel()
+        membros = membros_do_pacote(documento, arquivo_skill, politica)
+        with trecho('manifesto', 'zip'):
+            digest = manifesto(membros, data)
+        
+        # Entradas iguais às do pacote existente: nada a refazer
+        if not forcar and manifesto_gravado(arquivo_skill) == digest:
+            print(f"✅ Pacote inalterado: {arquivo_skill}")
+            print(f"   Manifesto: {digest[:16]}")
+            return arquivo_skill
         
-        with zipfile.ZipFile(arquivo_skill, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for arquivo in caminho.rglob('*'):
-                if arquivo.is_file() and deve_incluir(arquivo):
-                    # Caminho relativo mantendo estrutura de diretórios
-                    caminho_no_zip = arquivo.relative_to(caminho.parent)
-                    zipf.write(arquivo, caminho_no_zip)
-                    print(f"  + {caminho_no_zip}")
-                    arquivos_incluidos += 1
+        # Criar arquivo .skill
+        print(f"📦 Empacotando: {nome_habilidade}")
+        inicio = time.perf_counter()
+        copiados = escrever_pacote(
+            arquivo_skill, membros, digest, data,
+            incremental=not forcar, tarefas=tarefas or processos_disponiveis()
+        )
+        segundos = time.perf_counter() - inicio
         
         # Verificar tamanho
-        tamanho_bytes = arquivo_skill.stat().st_size
-        if tamanho_bytes < 1024:
-            tamanho_str = f"{tamanho_bytes} bytes"
-        elif tamanho_bytes < 1024 * 1024:
-            tamanho_str = f"{tamanho_bytes / 1024:.1f} KB"
-        else:
-            tamanho_str = f"{tamanho_bytes / (1024 * 1024):.1f} MB"
+        tamanho_str = formatar_tamanho(arquivo_skill.stat().st_size)
+        entrada = sum(m.tamanho for m in membros)
+        armazenados = [m for m in membros if m.nivel == 0]
+        niveis = {}
+        for membro in membros:
+            niveis[NOMES_NIVEIS[membro.nivel]] = niveis.get(NOMES_NIVEIS[membro.nivel], 0) + 1
         
         print()
         print(f"✅ Empacotado com sucesso!")
         print(f"   Arquivo: {arquivo_skill}")
         print(f"   Tamanho: {tamanho_str}")
-        print(f"   Arquivos: {arquivos_incluidos}")
+        print(f"   Arquivos: {len(membros)}")
+        print(f"   Compressão: {', '.join(f'{n} {nome}' for nome, n in sorted(niveis.items()))}")
+        if armazenados:
+            print(f"   Sem deflate: {len(armazenados)} arquivo(s), "
+                  f"{formatar_tamanho(sum(m.tamanho for m in armazenados))} já comprimidos gravados como estão")
+        if copiados:
+            print(f"   Reaproveitados: {copiados} (bytes comprimidos copiados do .skill anterior)")
+        print(f"   Vazão: {entrada / 1024 / 1024 / max(segundos, 1e-6):.1f} MB/s "
+              f"({formatar_tamanho(entrada)} em {segundos:.2f} s)")
+        print(f"   Manifesto: {digest[:16]}")
         
         return arquivo_skill
         
     except Exception as e:
         print(f"❌ Erro ao criar arquivo .skill: {e}")
-        # Limpar arquivo parcial se existir
-        if arquivo_skill.exists():
-            arquivo_skill.unlink()
         return None
 
 
-def main():
+def _main_git(
+    caminho: str,
+    desde: str | None,
+    indice: bool,
+    diretorio_saida: str | None,
+    forcar: bool,
+    tarefas: int | None,
+    politica: PoliticaCompressao
+) -> int:
+    """Empacota só as habilidades alteradas (--changed-since / --staged)."""
+    from forge_git import ErroGit, habilidades_do_git  # só nos modos git
+    
+    origem = "preparadas para commit" if indice else f"alteradas desde {desde}"
+    print(f"📚 Empacotando habilidades {origem}: {caminho}")
+    
+    falhas = 0
+    try:
+        with habilidades_do_git(Path(caminho), desde, indice) as habilidades:
+            if not habilidades:
+                print()
+                print("✅ Nenhuma habilidade alterada")
+            for relativo, copia in habilidades:
+                print()
+                print(f"── {relativo or '.'}")
+                if empacotar_habilidade(copia, diretorio_saida, forcar, tarefas, politica) is None:
+                    falhas += 1
+    except ErroGit as e:
+        print(f"❌ {e}")
+        return 1
+    return 1 if falhas else 0
+
+
+def main(argv: list[str] | None = None) -> int:
     # Parse argumentos
-    args = sys.argv[1:]
+    args = sys.argv[1:] if argv is None else argv
+    args = configurar(args)
     
     if not args or '--help' in args or '-h' in args:
         print("Forge Package — Empacota habilidade em arquivo .skill")
         print()
-        print("Uso: forge_package.py <caminho-da-habilidade> [--output <diretorio>]")
+        print("Uso: forge_package.py <caminho-da-habilidade> [--output <diretorio>] [--force] [--compress <glob>=<nível>]")
+        print("     forge_package.py [<diretorio>] --changed-since <ref> | --staged [--output <diretorio>]")
         print()
         print("Opções:")
-        print("  --output <dir>    Diretório de saída (padrão: diretório atual)")
+        print("  --output <dir>         Diretório de saída (padrão: diretório atual)")
+        print("  --changed-since <ref>  Só habilidades alteradas entre <ref> e HEAD (lidas do git)")
+        print("  --staged               Só habilidades com alterações no índice")
+        print("  --force                Refaz o .skill do zero (sem reaproveitar o anterior)")
+        print("  --jobs <n>             Threads de compressão (padrão: núcleos disponíveis)")
+        print("  --compress <glob>=<n>  Nível para os arquivos do glob: store, fast, default ou max")
+        print("                         (repetível; sem regra, o nível vem de uma amostra do arquivo)")
         print()
         print("Exemplos:")
         print("  forge_package.py ./minha-habilidade")
         print("  forge_package.py ./minha-habilidade --output ./dist")
+        print("  forge_package.py ./skills --changed-since v1.2.0 --output ./dist")
+        print("  forge_package.py ./minha-habilidade --compress 'assets/*.svg=max' --compress '*.bin=store'")
         print()
         print("O arquivo .skill é um ZIP que pode ser importado no Claude Code.")
-        sys.exit(0)
+        return 0
     
     # Extrair argumentos
     caminho_habilidade = None
     diretorio_saida = None
+    desde = None
+    indice = False
+    forcar = False
+    tarefas = None
+    politica = PoliticaCompressao()
     
     i = 0
     while i < len(args):
         if args[i] == '--output' and i + 1 < len(args):
             diretorio_saida = args[i + 1]
             i += 2
+        elif args[i] == '--changed-since' and i + 1 < len(args):
+            desde = args[i + 1]
+            i += 2
+        elif args[i] == '--staged':
+            indice = True
+            i += 1
+        elif args[i] == '--force':
+            forcar = True
+            i += 1
+        elif args[i] == '--jobs' and i + 1 < len(args):
+            if not args[i + 1].isdigit():
+                print(f"❌ Erro: --jobs espera um número inteiro, recebeu: {args[i + 1]}")
+                print("Use --help para ver as opções")
+                return 1
+            tarefas = max(1, int(args[i + 1]))
+            i += 2
+        elif args[i] == '--compress' and i + 1 < len(args):
+            try:
+                politica.adicionar_regra(args[i + 1])
+            except ValueError as e:
+                print(f"❌ {e}")
+                return 1
+            i += 2
         elif not args[i].startswith('--'):
             caminho_habilidade = args[i]
             i += 1
         else:
             print(f"❌ Argumento desconhecido: {args[i]}")
-            sys.exit(1)
+            return 1
+    
+    if desde is not None and indice:
+        print("❌ Erro: Use --changed-since ou --staged, não ambos")
+        return 1
+    
+    if desde is not None or indice:
+        return _main_git(caminho_habilidade or '.', desde, indice, diretorio_saida, forcar, tarefas, politica)
     
     if not caminho_habilidade:
         print("❌ Erro: Caminho da habilidade é obrigatório")
-        sys.exit(1)
+        return 1
     
-    resultado = empacotar_habilidade(caminho_habilidade, diretorio_saida)
+    resultado = empacotar_habilidade(caminho_habilidade, diretorio_saida, forcar, tarefas, politica)
     
     if resultado:
-        sys.exit(0)
+        return 0
     else:
-        sys.exit(1)
+        return 1
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
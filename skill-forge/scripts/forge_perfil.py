@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Forge Perfil — Linha do tempo (Chrome trace-event) de qualquer ferramenta
+
+Uso (como módulo):
+    from forge_perfil import configurar, trecho
+
+    def main(argv=None):
+        args = configurar(sys.argv[1:] if argv is None else argv)   # trata --profile
+        with trecho('saída', 'saída'):
+            print(relatorio)
+
+Na linha de comando de qualquer ferramenta forge_*:
+    forge_validate.py ./minha-habilidade --profile perfil.json
+    forge.py package ./minha-habilidade --profile perfil.json --cprofile
+
+O JSON abre no Perfetto (ui.perfetto.dev) ou em chrome://tracing e traz
+trechos aninhados para:
+    - inicialização do processo (do início do processo até a leitura de
+      --profile: interpretador e imports de topo do script)
+    - imports feitos depois disso, cada módulo novo em seu trecho
+    - inventário de arquivos, frontmatter, estrutura do Markdown, cada
+      regra, escrita do zip (e de cada membro) e renderização da saída
+
+Com --cprofile, as estatísticas do cProfile são gravadas ao lado, em
+<arquivo>.prof (python -m pstats, snakeviz). O arquivo é gravado na
+saída do processo. Na validação de biblioteca com vários processos
+(--jobs), as regras rodam nos processos filhos e não aparecem.
+
+Sem --profile, trecho() devolve um contexto vazio compartilhado: o custo
+por trecho é uma chamada de função e uma comparação.
+"""
+
+import os
+import sys
+import time
+import atexit
+import builtins
+import _thread
+from pathlib import Path
+
+
+# Arquivo usado quando só --cprofile é passado
+ARQUIVO_PADRAO = 'forge-perfil.json'
+
+
+class _Nulo:
+    """Contexto vazio devolvido por trecho() quando o perfil está desligado."""
+    
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *_):
+        return False
+
+
+_NULO = _Nulo()
+
+# Registro ativo (None: perfil desligado)
+_registro: 'RegistroPerfil | None' = None
+
+
+class _Trecho:
+    """Trecho medido: grava um evento completo ("ph": "X") ao sair."""
+    
+    __slots__ = ('registro', 'nome', 'categoria', 'argumentos', 'inicio')
+    
+    def __init__(self, registro: 'RegistroPerfil', nome: str, categoria: str, argumentos: dict):
+        self.registro = registro
+        self.nome = nome
+        self.categoria = categoria
+        self.argumentos = argumentos
+    
+    def __enter__(self):
+        self.inicio = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, *_):
+        self.registro.adicionar(self.nome, self.categoria, self.inicio, time.perf_counter_ns(), self.argumentos)
+        return False
+
+
+def _decorrido_desde_inicio_ns() -> int:
+    """Tempo desde o início do processo: /proc no Linux (resolução de 10 ms), no mínimo o tempo de CPU."""
+    cpu = time.process_time_ns()
+    try:
+        with open('/proc/self/stat', 'rb') as f:
+            # Campos após o nome do programa (entre parênteses); starttime é o 22º
+            campos = f.read().rsplit(b')', 1)[1].split()
+        with open('/proc/uptime', 'rb') as f:
+            ligado = float(f.read().split()[0])
+        inicio = int(campos[19]) / os.sysconf('SC_CLK_TCK')
+        return max(cpu, int((ligado - inicio) * 1e9))
+    except (OSError, ValueError, IndexError, AttributeError):
+        return cpu
+
+
+class RegistroPerfil:
+    """Eventos da linha do tempo e, opcionalmente, o cProfile do processo."""
+    
+    def __init__(self, arquivo: Path, cprofile: bool = False):
+        self.arquivo = arquivo
+        self.eventos: list[dict] = []
+        self.pid = os.getpid()
+        agora = time.perf_counter_ns()
+        # Zero da linha do tempo: início estimado do processo
+        self.origem = agora - _decorrido_desde_inicio_ns()
+        self.adicionar('inicialização do processo', 'processo', self.origem, agora)
+        
+        self._importar_original = builtins.__import__
+        builtins.__import__ = self._importar
+        
+        self.perfilador = None
+        if cprofile:
+            import cProfile
+            self.perfilador = cProfile.Profile()
+            self.perfilador.enable()
+    
+    def adicionar(self, nome: str, categoria: str, inicio_ns: int, fim_ns: int, argumentos: dict | None = None):
+        evento = {
+            'name': nome,
+            'cat': categoria,
+            'ph': 'X',
+            'ts': (inicio_ns - self.origem) / 1000,
+            'dur': (fim_ns - inicio_ns) / 1000,
+            'pid': self.pid,
+            'tid': _thread.get_ident(),
+        }
+        if argumentos:
+            evento['args'] = argumentos
+        self.eventos.append(evento)
+    
+    def _importar(self, name, globals=None, locals=None, fromlist=(), level=0):
+        """
+        builtins.__import__ que mede cada módulo carregado pela primeira vez.
+        
+        Os parâmetros têm os nomes do original: há quem chame __import__ com
+        argumentos nomeados (fromlist=..., level=...).
+        """
+        if level or name in sys.modules:
+            return self._importar_original(name, globals, locals, fromlist, level)
+        inicio = time.perf_counter_ns()
+        try:
+            return self._importar_original(name, globals, locals, fromlist, level)
+        finally:
+            self.adicionar(f"import {name}", 'import', inicio, time.perf_counter_ns())
+    
+    def gravar(self):
+        """Grava o JSON (trace-event) e, se pedido, o .prof do cProfile."""
+        builtins.__import__ = self._importar_original
+        import json  # só ao gravar o perfil
+        
+        if self.perfilador is not None:
+            self.perfilador.disable()
+            self.perfilador.dump_stats(str(self.arquivo.with_suffix('.prof')))
+        
+        nome = Path(sys.argv[0]).name if sys.argv and sys.argv[0] else 'python'
+        metadados = [{
+            'name': 'process_name', 'ph': 'M', 'pid': self.pid,
+            'args': {'name': f"{nome} {' '.join(sys.argv[1:])}".strip()},
+        }]
+        documento = {
+            'traceEvents': metadados + self.eventos,
+            'displayTimeUnit': 'ms',
+            'otherData': {'argv': sys.argv, 'python': sys.version.split()[0]},
+        }
+        try:
+            self.arquivo.parent.mkdir(parents=True, exist_ok=True)
+            self.arquivo.write_text(json.dumps(documento, ensure_ascii=False), encoding='utf-8')
+        except OSError as e:
+            print(f"❌ Não foi possível gravar o perfil: {e}", file=sys.stderr)
+            return
+        print(f"🧭 Perfil gravado em {self.arquivo} ({len(self.eventos)} trechos)", file=sys.stderr)
+
+
+def trecho(nome: str, categoria: str = 'forge', **argumentos):
+    """
+    Contexto que registra um trecho na linha do tempo, se o perfil estiver ligado.
+    
+    Args:
+        nome: Nome exibido no Perfetto
+        categoria: Categoria do evento (filtra e colore a linha do tempo)
+        **argumentos: Detalhes exibidos ao selecionar o trecho
+    """
+    if _registro is None:
+        return _NULO
+    return _Trecho(_registro, nome, categoria, argumentos)
+
+
+def ativo() -> bool:
+    """Se o perfil está sendo registrado neste processo."""
+    return _registro is not None
+
+
+def iniciar(arquivo: str | Path, cprofile: bool = False) -> RegistroPerfil:
+    """Liga o registro (uma vez por processo) e agenda a gravação na saída."""
+    global _registro
+    if _registro is None:
+        _registro = RegistroPerfil(Path(arquivo).resolve(), cprofile)
+        atexit.register(_registro.gravar)
+    return _registro
+
+
+def configurar(args: list[str]) -> list[str]:
+    """
+    Retira --profile <arquivo> e --cprofile dos argumentos e liga o perfil se pedido.
+    
+    Args:
+        args: Argumentos da linha de comando da ferramenta
+    
+    Returns:
+        Argumentos restantes, para o parser da ferramenta
+    """
+    if '--profile' not in args and '--cprofile' not in args:
+        return args
+    
+    arquivo = None
+    cprofile = False
+    restantes = []
+    i = 0
+    while i < len(args):
+        if args[i] == '--profile' and i + 1 < len(args):
+            arquivo = args[i + 1]
+            i += 2
+        elif args[i] == '--cprofile':
+            cprofile = True
+            i += 1
+        else:
+            restantes.append(args[i])
+            i += 1
+    
+    iniciar(arquivo or ARQUIVO_PADRAO, cprofile)
+    return restantes
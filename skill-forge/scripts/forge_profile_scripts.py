@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Forge Profile Scripts — Tempo de inicialização dos scripts de uma habilidade
+
+Uso:
+    forge_profile_scripts.py <caminho-da-habilidade> [--jobs <n>] [--timeout <s>] [--top <n>]
+                             [--no-cache] [--cache-dir <dir>]
+
+Exemplos:
+    forge_profile_scripts.py ./minha-habilidade
+    forge_profile_scripts.py ./minha-habilidade --jobs 1 --timeout 30
+
+Mede, para cada scripts/*.py:
+    - Tempo total até o fim de uma execução rápida (--help por padrão)
+    - Imports mais lentos, pelo tempo acumulado de `python -X importtime`
+    - Imports pesados no topo do módulo cujos nomes só são usados dentro
+      de funções: candidatos a import tardio, dentro da função que os usa
+
+Cada script roda em um subprocesso próprio, com tempo limite, vários ao
+mesmo tempo (--jobs, padrão: número de CPUs; use --jobs 1 para medidas
+mais estáveis) e sem gravar bytecode: nenhum __pycache__ é criado na
+habilidade (os módulos da biblioteca padrão e instalados usam o bytecode
+que já existe). Os imports feitos pelo próprio interpretador ao iniciar
+são medidos uma vez e descontados.
+
+Um script pode declarar outro argumento de teste em um comentário no
+início do arquivo:
+
+    # forge-smoke: --version
+
+Os resultados ficam em cache pelo hash dos .py de scripts/ (o script e
+os módulos vizinhos que ele pode importar), pelos argumentos e pelo
+interpretador: rodar de novo sem alterações não executa nada (scripts
+que estouraram o tempo limite são sempre executados de novo).
+"""
+
+import os
+import re
+import sys
+import ast
+import time
+import shlex
+import subprocess
+from pathlib import Path
+
+from forge_cache import CacheResultados, hash_arquivo
+from forge_documento import carregar_documento
+from forge_perfil import configurar, trecho
+
+
+# Versão do perfil: incrementar ao mudar a medição (invalida o cache)
+VERSAO_PERFIL = 1
+
+# Argumentos padrão da execução de teste e tempo limite (segundos)
+ARGUMENTOS_PADRAO = ['--help']
+TIMEOUT_PADRAO = 10
+
+# Import de topo a partir do qual vale sugerir o import tardio (ms acumulados)
+LIMIAR_IMPORT_PESADO_MS = 10
+
+# Imports listados por script
+TOP_PADRAO = 5
+
+# Declaração do argumento de teste (procurada só no início do script)
+PADRAO_SMOKE = re.compile(r'^#\s*forge-smoke:(.*)$', re.MULTILINE)
+BYTES_CABECALHO = 2048
+
+# Linha de -X importtime: "import time: <próprio> | <acumulado> | <recuo><módulo>"
+PADRAO_IMPORTTIME = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)', re.MULTILINE)
+
+
+def argumentos_teste(caminho: Path) -> list[str]:
+    """Argumentos declarados em '# forge-smoke:' ou ARGUMENTOS_PADRAO."""
+    with open(caminho, 'rb') as f:
+        cabecalho = f.read(BYTES_CABECALHO).decode('utf-8', 'replace')
+    match = PADRAO_SMOKE.search(cabecalho)
+    return shlex.split(match.group(1)) if match else list(ARGUMENTOS_PADRAO)
+
+
+def ler_importtime(saida: str) -> list[tuple[str, int, float, float]]:
+    """
+    Imports da saída de `-X importtime`, na ordem em que terminaram.
+    
+    Returns:
+        Lista (módulo, nível de aninhamento, próprio ms, acumulado ms)
+    """
+    return [
+        (match.group(4), len(match.group(3)) // 2, int(match.group(1)) / 1000, int(match.group(2)) / 1000)
+        for match in PADRAO_IMPORTTIME.finditer(saida)
+    ]
+
+
+class _UsoNoTopo(ast.NodeVisitor):
+    """Imports e nomes usados fora do corpo das funções (executados ao carregar o módulo)."""
+    
+    def __init__(self):
+        self.imports: list[tuple[int, str, list[str]]] = []   # (linha, módulo, nomes ligados)
+        self.nomes: set[str] = set()
+    
+    def visit_Import(self, no: ast.Import):
+        for alias in no.names:
+            ligado = alias.asname or alias.name.split('.')[0]
+            self.imports.append((no.lineno, alias.name, [ligado]))
+    
+    def visit_ImportFrom(self, no: ast.ImportFrom):
+        if no.level or not no.module:
+            return
+        ligados = [alias.asname or alias.name for alias in no.names if alias.name != '*']
+        if ligados:
+            self.imports.append((no.lineno, no.module, ligados))
+    
+    def visit_Name(self, no: ast.Name):
+        self.nomes.add(no.id)
+    
+    def visit_FunctionDef(self, no):
+        # Decoradores, valores padrão e anotações rodam na definição; o corpo não
+        for decorador in no.decorator_list:
+            self.visit(decorador)
+        self.visit(no.args)
+        if no.returns:
+            self.visit(no.returns)
+    
+    visit_AsyncFunctionDef = visit_FunctionDef
+    
+    def visit_Lambda(self, no: ast.Lambda):
+        self.visit(no.args)
+
+
+def imports_adiaveis(codigo: str) -> list[tuple[int, str]]:
+    """
+    Imports de topo cujos nomes só são usados dentro de funções.
+    
+    Args:
+        codigo: Código-fonte do script
+    
+    Returns:
+        Lista (linha, módulo); vazia se o código não for Python válido
+    """
+    try:
+        arvore = ast.parse(codigo)
+    except (SyntaxError, ValueError):
+        return []
+    uso = _UsoNoTopo()
+    uso.visit(arvore)
+    return [
+        (linha, modulo) for linha, modulo, ligados in uso.imports
+        if not any(nome in uso.nomes for nome in ligados)
+    ]
+
+
+class PerfilScript:
+    """Resultado da execução de teste de um script."""
+    
+    def __init__(
+        self,
+        script: str,
+        argumentos: list[str],
+        codigo_saida: int | None = None,
+        tempo_ms: float = 0.0,
+        imports: list[tuple[str, float, float]] | None = None,
+        adiaveis: list[tuple[int, str, float]] | None = None,
+        erro: str | None = None,
+        do_cache: bool = False
+    ):
+        self.script = script
+        self.argumentos = argumentos
+        self.codigo_saida = codigo_saida
+        self.tempo_ms = tempo_ms
+        self.imports = imports or []        # (módulo, próprio ms, acumulado ms), nível 0
+        self.adiaveis = adiaveis or []      # (linha, módulo, acumulado ms)
+        self.erro = erro
+        self.do_cache = do_cache
+    
+    @property
+    def importacao_ms(self) -> float:
+        return sum(acumulado for _, _, acumulado in self.imports)
+    
+    def como_dict(self) -> dict:
+        return {
+            'script': self.script,
+            'argumentos': self.argumentos,
+            'codigo_saida': self.codigo_saida,
+            'tempo_ms': self.tempo_ms,
+            'imports': self.imports,
+            'adiaveis': self.adiaveis,
+            'erro': self.erro,
+        }
+    
+    @classmethod
+    def de_dict(cls, dados: dict) -> 'PerfilScript':
+        return cls(
+            dados['script'], dados['argumentos'], dados['codigo_saida'], dados['tempo_ms'],
+            [tuple(i) for i in dados['imports']], [tuple(a) for a in dados['adiaveis']],
+            dados['erro'], do_cache=True
+        )
+
+
+def _ambiente() -> dict[str, str]:
+    ambiente = dict(os.environ)
+    ambiente['PYTHONDONTWRITEBYTECODE'] = '1'
+    ambiente.pop('PYTHONPROFILEIMPORTTIME', None)
+    return ambiente
+
+
+def _executar(comando: list[str], cwd: Path, ambiente: dict, timeout: float) -> tuple[int | None, float, str]:
+    """Roda o comando; retorna (código de saída ou None se estourou o tempo, ms, stderr)."""
+    inicio = time.perf_counter()
+    try:
+        resultado = subprocess.run(
+            comando, cwd=cwd, env=ambiente, stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=timeout
+        )
+    except subprocess.TimeoutExpired as e:
+        stderr = e.stderr or b''
+        return None, (time.perf_counter() - inicio) * 1000, stderr.decode('utf-8', 'replace')
+    tempo = (time.perf_counter() - inicio) * 1000
+    return resultado.returncode, tempo, resultado.stderr.decode('utf-8', 'replace')
+
+
+def medir_inicializacao() -> tuple[float, set[str]]:
+    """Tempo (ms) e módulos importados pelo interpretador sem script nenhum."""
+    _, tempo, stderr = _executar(
+        [sys.executable, '-X', 'importtime', '-c', 'pass'], Path.cwd(), _ambiente(), TIMEOUT_PADRAO
+    )
+    return tempo, {modulo for modulo, _, _, _ in ler_importtime(stderr)}
+
+
+def perfilar_script(
+    raiz: Path,
+    relativo: str,
+    inicializacao: set[str],
+    timeout: float = TIMEOUT_PADRAO
+) -> PerfilScript:
+    """
+    Executa um script sob `-X importtime` e monta o perfil.
+    
+    Args:
+        raiz: Diretório da habilidade (diretório de trabalho do script)
+        relativo: Caminho do script relativo à raiz
+        inicializacao: Módulos que o interpretador importa sozinho (descontados)
+        timeout: Tempo limite em segundos
+    
+    Returns:
+        PerfilScript com tempo, imports de topo e imports adiáveis
+    """
+    caminho = raiz / relativo
+    argumentos = argumentos_teste(caminho)
+    codigo, tempo, stderr = _executar(
+        [sys.executable, '-X', 'importtime', str(caminho), *argumentos],
+        raiz, _ambiente(), timeout
+    )
+    
+    # Nível 0: imports feitos pelo próprio script (os aninhados estão no acumulado)
+    imports = [
+        (modulo, proprio, acumulado)
+        for modulo, nivel, proprio, acumulado in ler_importtime(stderr)
+        if nivel == 0 and modulo not in inicializacao
+    ]
+    por_modulo: dict[str, float] = {}
+    for modulo, _, acumulado in imports:
+        por_modulo[modulo] = por_modulo.get(modulo, 0.0) + acumulado
+    
+    adiaveis = []
+    codigo_fonte = caminho.read_text(encoding='utf-8', errors='replace')
+    for linha, modulo in imports_adiaveis(codigo_fonte):
+        custo = sum(ms for nome, ms in por_modulo.items() if nome == modulo or nome.startswith(modulo + '.'))
+        if custo >= LIMIAR_IMPORT_PESADO_MS:
+            adiaveis.append((linha, modulo, round(custo, 1)))
+    
+    erro = None
+    if codigo is None:
+        erro = f"tempo esgotado ({timeout:g} s)"
+    elif 'Traceback (most recent call last)' in stderr:
+        ultima = [l for l in stderr.splitlines() if l.strip() and not l.startswith('import time:')]
+        erro = ultima[-1].strip() if ultima else "exceção não tratada"
+    
+    imports.sort(key=lambda i: -i[2])
+    return PerfilScript(relativo, argumentos, codigo, round(tempo, 1), imports, adiaveis, erro)
+
+
+def perfilar_habilidade(
+    caminho: Path,
+    processos: int | None = None,
+    timeout: float = TIMEOUT_PADRAO,
+    cache: CacheResultados | None = None
+) -> tuple[list[PerfilScript], float]:
+    """
+    Perfis de todos os scripts/*.py da habilidade, em paralelo.
+    
+    Args:
+        caminho: Diretório da habilidade
+        processos: Scripts executados ao mesmo tempo (padrão: número de CPUs)
+        timeout: Tempo limite de cada script em segundos
+        cache: Cache de resultados (opcional)
+    
+    Returns:
+        Tupla (perfis na ordem dos scripts, tempo de inicialização do
+        interpretador em ms, 0 se todos vieram do cache)
+    """
+    documento = carregar_documento(caminho)
+    scripts = [e.relativo for e in documento.inventario.arquivos_em('scripts', extensoes={'.py'})]
+    
+    # Chave: todos os .py de scripts/ (imports entre vizinhos), argumentos e interpretador
+    vizinhos = ''.join(f"{r}\0{hash_arquivo(caminho / r)}\n" for r in scripts)
+    perfis: dict[str, PerfilScript] = {}
+    chaves: dict[str, str] = {}
+    for relativo in scripts:
+        if cache is None:
+            continue
+        argumentos = argumentos_teste(caminho / relativo)
+        chaves[relativo] = cache.chave(
+            f"perfil-v{VERSAO_PERFIL}", sys.executable, sys.version, relativo,
+            '\0'.join(argumentos), vizinhos
+        )
+        dados = cache.obter(chaves[relativo])
+        if dados is not None:
+            perfis[relativo] = PerfilScript.de_dict(dados)
+    
+    pendentes = [r for r in scripts if r not in perfis]
+    tempo_inicializacao = 0.0
+    if pendentes:
+        from concurrent.futures import ThreadPoolExecutor  # só quando há scripts a executar
+        tempo_inicializacao, inicializacao = medir_inicializacao()
+        with ThreadPoolExecutor(max_workers=processos or os.cpu_count() or 1) as executor:
+            # Threads bastam: cada uma só espera o seu subprocesso
+            resultados = executor.map(
+                lambda r: perfilar_script(caminho, r, inicializacao, timeout),
+                pendentes
+            )
+            for perfil in resultados:
+                perfis[perfil.script] = perfil
+                if cache is not None and perfil.codigo_saida is not None:
+                    cache.gravar(chaves[perfil.script], perfil.como_dict())
+    
+    return [perfis[r] for r in scripts], tempo_inicializacao
+
+
+def formatar_perfis(perfis: list[PerfilScript], tempo_inicializacao: float, top: int = TOP_PADRAO) -> str:
+    """Formata tempos por script, imports mais lentos e imports adiáveis."""
+    if not perfis:
+        return "ℹ️  Nenhum script Python em scripts/"
+    
+    linhas = [f"   {'tempo':>9}  {'imports':>9}  {'saída':>5}  script"]
+    for perfil in sorted(perfis, key=lambda p: -p.tempo_ms):
+        saida = '—' if perfil.codigo_saida is None else str(perfil.codigo_saida)
+        origem = " (cache)" if perfil.do_cache else ""
+        linhas.append(
+            f"   {perfil.tempo_ms:>6.1f} ms  {perfil.importacao_ms:>6.1f} ms  {saida:>5}  "
+            f"{perfil.script} {' '.join(perfil.argumentos)}{origem}"
+        )
+        if perfil.erro:
+            linhas.append(f"   {'':>9}  {'':>9}  {'':>5}  ❌ {perfil.erro}")
+    total = sum(p.tempo_ms for p in perfis)
+    linhas.append("")
+    linhas.append(f"   Total: {total:.1f} ms em {len(perfis)} script(s)")
+    if tempo_inicializacao:
+        linhas.append(f"   (inclui ~{tempo_inicializacao:.1f} ms de inicialização do interpretador por script)")
+    
+    lentos = sorted(
+        ((acumulado, proprio, modulo, perfil.script) for perfil in perfis for modulo, proprio, acumulado in perfil.imports),
+        reverse=True
+    )[:top]
+    if lentos:
+        linhas.append("")
+        linhas.append("🐢 Imports mais lentos (acumulado / próprio):")
+        for acumulado, proprio, modulo, script in lentos:
+            linhas.append(f"   {acumulado:>7.1f} ms  {proprio:>7.1f} ms  {modulo}  ({script})")
+    
+    adiaveis = [(perfil.script, *a) for perfil in perfis for a in perfil.adiaveis]
+    if adiaveis:
+        linhas.append("")
+        linhas.append(f"💡 Imports de topo com {LIMIAR_IMPORT_PESADO_MS}+ ms usados só dentro de funções")
+        linhas.append("   (mover o import para dentro da função evita o custo em toda execução):")
+        for script, linha, modulo, custo in sorted(adiaveis, key=lambda a: -a[3]):
+            linhas.append(f"   {script}:{linha}  {modulo}  ({custo:.1f} ms)")
+    return '\n'.join(linhas)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    args = configurar(args)
+    
+    processos = None
+    timeout = TIMEOUT_PADRAO
+    top = TOP_PADRAO
+    usar_cache = True
+    diretorio_cache = None
+    posicionais = []
+    
+    i = 0
+    while i < len(args):
+        if args[i] == '--jobs' and i + 1 < len(args) and args[i + 1].isdigit():
+            processos = int(args[i + 1])
+            i += 2
+        elif args[i] == '--timeout' and i + 1 < len(args) and args[i + 1].isdigit():
+            timeout = int(args[i + 1])
+            i += 2
+        elif args[i] == '--top' and i + 1 < len(args) and args[i + 1].isdigit():
+            top = int(args[i + 1])
+            i += 2
+        elif args[i] == '--no-cache':
+            usar_cache = False
+            i += 1
+        elif args[i] == '--cache-dir' and i + 1 < len(args):
+            diretorio_cache = args[i + 1]
+            i += 2
+        else:
+            posicionais.append(args[i])
+            i += 1
+    
+    if len(posicionais) != 1:
+        print("Forge Profile Scripts — Tempo de inicialização dos scripts de uma habilidade")
+        print()
+        print("Uso: forge_profile_scripts.py <caminho-da-habilidade> [--jobs <n>] [--timeout <s>] [--top <n>]")
+        print("                              [--no-cache] [--cache-dir <dir>]")
+        print()
+        print("Opções:")
+        print("  --jobs <n>          Scripts executados ao mesmo tempo (padrão: número de CPUs)")
+        print(f"  --timeout <s>       Tempo limite de cada script (padrão: {TIMEOUT_PADRAO} s)")
+        print(f"  --top <n>           Imports mais lentos listados (padrão: {TOP_PADRAO})")
+        print("  --no-cache          Executa todos os scripts, mesmo sem alterações")
+        print("  --cache-dir <dir>   Diretório do cache (padrão: $FORGE_CACHE_DIR ou ~/.cache/skill-forge)")
+        print()
+        print("Exemplos:")
+        print("  forge_profile_scripts.py ./minha-habilidade")
+        print("  forge_profile_scripts.py ./minha-habilidade --jobs 1 --timeout 30")
+        return 1
+    
+    caminho = Path(posicionais[0]).resolve()
+    if not (caminho / 'SKILL.md').exists():
+        print(f"❌ SKILL.md não encontrado em {caminho}")
+        return 1
+    
+    cache = CacheResultados.padrao('profile-scripts', diretorio_cache) if usar_cache else None
+    print(f"⏱️  Perfil de inicialização dos scripts: {caminho}")
+    print()
+    with trecho('scripts', 'habilidade', caminho=str(caminho)):
+        perfis, tempo_inicializacao = perfilar_habilidade(caminho, processos, timeout, cache)
+    with trecho('saída', 'saída'):
+        print(formatar_perfis(perfis, tempo_inicializacao, top))
+    return 1 if any(p.erro for p in perfis) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Forge Regras — Registro e motor de execução das regras de validação e análise
+
+Uso (como módulo):
+    from forge_regras import regra, regras_de, MotorRegras, entradas_disponiveis
+
+    class Validador:
+        @regra(entradas=('frontmatter',), depende=('skill_md',))
+        def _validar_frontmatter(self):
+            ...
+
+    motor = MotorRegras(regras_de(Validador), somente={'frontmatter'})
+    motor.executar(validador, entradas_disponiveis(documento))
+    motor.tempos    # {'skill_md': 0.0002, 'frontmatter': 0.0001}
+
+Cada regra declara:
+    - entradas: partes da habilidade que lê (para saber o que reexecutar
+      quando algo muda)
+    - requer: entradas sem as quais a regra é pulada (padrão: entradas)
+    - custo: 'baixo' (só memória), 'medio' (lê arquivos pequenos) ou
+      'alto' (lê arquivos inteiros ou compara conteúdos)
+    - depende: regras que precisam executar antes
+"""
+
+import time
+from functools import cache
+from collections.abc import Callable
+
+from forge_perfil import trecho
+
+
+# Partes da habilidade que uma regra pode declarar como entrada
+ENTRADAS = ('skill_md', 'frontmatter', 'corpo', 'scripts', 'references', 'assets', 'arvore')
+
+CUSTOS = ('baixo', 'medio', 'alto')
+
+
+class Regra:
+    """Regra registrada: método, entradas, custo e dependências."""
+    
+    def __init__(
+        self,
+        metodo: str,
+        entradas: tuple[str, ...],
+        requer: tuple[str, ...],
+        custo: str,
+        depende: tuple[str, ...]
+    ):
+        for entrada in entradas + requer:
+            if entrada not in ENTRADAS:
+                raise ValueError(f"Entrada desconhecida em {metodo}: {entrada}")
+        if custo not in CUSTOS:
+            raise ValueError(f"Custo desconhecido em {metodo}: {custo}")
+        
+        self.metodo = metodo
+        # Nome curto usado em --only/--skip: _validar_frontmatter -> frontmatter
+        self.nome = metodo.lstrip('_').split('_', 1)[-1]
+        self.entradas = entradas
+        self.requer = requer
+        self.custo = custo
+        self.depende = depende
+    
+    def __repr__(self) -> str:
+        return f"Regra({self.nome!r}, custo={self.custo!r})"
+
+
+def regra(
+    entradas: tuple[str, ...] = (),
+    requer: tuple[str, ...] | None = None,
+    custo: str = 'baixo',
+    depende: tuple[str, ...] = ()
+) -> Callable:
+    """
+    Marca um método como regra.
+    
+    Args:
+        entradas: Partes da habilidade que a regra lê
+        requer: Entradas obrigatórias; sem elas a regra é pulada
+            (padrão: todas as entradas)
+        custo: Classe de custo ('baixo', 'medio', 'alto')
+        depende: Nomes curtos das regras que devem executar antes
+    """
+    def marcar(funcao: Callable) -> Callable:
+        funcao._regra = Regra(
+            funcao.__name__,
+            tuple(entradas),
+            tuple(entradas if requer is None else requer),
+            custo,
+            tuple(depende)
+        )
+        return funcao
+    return marcar
+
+
+@cache
+def regras_de(classe: type) -> tuple[Regra, ...]:
+    """Regras de uma classe, na ordem em que foram declaradas."""
+    return tuple(
+        atributo._regra for atributo in vars(classe).values()
+        if hasattr(atributo, '_regra')
+    )
+
+
+def entradas_disponiveis(documento) -> set[str]:
+    """Entradas presentes na habilidade de um DocumentoHabilidade."""
+    disponiveis = {'arvore'}
+    if documento.texto:
+        disponiveis.add('skill_md')
+    if documento.frontmatter:
+        disponiveis.add('frontmatter')
+    if documento.corpo is not None:
+        disponiveis.add('corpo')
+    for diretorio in ('scripts', 'references', 'assets'):
+        if documento.inventario.existe(diretorio):
+            disponiveis.add(diretorio)
+    return disponiveis
+
+
+def nomes_de_regras(texto: str) -> set[str]:
+    """Converte 'a,b,c' (argumento --only/--skip) em conjunto de nomes."""
+    return {nome.strip() for nome in texto.split(',') if nome.strip()}
+
+
+class MotorRegras:
+    """Seleciona, ordena por dependência e executa regras medindo o tempo."""
+    
+    def __init__(
+        self,
+        regras: tuple[Regra, ...],
+        somente: set[str] | None = None,
+        pular: set[str] | None = None
+    ):
+        self.todas = {r.nome: r for r in regras}
+        desconhecidas = ((somente or set()) | (pular or set())) - self.todas.keys()
+        if desconhecidas:
+            raise ValueError(
+                f"Regra(s) desconhecida(s): {', '.join(sorted(desconhecidas))}. "
+                f"Disponíveis: {', '.join(self.todas)}"
+            )
+        
+        self.regras = self._ordenar(self._selecionar(somente, pular))
+        self.tempos: dict[str, float] = {}
+        self.puladas: list[str] = []
+    
+    def _selecionar(self, somente: set[str] | None, pular: set[str] | None) -> set[str]:
+        """Aplica --only (com dependências) e --skip (com dependentes)."""
+        if somente is None:
+            selecionadas = set(self.todas)
+        else:
+            selecionadas = set()
+            pendentes = list(somente)
+            while pendentes:
+                nome = pendentes.pop()
+                if nome not in selecionadas:
+                    selecionadas.add(nome)
+                    pendentes.extend(self.todas[nome].depende)
+        
+        # Uma regra pulada leva junto as que dependem dela
+        removidas = set(pular or ())
+        mudou = True
+        while mudou:
+            mudou = False
+            for nome in selecionadas - removidas:
+                if removidas.intersection(self.todas[nome].depende):
+                    removidas.add(nome)
+                    mudou = True
+        return selecionadas - removidas
+    
+    def _ordenar(self, selecionadas: set[str]) -> list[Regra]:
+        """Ordem topológica estável (empates pela ordem de declaração)."""
+        ordem = []
+        feitas = set()
+        restantes = [r for r in self.todas.values() if r.nome in selecionadas]
+        while restantes:
+            prontas = [
+                r for r in restantes
+                if all(d in feitas or d not in selecionadas for d in r.depende)
+            ]
+            if not prontas:
+                ciclo = ', '.join(r.nome for r in restantes)
+                raise ValueError(f"Dependência circular entre regras: {ciclo}")
+            proxima = prontas[0]
+            ordem.append(proxima)
+            feitas.add(proxima.nome)
+            restantes.remove(proxima)
+        return ordem
+    
+    def executar(
+        self,
+        alvo: object,
+        disponiveis: set[str],
+        ao_concluir: Callable[[Regra], None] | None = None
+    ):
+        """
+        Executa as regras selecionadas sobre o objeto alvo.
+        
+        Args:
+            alvo: Validador ou Analisador cujos métodos são as regras
+            disponiveis: Entradas presentes (ver entradas_disponiveis)
+            ao_concluir: Chamado após cada regra executada (opcional)
+        """
+        self.tempos = {}
+        self.puladas = []
+        for regra in self.regras:
+            if not disponiveis.issuperset(regra.requer):
+                self.puladas.append(regra.nome)
+                continue
+            with trecho(regra.nome, 'regra'):
+                inicio = time.perf_counter()
+                getattr(alvo, regra.metodo)()
+                self.tempos[regra.nome] = time.perf_counter() - inicio
+            if ao_concluir:
+                ao_concluir(regra)
+
+
+def formatar_tempos(tempos: dict[str, float], regras: tuple[Regra, ...]) -> str:
+    """Tabela de tempo por regra, da mais lenta para a mais rápida."""
+    custos = {r.nome: r.custo for r in regras}
+    total = sum(tempos.values())
+    linhas = [f"⏱️  Tempo por regra (total {total * 1000:.2f} ms):"]
+    for nome, segundos in sorted(tempos.items(), key=lambda t: -t[1]):
+        linhas.append(f"   {segundos * 1000:9.3f} ms  {nome:<22} [{custos.get(nome, '?')}]")
+    return '\n'.join(linhas)
@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+Forge Serve — Servidor persistente para editores e bots de CI
+
+Uso:
+    forge_serve.py [--socket <caminho>] [--full-hash]
+    forge_serve.py --call <metodo> <caminho-da-habilidade> [--socket <caminho>]
+
+Exemplos:
+    forge_serve.py
+    forge_serve.py --socket /tmp/forge.sock --full-hash
+    forge_serve.py --call validate ./minha-habilidade
+
+Protocolo:
+    JSON-RPC 2.0 sobre socket Unix, uma mensagem JSON por linha:
+
+    → {"jsonrpc": "2.0", "id": 1, "method": "validate", "params": {"path": "./minha-skill"}}
+    ← {"jsonrpc": "2.0", "id": 1, "result": {"valido": true, "mensagem": "...", ...}}
+
+Métodos:
+    validate    {path, only?, skip?}  Erros, avisos e tempos por regra
+    analyze     {path, only?, skip?}  Relatório do Analisador
+    package     {path}                Simulação do empacotamento (nada é gravado)
+    invalidate  {path?}               Descarta a habilidade (ou todas) da memória
+    status      {}                    Habilidades em memória e requisições atendidas
+
+Funcionamento:
+    - Mantém o documento de cada habilidade em memória entre requisições
+    - A cada requisição, revarre o inventário e compara tamanho e mtime
+      (ou hash do conteúdo, com --full-hash) de cada arquivo; apenas os
+      caminhos alterados são descartados do documento
+    - Respostas com o mesmo conteúdo e os mesmos parâmetros são reaproveitadas
+    - Leitura de disco e execução das regras rodam em threads, de modo
+      que um cliente lento não bloqueia os demais
+"""
+
+import os
+import sys
+import json
+import signal
+import asyncio
+import socket
+from pathlib import Path
+from collections import OrderedDict
+
+from forge_cache import hash_arquivo
+from forge_documento import DocumentoHabilidade
+from forge_inventario import Inventario
+from forge_validate import Validador
+from forge_analyze import Analisador
+from forge_package import arquivos_do_pacote
+from forge_perfil import configurar
+
+
+# Habilidades mantidas em memória (as menos usadas saem primeiro)
+MAX_HABILIDADES = 256
+
+# Tamanho máximo de uma mensagem (uma linha JSON)
+LIMITE_MENSAGEM = 1024 * 1024
+
+# Códigos de erro do JSON-RPC 2.0
+ERRO_JSON = -32700
+ERRO_REQUISICAO = -32600
+ERRO_METODO = -32601
+ERRO_PARAMETROS = -32602
+ERRO_INTERNO = -32603
+
+
+class ErroRPC(Exception):
+    """Erro a ser devolvido ao cliente como objeto 'error' do JSON-RPC."""
+    
+    def __init__(self, codigo: int, mensagem: str):
+        super().__init__(mensagem)
+        self.codigo = codigo
+        self.mensagem = mensagem
+
+
+def socket_padrao() -> Path:
+    """Socket em $XDG_RUNTIME_DIR ou, na falta dele, em /tmp por usuário."""
+    base = os.environ.get('XDG_RUNTIME_DIR')
+    if base:
+        return Path(base) / 'skill-forge.sock'
+    return Path('/tmp') / f'skill-forge-{os.getuid()}.sock'
+
+
+class HabilidadeEmMemoria:
+    """Documento de uma habilidade e respostas já calculadas para ele."""
+    
+    def __init__(self, caminho: Path, hash_completo: bool):
+        self.caminho = caminho
+        self.hash_completo = hash_completo
+        self.documento = DocumentoHabilidade(caminho)
+        # Relativo -> (tamanho, mtime_ns, hash): só com --full-hash
+        self.hashes: dict[str, tuple[int, int, str]] = {}
+        self.estado = self._estado(self.documento.inventario)
+        self.respostas: dict[tuple, dict] = {}
+        self.trava = asyncio.Lock()
+    
+    def _estado(self, inventario: Inventario) -> dict[str, object]:
+        """
+        Assinatura de cada arquivo: (tamanho, mtime) ou hash do conteúdo.
+        
+        Com hash do conteúdo, só os arquivos cujo tamanho ou mtime mudou
+        desde a requisição anterior são lidos de novo.
+        
+        Itens ignorados (fora do inventário) entram só pelo caminho, como em
+        Inventario.digest(): criá-los ou removê-los muda os avisos da validação.
+        """
+        if self.hash_completo:
+            hashes = {}
+            for e in inventario.arquivos:
+                anterior = self.hashes.get(e.relativo)
+                if anterior and anterior[:2] == (e.tamanho, e.mtime_ns):
+                    hashes[e.relativo] = anterior
+                else:
+                    hashes[e.relativo] = (
+                        e.tamanho, e.mtime_ns, hash_arquivo(self.caminho / e.relativo)
+                    )
+            self.hashes = hashes
+            estado = {relativo: h for relativo, (_, _, h) in hashes.items()}
+        else:
+            estado = {e.relativo: (e.tamanho, e.mtime_ns) for e in inventario.arquivos}
+        estado.update(dict.fromkeys(inventario.ignorados, 'ignorado'))
+        return estado
+    
+    def atualizar(self) -> int:
+        """
+        Revarre a habilidade e descarta só o que mudou desde a última requisição.
+        
+        Returns:
+            Número de caminhos alterados
+        """
+        inventario = Inventario(self.caminho)
+        estado = self._estado(inventario)
+        alterados = {
+            relativo for relativo in estado.keys() | self.estado.keys()
+            if estado.get(relativo) != self.estado.get(relativo)
+        }
+        # Diretórios criados ou removidos (inclusive vazios)
+        alterados |= inventario.diretorios ^ self.documento.inventario.diretorios
+        
+        if alterados:
+            self.documento.invalidar(alterados)
+            self.respostas.clear()
+        self.estado = estado
+        return len(alterados)
+    
+    def responder(self, metodo: str, somente: set[str] | None, pular: set[str] | None) -> dict:
+        """Executa o método sobre o documento em memória (em uma thread)."""
+        self.atualizar()
+        chave = (metodo, frozenset(somente or ()), frozenset(pular or ()))
+        if chave not in self.respostas:
+            self.respostas[chave] = METODOS_HABILIDADE[metodo](self, somente, pular)
+        return self.respostas[chave]
+
+
+def _validar(habilidade: HabilidadeEmMemoria, somente, pular) -> dict:
+    validador = Validador(habilidade.caminho, documento=habilidade.documento,
+                          somente=somente, pular=pular)
+    valido, mensagem = validador.validar()
+    return {
+        'valido': valido,
+        'mensagem': mensagem,
+        'erros': validador.erros,
+        'avisos': validador.avisos,
+        'tempos': validador.tempos,
+    }
+
+
+def _analisar(habilidade: HabilidadeEmMemoria, somente, pular) -> dict:
+    analisador = Analisador(habilidade.caminho, documento=habilidade.documento,
+                            somente=somente, pular=pular)
+    relatorio = analisador.analisar()
+    relatorio['tempos'] = analisador.tempos
+    return relatorio
+
+
+def _empacotar(habilidade: HabilidadeEmMemoria, somente, pular) -> dict:
+    # Mesma validação e mesma seleção de arquivos de forge_package, sem gravar
+    validacao = _validar(habilidade, None, None)
+    caminho = habilidade.caminho
+    arquivos = arquivos_do_pacote(habilidade.documento) if validacao['valido'] else []
+    tamanhos = {e.relativo: e.tamanho for e in habilidade.documento.inventario.arquivos}
+    return {
+        'valido': validacao['valido'],
+        'mensagem': validacao['mensagem'],
+        'erros': validacao['erros'],
+        'destino': f"{caminho.name}.skill",
+        'arquivos': [str(a.relative_to(caminho.parent)) for a in arquivos],
+        'bytes': sum(tamanhos[a.relative_to(caminho).as_posix()] for a in arquivos),
+    }
+
+
+# Métodos que operam sobre uma habilidade
+METODOS_HABILIDADE = {
+    'validate': _validar,
+    'analyze': _analisar,
+    'package': _empacotar,
+}
+
+
+def _nomes(valor) -> set[str] | None:
+    """Aceita only/skip como lista ou como texto separado por vírgulas."""
+    if valor is None:
+        return None
+    if isinstance(valor, str):
+        valor = valor.split(',')
+    if not isinstance(valor, list) or not all(isinstance(v, str) for v in valor):
+        raise ErroRPC(ERRO_PARAMETROS, "only/skip devem ser lista de nomes de regras")
+    return {v.strip() for v in valor if v.strip()}
+
+
+def _diretorio(caminho: str) -> tuple[Path, bool]:
+    """Caminho absoluto e se é um diretório."""
+    caminho = Path(caminho).resolve()
+    return caminho, caminho.is_dir()
+
+
+class ServidorForge:
+    """Atende requisições JSON-RPC mantendo as habilidades em memória."""
+    
+    def __init__(self, hash_completo: bool = False):
+        self.hash_completo = hash_completo
+        self.habilidades: OrderedDict[Path, HabilidadeEmMemoria] = OrderedDict()
+        self.atendidas = 0
+    
+    async def _habilidade(self, parametros: dict) -> HabilidadeEmMemoria:
+        """Habilidade em memória para o parâmetro path (carregada na primeira vez)."""
+        caminho = parametros.get('path')
+        if not isinstance(caminho, str):
+            raise ErroRPC(ERRO_PARAMETROS, "Parâmetro 'path' obrigatório")
+        # resolve() e is_dir() vão ao disco: fora do laço de eventos
+        caminho, e_diretorio = await asyncio.to_thread(_diretorio, caminho)
+        if not e_diretorio:
+            raise ErroRPC(ERRO_PARAMETROS, f"Caminho não é um diretório: {caminho}")
+        
+        if caminho in self.habilidades:
+            self.habilidades.move_to_end(caminho)
+            return self.habilidades[caminho]
+        
+        habilidade = await asyncio.to_thread(HabilidadeEmMemoria, caminho, self.hash_completo)
+        # Outra requisição pode ter carregado a mesma habilidade enquanto esta lia o disco
+        habilidade = self.habilidades.setdefault(caminho, habilidade)
+        while len(self.habilidades) > MAX_HABILIDADES:
+            self.habilidades.popitem(last=False)
+        return habilidade
+    
+    async def despachar(self, metodo: str, parametros: dict) -> object:
+        """Executa um método e retorna o valor de 'result'."""
+        if metodo in METODOS_HABILIDADE:
+            somente = _nomes(parametros.get('only'))
+            pular = _nomes(parametros.get('skip'))
+            habilidade = await self._habilidade(parametros)
+            # Uma requisição por habilidade de cada vez; habilidades distintas em paralelo
+            async with habilidade.trava:
+                try:
+                    return await asyncio.to_thread(habilidade.responder, metodo, somente, pular)
+                except ValueError as e:
+                    # Regra desconhecida em only/skip
+                    raise ErroRPC(ERRO_PARAMETROS, str(e))
+        
+        if metodo == 'invalidate':
+            if parametros.get('path') is None:
+                removidas = len(self.habilidades)
+                self.habilidades.clear()
+            else:
+                caminho = Path(str(parametros['path'])).resolve()
+                removidas = int(self.habilidades.pop(caminho, None) is not None)
+            return {'removidas': removidas}
+        
+        if metodo == 'status':
+            return {
+                'habilidades': [str(c) for c in self.habilidades],
+                'atendidas': self.atendidas,
+                'hash_completo': self.hash_completo,
+            }
+        
+        raise ErroRPC(ERRO_METODO, f"Método desconhecido: {metodo}")
+    
+    async def processar(self, linha: bytes) -> dict | None:
+        """Processa uma mensagem; retorna a resposta (None para notificações)."""
+        try:
+            requisicao = json.loads(linha)
+        except ValueError:
+            return _erro(None, ERRO_JSON, "JSON inválido")
+        
+        if not isinstance(requisicao, dict) or not isinstance(requisicao.get('method'), str):
+            return _erro(None, ERRO_REQUISICAO, "Requisição inválida")
+        
+        identificador = requisicao.get('id')
+        parametros = requisicao.get('params') or {}
+        try:
+            if not isinstance(parametros, dict):
+                raise ErroRPC(ERRO_PARAMETROS, "params deve ser um objeto")
+            resultado = await self.despachar(requisicao['method'], parametros)
+            resposta = {'jsonrpc': '2.0', 'id': identificador, 'result': resultado}
+        except ErroRPC as e:
+            resposta = _erro(identificador, e.codigo, e.mensagem)
+        except Exception as e:
+            resposta = _erro(identificador, ERRO_INTERNO, f"{type(e).__name__}: {e}")
+        
+        self.atendidas += 1
+        return resposta if 'id' in requisicao else None
+    
+    async def atender(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        """Atende um cliente: responde às mensagens na ordem em que chegam."""
+        try:
+            while linha := await leitor.readline():
+                if not linha.strip():
+                    continue
+                resposta = await self.processar(linha)
+                if resposta is not None:
+                    escritor.write(json.dumps(resposta, ensure_ascii=False).encode('utf-8') + b'\n')
+                    await escritor.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            escritor.close()
+
+
+def _erro(identificador, codigo: int, mensagem: str) -> dict:
+    return {'jsonrpc': '2.0', 'id': identificador, 'error': {'code': codigo, 'message': mensagem}}
+
+
+def _socket_em_uso(caminho: Path) -> bool:
+    """Verifica se outro servidor já atende no socket."""
+    cliente = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        cliente.connect(str(caminho))
+        return True
+    except OSError:
+        return False
+    finally:
+        cliente.close()
+
+
+async def servir(caminho_socket: Path, hash_completo: bool = False):
+    """
+    Atende requisições no socket até o processo ser interrompido.
+    
+    Args:
+        caminho_socket: Caminho do socket Unix
+        hash_completo: Se True, detecta alterações pelo hash do conteúdo
+    """
+    servidor = ServidorForge(hash_completo)
+    # Socket órfão de uma execução anterior interrompida
+    if caminho_socket.exists():
+        caminho_socket.unlink()
+    
+    # Permissão só para o usuário: o servidor lê qualquer caminho pedido
+    mascara = os.umask(0o177)
+    try:
+        rede = await asyncio.start_unix_server(
+            servidor.atender, path=str(caminho_socket), limit=LIMITE_MENSAGEM
+        )
+    finally:
+        os.umask(mascara)
+    
+    # Ctrl+C ou SIGTERM (systemd, CI) encerram o servidor normalmente
+    laco = asyncio.get_running_loop()
+    tarefa = asyncio.current_task()
+    for sinal in (signal.SIGINT, signal.SIGTERM):
+        laco.add_signal_handler(sinal, tarefa.cancel)
+    
+    print(f"🔌 Forge serve em {caminho_socket}", flush=True)
+    print("   Ctrl+C para encerrar\n", flush=True)
+    async with rede:
+        try:
+            await rede.serve_forever()
+        except asyncio.CancelledError:
+            pass
+
+
+def chamar(metodo: str, parametros: dict | None = None, caminho_socket: Path | None = None) -> dict:
+    """
+    Envia uma requisição ao servidor e aguarda a resposta.
+    
+    Args:
+        metodo: Nome do método (validate, analyze, package, ...)
+        parametros: Objeto params da requisição
+        caminho_socket: Socket do servidor (padrão: socket_padrao())
+    
+    Returns:
+        Resposta JSON-RPC completa (com 'result' ou 'error')
+    """
+    requisicao = {'jsonrpc': '2.0', 'id': 1, 'method': metodo, 'params': parametros or {}}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as cliente:
+        cliente.connect(str(caminho_socket or socket_padrao()))
+        cliente.sendall(json.dumps(requisicao).encode('utf-8') + b'\n')
+        with cliente.makefile('rb') as leitor:
+            return json.loads(leitor.readline())
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    args = configurar(args)
+    
+    caminho_socket = socket_padrao()
+    hash_completo = False
+    chamada = None
+    
+    i = 0
+    while i < len(args):
+        if args[i] == '--socket' and i + 1 < len(args):
+            caminho_socket = Path(args[i + 1])
+            i += 2
+        elif args[i] == '--full-hash':
+            hash_completo = True
+            i += 1
+        elif args[i] == '--call' and i + 2 < len(args):
+            chamada = (args[i + 1], args[i + 2])
+            i += 3
+        elif args[i] in ('--help', '-h'):
+            print(__doc__)
+            return 0
+        else:
+            print(f"❌ Argumento desconhecido: {args[i]}")
+            print("Uso: forge_serve.py [--socket <caminho>] [--full-hash]")
+            print("     forge_serve.py --call <metodo> <caminho> [--socket <caminho>]")
+            return 1
+    
+    if chamada is not None:
+        metodo, caminho = chamada
+        try:
+            resposta = chamar(metodo, {'path': str(Path(caminho).resolve())}, caminho_socket)
+        except OSError as e:
+            print(f"❌ Servidor indisponível em {caminho_socket}: {e}")
+            return 1
+        print(json.dumps(resposta, indent=2, ensure_ascii=False))
+        if 'error' in resposta:
+            return 1
+        return 0 if resposta['result'].get('valido', True) else 1
+    
+    if _socket_em_uso(caminho_socket):
+        print(f"❌ Já existe um servidor em {caminho_socket}")
+        return 1
+    
+    try:
+        asyncio.run(servir(caminho_socket, hash_completo))
+    finally:
+        if not _socket_em_uso(caminho_socket):
+            caminho_socket.unlink(missing_ok=True)
+    print("\n👋 Servidor encerrado")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Forge Similaridade — Detecção de trechos quase duplicados entre arquivos
+
+Uso (como módulo):
+    from forge_similaridade import impressao_digital, comparar
+
+    a = impressao_digital(Path('SKILL.md'))
+    b = impressao_digital(Path('references/guia.md'))
+    par = comparar('SKILL.md', a, 'references/guia.md', b)
+    par.jaccard      # similaridade estimada pela assinatura MinHash
+    par.contencao    # fração do menor arquivo que aparece no outro
+    par.trechos      # [Trecho(linhas em a, linhas em b), ...]
+
+Cada arquivo é lido uma única vez, em blocos, e reduzido a shingles de
+palavras (sequências de TAMANHO_SHINGLE palavras em minúsculas, sem
+pontuação, de modo que quebras de linha e formatação não importam).
+
+Só viram shingle as posições iniciadas por uma palavra-âncora (cujo
+crc32 é múltiplo de AMOSTRAGEM). Como a escolha depende só do conteúdo,
+o mesmo texto gera as mesmas âncoras em qualquer arquivo, e o custo de
+montar e calcular o hash de cada shingle cai para 1/AMOSTRAGEM das
+posições. De cada arquivo guardam-se:
+
+    - a assinatura MinHash de uma permutação (os TAMANHO_ASSINATURA
+      menores hashes de shingles), que estima a similaridade de Jaccard
+    - as âncoras (hash do shingle -> linha), cuja interseção dá a
+      contenção e a localização dos trechos repetidos
+
+O arquivo nunca fica inteiro na memória, mas as âncoras sim: uma
+impressão ocupa memória proporcional ao número de palavras distintas
+do arquivo dividido por AMOSTRAGEM (a assinatura tem tamanho fixo). O
+texto é tratado como bytes (sem decodificar): apenas letras ASCII
+passam para minúsculas.
+"""
+
+import heapq
+import string
+from random import Random
+from zlib import crc32
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from itertools import accumulate, chain, combinations, compress, repeat
+from collections import defaultdict, deque
+
+from forge_leitura import blocos
+
+
+# Palavras por shingle
+TAMANHO_SHINGLE = 5
+
+# Hashes guardados na assinatura MinHash
+TAMANHO_ASSINATURA = 128
+
+# Uma em cada AMOSTRAGEM palavras distintas (escolhidas pelo hash) é âncora
+AMOSTRAGEM = 16
+
+# Distância máxima, em linhas, entre âncoras de um mesmo trecho
+LACUNA_TRECHO = 3
+
+# Âncoras necessárias para considerar um trecho repetido (~50 palavras)
+MIN_ANCORAS_TRECHO = 3
+
+# Primo de Mersenne 2^61 - 1: módulo das funções de hash da assinatura
+PRIMO_MINHASH = (1 << 61) - 1
+
+# Sementes (a, b) das funções de hash da assinatura MinHash completa
+# (índice LSH entre habilidades): h(x) = (a·x + b) mod PRIMO_MINHASH. Só
+# aritmética inteira, sem o hash() do Python, que pode mudar entre
+# versões: assinaturas gravadas em disco continuam comparáveis
+_GERADOR = Random(20240611)
+SEMENTES_MINHASH = [
+    (_GERADOR.randrange(1, PRIMO_MINHASH), _GERADOR.randrange(PRIMO_MINHASH))
+    for _ in range(64)
+]
+
+# Pontuação ASCII vira espaço: '**termo**' e 'termo' são a mesma palavra
+_PONTUACAO = string.punctuation.encode()
+TABELA_PONTUACAO = bytes.maketrans(_PONTUACAO, b' ' * len(_PONTUACAO))
+
+
+class Impressao:
+    """Resumo de um arquivo para comparação: assinatura MinHash e âncoras."""
+    
+    def __init__(self, assinatura: list[int], palavras: int, ancoras: dict[int, int]):
+        self.assinatura = assinatura
+        self.palavras = palavras
+        self.ancoras = ancoras
+    
+    def __repr__(self) -> str:
+        return f"Impressao({self.palavras} palavras, {len(self.ancoras)} âncoras)"
+
+
+class Trecho:
+    """Trecho repetido: intervalo de linhas (1-based, inclusivo) em cada arquivo."""
+    
+    def __init__(self, linhas_a: tuple[int, int], linhas_b: tuple[int, int], ancoras: int):
+        self.linhas_a = linhas_a
+        self.linhas_b = linhas_b
+        self.ancoras = ancoras
+    
+    def __repr__(self) -> str:
+        return f"Trecho({self.linhas_a} ↔ {self.linhas_b}, {self.ancoras} âncoras)"
+
+
+class Par:
+    """Resultado da comparação de dois arquivos."""
+    
+    def __init__(self, a: str, b: str, jaccard: float, contencao: float, trechos: list[Trecho]):
+        self.a = a
+        self.b = b
+        self.jaccard = jaccard
+        self.contencao = contencao
+        self.trechos = trechos
+    
+    def como_dict(self) -> dict:
+        return {
+            'a': self.a,
+            'b': self.b,
+            'jaccard': round(self.jaccard, 3),
+            'contencao': round(self.contencao, 3),
+            'trechos': [
+                {'linhas_a': list(t.linhas_a), 'linhas_b': list(t.linhas_b)}
+                for t in self.trechos
+            ],
+        }
+
+
+def palavras(dados: bytes) -> list[bytes]:
+    """Palavras de um texto em bytes: minúsculas ASCII, sem pontuação."""
+    return dados.lower().translate(TABELA_PONTUACAO).split()
+
+
+def hashes_shingles(lista: list[bytes]) -> set[int]:
+    """Hashes (crc32) de todos os shingles de uma sequência de palavras."""
+    deslocadas = [lista[i:] for i in range(TAMANHO_SHINGLE)]
+    return set(map(crc32, map(b' '.join, zip(*deslocadas))))
+
+
+def assinatura_minhash(hashes: set[int]) -> list[int]:
+    """
+    Assinatura MinHash com len(SEMENTES_MINHASH) funções de hash.
+    
+    Ao contrário da assinatura de uma permutação de Impressao, pode ser
+    dividida em bandas para busca LSH. Custo proporcional a
+    len(hashes) × len(SEMENTES_MINHASH): usar em seções, não em arquivos inteiros.
+    
+    Args:
+        hashes: Hashes dos shingles (não vazio)
+    
+    Returns:
+        Mínimo de cada função de hash
+    """
+    # (a·x + b) mod p com map sobre métodos de int: o laço por hash fica em C
+    return [
+        min(map(PRIMO_MINHASH.__rmod__, map(b.__add__, map(a.__mul__, hashes))))
+        for a, b in SEMENTES_MINHASH
+    ]
+
+
+def similaridade_assinaturas(a: list[int], b: list[int]) -> float:
+    """Jaccard estimado: fração de permutações com o mesmo mínimo."""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+class _Vocabulario(dict):
+    """Palavra -> se é palavra-âncora (crc32 múltiplo de AMOSTRAGEM), calculado uma vez."""
+    
+    def __missing__(self, palavra: bytes) -> bool:
+        valor = self[palavra] = crc32(palavra) % AMOSTRAGEM == 0
+        return valor
+
+
+def impressao_digital(caminho: Path) -> Impressao:
+    """
+    Calcula a impressão de um arquivo de texto em uma única passada.
+    
+    Args:
+        caminho: Arquivo a ler (em blocos, sem carregá-lo inteiro)
+    
+    Returns:
+        Impressao com assinatura MinHash e âncoras
+    """
+    vocabulario = _Vocabulario()
+    hashes: set[int] = set()
+    ancoras: dict[int, int] = {}
+    total = 0
+    
+    # Últimas palavras do bloco anterior (e suas linhas): shingles que cruzam a fronteira
+    pendentes: list[bytes] = []
+    linhas_pendentes: list[int] = []
+    linha_inicial = 1
+    resto = b''
+    
+    def processar(dados: bytes):
+        nonlocal pendentes, linhas_pendentes, linha_inicial, hashes, total
+        # Tudo em bytes: sem decodificar, pontuação ASCII vira espaço
+        linhas = dados.lower().translate(TABELA_PONTUACAO).split(b'\n')
+        por_linha = list(map(bytes.split, linhas))
+        palavras = pendentes + list(chain.from_iterable(por_linha))
+        acumulado = list(accumulate(map(len, por_linha), initial=len(pendentes)))
+        total += len(palavras) - len(pendentes)
+        
+        # Shingles iniciados por uma palavra-âncora; cada etapa é um map
+        # executado em C, sem laço Python por palavra ou por shingle
+        ultimo = max(len(palavras) - TAMANHO_SHINGLE + 1, 0)
+        indices = list(compress(range(ultimo), map(vocabulario.__getitem__, palavras)))
+        fatias = map(slice, indices, [i + TAMANHO_SHINGLE for i in indices])
+        novos = list(map(crc32, map(b' '.join, map(palavras.__getitem__, fatias))))
+        # Linha de cada âncora (as vindas do bloco anterior já têm a sua)
+        herdadas = bisect_left(indices, len(pendentes))
+        linhas_novos = [linhas_pendentes[i] for i in indices[:herdadas]]
+        linhas_novos += map(
+            (linha_inicial - 1).__add__,
+            map(bisect_right, repeat(acumulado), indices[herdadas:])
+        )
+        hashes.update(novos)
+        # setdefault: cada âncora guarda a linha da primeira ocorrência
+        deque(map(ancoras.setdefault, novos, linhas_novos), maxlen=0)
+        
+        # Manter só os menores hashes (assinatura) para a memória não crescer
+        if len(hashes) > 8 * TAMANHO_ASSINATURA:
+            hashes = set(heapq.nsmallest(TAMANHO_ASSINATURA, hashes))
+        
+        linhas_pendentes = [
+            linhas_pendentes[i] if i < len(pendentes)
+            else linha_inicial + bisect_right(acumulado, i) - 1
+            for i in range(ultimo, len(palavras))
+        ]
+        pendentes = palavras[ultimo:]
+        linha_inicial += len(linhas) - 1
+    
+    for bloco in blocos(caminho):
+        dados = resto + bloco
+        # Cortar na última quebra de linha: palavras nunca ficam partidas
+        quebra = dados.rfind(b'\n')
+        if quebra < 0:
+            resto = dados
+            continue
+        resto = dados[quebra + 1:]
+        processar(dados[:quebra + 1])
+    processar(resto)
+    
+    return Impressao(heapq.nsmallest(TAMANHO_ASSINATURA, hashes), total, ancoras)
+
+
+def estimar_jaccard(a: Impressao, b: Impressao) -> float:
+    """Similaridade de Jaccard estimada pelas assinaturas MinHash (bottom-k)."""
+    uniao = heapq.nsmallest(TAMANHO_ASSINATURA, set(a.assinatura).union(b.assinatura))
+    if not uniao:
+        return 0.0
+    em_a, em_b = set(a.assinatura), set(b.assinatura)
+    return sum(1 for h in uniao if h in em_a and h in em_b) / len(uniao)
+
+
+def _trechos(linhas: list[tuple[int, int]]) -> list[Trecho]:
+    """Agrupa pares (linha em a, linha em b) de âncoras próximas em trechos."""
+    trechos = []
+    grupo: list[tuple[int, int]] = []
+    
+    def fechar():
+        if len(grupo) >= MIN_ANCORAS_TRECHO:
+            linhas_a = [a for a, _ in grupo]
+            linhas_b = [b for _, b in grupo]
+            trechos.append(Trecho(
+                (min(linhas_a), max(linhas_a)), (min(linhas_b), max(linhas_b)), len(grupo)
+            ))
+    
+    for linha_a, linha_b in sorted(linhas):
+        if grupo:
+            anterior_a, anterior_b = grupo[-1]
+            if linha_a - anterior_a > LACUNA_TRECHO or abs(linha_b - anterior_b) > LACUNA_TRECHO:
+                fechar()
+                grupo = []
+        grupo.append((linha_a, linha_b))
+    fechar()
+    return trechos
+
+
+def comparar(nome_a: str, a: Impressao, nome_b: str, b: Impressao) -> Par:
+    """
+    Compara dois arquivos pelas impressões.
+    
+    Args:
+        nome_a, nome_b: Identificação dos arquivos no resultado
+        a, b: Impressões calculadas por impressao_digital
+    
+    Returns:
+        Par com Jaccard estimado, contenção e trechos repetidos
+    """
+    comuns = a.ancoras.keys() & b.ancoras.keys()
+    return _par(nome_a, a, nome_b, b, [(a.ancoras[h], b.ancoras[h]) for h in comuns])
+
+
+def _par(nome_a: str, a: Impressao, nome_b: str, b: Impressao, linhas: list[tuple[int, int]]) -> Par:
+    menor = min(len(a.ancoras), len(b.ancoras))
+    contencao = len(linhas) / menor if menor else 0.0
+    return Par(nome_a, nome_b, estimar_jaccard(a, b), contencao, _trechos(linhas))
+
+
+def comparar_todos(impressoes: dict[str, Impressao]) -> list[Par]:
+    """
+    Compara todos os pares de arquivos que têm âncoras em comum.
+    
+    Usa um índice invertido de âncoras: o custo cresce com o número de
+    âncoras compartilhadas, não com o número de pares de arquivos.
+    
+    Args:
+        impressoes: Impressão de cada arquivo, por nome
+    
+    Returns:
+        Pares com ao menos um trecho repetido, do mais ao menos contido
+    """
+    arquivos_por_ancora: dict[int, list[str]] = defaultdict(list)
+    for nome, impressao in impressoes.items():
+        for h in impressao.ancoras:
+            arquivos_por_ancora[h].append(nome)
+    
+    linhas_por_par: dict[tuple[str, str], list[tuple[int, int]]] = defaultdict(list)
+    for h, nomes in arquivos_por_ancora.items():
+        for nome_a, nome_b in combinations(nomes, 2):
+            linhas_por_par[nome_a, nome_b].append(
+                (impressoes[nome_a].ancoras[h], impressoes[nome_b].ancoras[h])
+            )
+    
+    pares = []
+    for (nome_a, nome_b), linhas in linhas_por_par.items():
+        if len(linhas) < MIN_ANCORAS_TRECHO:
+            continue
+        par = _par(nome_a, impressoes[nome_a], nome_b, impressoes[nome_b], linhas)
+        if par.trechos:
+            pares.append(par)
+    pares.sort(key=lambda p: (-p.contencao, p.a, p.b))
+    return pares
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Forge Tokens — Perfil de custo de contexto (tokens) de uma habilidade
+
+Uso:
+    forge_tokens.py <caminho-da-habilidade> [--top <n>] [--cache] [--cache-dir <dir>]
+
+Exemplos:
+    forge_tokens.py ./minha-habilidade
+    forge_tokens.py ./minha-habilidade --top 10 --cache
+
+Mede:
+    - Tokens por arquivo (SKILL.md e references/)
+    - Tokens por seção ## do SKILL.md, por bloco de código e por campo
+      do frontmatter
+    - Custo por momento: sempre carregado (name + description), ao ativar
+      (SKILL.md inteiro) e pior caso (SKILL.md + todas as references)
+
+Os tokens são estimados offline, sem vocabulário: o texto é dividido
+como um tokenizador BPE faria antes das fusões (palavras com o espaço
+anterior, números de até 3 dígitos, pontuação, espaços) e palavras
+longas contam um token a cada CARACTERES_POR_TOKEN letras ASCII ou
+LETRAS_NAO_ASCII_POR_TOKEN letras acentuadas. Cada correspondência da
+expressão regular vale um token, então a contagem é uma única passada
+em C. É uma aproximação para comparar partes da habilidade entre si,
+não a contagem exata de um modelo específico.
+
+A contagem de cada arquivo é guardada pelo hash do conteúdo (em memória
+e, com --cache, em disco), então arquivos inalterados não são recontados.
+"""
+
+import re
+import sys
+import codecs
+from pathlib import Path
+
+from forge_cache import CacheResultados, hash_arquivo
+from forge_documento import DocumentoHabilidade, carregar_documento
+from forge_leitura import blocos
+from forge_perfil import configurar, trecho
+
+
+# Versão da estimativa: incrementar ao mudar PADRAO_TOKEN (invalida o cache)
+VERSAO_TOKENIZADOR = 1
+
+# Letras por token em palavras longas (ASCII e acentuadas)
+CARACTERES_POR_TOKEN = 6
+LETRAS_NAO_ASCII_POR_TOKEN = 2
+
+# Cada correspondência é um token estimado
+PADRAO_TOKEN = re.compile(
+    rf"'(?:s|t|re|ve|m|ll|d)"                           # contrações do inglês
+    rf"| ?[a-zA-Z]{{1,{CARACTERES_POR_TOKEN}}}"          # palavra ASCII (em pedaços)
+    rf"|[^\W\da-zA-Z_]{{1,{LETRAS_NAO_ASCII_POR_TOKEN}}}"  # letras acentuadas/outras escritas
+    r"|\d{1,3}"                                         # números em grupos de 3
+    r"| ?(?:[^\w\s]|_){1,2}"                            # pontuação (pares como ** e ``)
+    r"|\s*\n|[ \t]+"                                    # quebras de linha e recuos
+)
+
+# Itens de cada tipo na tabela de custo
+TIPOS = ('arquivo', 'seção', 'código', 'frontmatter')
+
+# Arquivos com byte nulo no início são binários (PDF, imagens): não são texto carregado
+AMOSTRA_BINARIO = 8192
+
+# Contagens já feitas neste processo, por hash do conteúdo
+_CONTAGENS: dict[str, int] = {}
+
+
+def estimar_tokens(texto: str) -> int:
+    """Estimativa de tokens de um texto."""
+    # subn só conta as substituições, sem criar uma lista com cada token
+    return PADRAO_TOKEN.subn('', texto)[1]
+
+
+def _contar_arquivo(caminho: Path) -> int:
+    """Conta tokens lendo o arquivo em blocos (memória não cresce com o tamanho)."""
+    decodificador = codecs.getincrementaldecoder('utf-8')('replace')
+    total = 0
+    resto = ''
+    for bloco in blocos(caminho):
+        texto = resto + decodificador.decode(bloco)
+        # Cortar após a última quebra de linha (ou no último espaço):
+        # nenhum token fica partido entre blocos
+        corte = texto.rfind('\n') + 1 or texto.rfind(' ')
+        if corte <= 0:
+            resto = texto
+            continue
+        total += estimar_tokens(texto[:corte])
+        resto = texto[corte:]
+    return total + estimar_tokens(resto + decodificador.decode(b'', final=True))
+
+
+def eh_binario(caminho: Path) -> bool:
+    """Verifica se o arquivo parece binário (byte nulo no início)."""
+    with open(caminho, 'rb') as f:
+        return b'\0' in f.read(AMOSTRA_BINARIO)
+
+
+class ContadorTokens:
+    """Conta tokens de arquivos, reaproveitando contagens pelo hash do conteúdo."""
+    
+    def __init__(self, cache: CacheResultados | None = None):
+        self.cache = cache
+    
+    def tokens_arquivo(self, caminho: Path) -> int:
+        """
+        Tokens estimados de um arquivo de texto.
+        
+        Args:
+            caminho: Arquivo a contar
+        
+        Returns:
+            Número estimado de tokens (0 para binários)
+        """
+        conteudo = hash_arquivo(caminho)
+        if conteudo in _CONTAGENS:
+            return _CONTAGENS[conteudo]
+        
+        chave = None
+        if self.cache is not None:
+            chave = CacheResultados.chave('tokens', str(VERSAO_TOKENIZADOR), conteudo)
+            em_cache = self.cache.obter(chave)
+            if em_cache is not None:
+                _CONTAGENS[conteudo] = em_cache['tokens']
+                return em_cache['tokens']
+        
+        tokens = 0 if eh_binario(caminho) else _contar_arquivo(caminho)
+        _CONTAGENS[conteudo] = tokens
+        if chave is not None:
+            self.cache.gravar(chave, {'tokens': tokens})
+        return tokens
+
+
+def _campos_frontmatter(texto: str) -> list[tuple[str, str]]:
+    """Texto YAML de cada campo de primeiro nível do frontmatter, em ordem."""
+    campos: list[tuple[str, list[str]]] = []
+    for linha in texto.split('\n'):
+        match = re.match(r'([A-Za-z_][\w-]*):', linha)
+        if match:
+            campos.append((match.group(1), [linha]))
+        elif campos:
+            campos[-1][1].append(linha)
+    return [(nome, '\n'.join(linhas)) for nome, linhas in campos]
+
+
+def perfil_tokens(documento: DocumentoHabilidade, contador: ContadorTokens | None = None) -> dict:
+    """
+    Perfil de custo de contexto de uma habilidade.
+    
+    Args:
+        documento: Habilidade lida (forge_documento)
+        contador: Contador com cache (opcional)
+    
+    Returns:
+        Dicionário com 'itens' [(tipo, local, tokens)] do mais caro para o
+        mais barato e os totais 'sempre', 'ao_ativar' e 'pior_caso'
+    """
+    contador = contador or ContadorTokens()
+    texto = documento.texto or ''
+    itens: list[tuple[str, str, int]] = []
+    
+    skill_md = estimar_tokens(texto)
+    itens.append(('arquivo', 'SKILL.md', skill_md))
+    
+    references = 0
+    for entrada in documento.inventario.arquivos_em('references', recursivo=True):
+        tokens = contador.tokens_arquivo(documento.caminho / entrada.relativo)
+        references += tokens
+        itens.append(('arquivo', entrada.relativo, tokens))
+    
+    # Seções ## e blocos de código da estrutura já interpretada (forge_markdown)
+    estrutura = documento.estrutura
+    for secao in estrutura.secoes:
+        if secao.nivel == 2:
+            tokens = estimar_tokens(texto[secao.inicio:secao.fim])
+            itens.append(('seção', f"SKILL.md:{secao.linha} ## {secao.titulo}", tokens))
+    for bloco in estrutura.blocos:
+        itens.append(('código', f"SKILL.md:{bloco.linha} {bloco.linguagem or 'texto'}", estimar_tokens(bloco.codigo)))
+    
+    # Só name e description ficam sempre no contexto (para decidir a ativação)
+    sempre = 0
+    for nome, conteudo in _campos_frontmatter(documento.frontmatter_texto or ''):
+        tokens = estimar_tokens(conteudo)
+        itens.append(('frontmatter', nome, tokens))
+        if nome in ('name', 'description'):
+            sempre += tokens
+    
+    itens.sort(key=lambda item: (-item[2], TIPOS.index(item[0]), item[1]))
+    return {
+        'itens': itens,
+        'sempre': sempre,
+        'ao_ativar': skill_md,
+        'pior_caso': skill_md + references,
+    }
+
+
+def formatar_perfil(perfil: dict, top: int | None = None) -> str:
+    """Formata a tabela de custo de contexto, da parte mais cara para a mais barata."""
+    linhas = ["💰 Custo de contexto (tokens estimados):"]
+    linhas.append(f"   Sempre carregado (name + description): {perfil['sempre']:>8}")
+    linhas.append(f"   Ao ativar (SKILL.md):                  {perfil['ao_ativar']:>8}")
+    linhas.append(f"   Pior caso (SKILL.md + references):     {perfil['pior_caso']:>8}")
+    linhas.append("")
+    
+    itens = perfil['itens'][:top] if top else perfil['itens']
+    pior = perfil['pior_caso'] or 1
+    linhas.append(f"   {'tokens':>8}  {'% pior':>6}  {'tipo':<11} local")
+    for tipo, local, tokens in itens:
+        linhas.append(f"   {tokens:>8}  {tokens / pior:>6.1%}  {tipo:<11} {local}")
+    if top and len(perfil['itens']) > top:
+        linhas.append(f"   ... e mais {len(perfil['itens']) - top} item(ns)")
+    return '\n'.join(linhas)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    args = configurar(args)
+    
+    top = None
+    usar_cache = False
+    diretorio_cache = None
+    posicionais = []
+    
+    i = 0
+    while i < len(args):
+        if args[i] == '--top' and i + 1 < len(args) and args[i + 1].isdigit():
+            top = int(args[i + 1])
+            i += 2
+        elif args[i] == '--cache':
+            usar_cache = True
+            i += 1
+        elif args[i] == '--cache-dir' and i + 1 < len(args):
+            usar_cache = True
+            diretorio_cache = args[i + 1]
+            i += 2
+        else:
+            posicionais.append(args[i])
+            i += 1
+    
+    if len(posicionais) != 1:
+        print("Forge Tokens — Perfil de custo de contexto de uma habilidade")
+        print()
+        print("Uso: forge_tokens.py <caminho-da-habilidade> [--top <n>] [--cache] [--cache-dir <dir>]")
+        print()
+        print("Exemplos:")
+        print("  forge_tokens.py ./minha-habilidade")
+        print("  forge_tokens.py ./minha-habilidade --top 10 --cache")
+        return 1
+    
+    caminho = Path(posicionais[0]).resolve()
+    documento = carregar_documento(caminho)
+    if documento.texto is None:
+        print(f"❌ SKILL.md não encontrado em {caminho}")
+        return 1
+    
+    cache = CacheResultados.padrao('tokens', diretorio_cache) if usar_cache else None
+    print(f"🔍 Perfil de tokens: {caminho}")
+    print()
+    perfil = perfil_tokens(documento, ContadorTokens(cache))
+    with trecho('saída', 'saída'):
+        print(formatar_perfil(perfil, top))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,11 +3,20 @@
 Forge Validate — Valida estrutura e conteúdo de uma habilidade
 
 Uso:
-    forge_validate.py <caminho-da-habilidade> [--verbose]
+    forge_validate.py <caminho-da-habilidade> [--verbose] [--cache]
+    forge_validate.py --library <diretorio-raiz> [--jobs <n>] [--verbose] [--cache]
+    forge_validate.py <caminho> [--only <regras>] [--skip <regras>] [--timings] [--budget <ms>]
+    forge_validate.py [<diretorio>] --changed-since <ref> | --staged [--jobs <n>] [--cache]
 
 Exemplos:
     forge_validate.py ./minha-habilidade
     forge_validate.py ./minha-habilidade --verbose
+    forge_validate.py --library ./skills --jobs 8
+    forge_validate.py --library ./skills --cache-dir /tmp/forge-cache --full-hash
+    forge_validate.py ./minha-habilidade --only frontmatter,descricao
+    forge_validate.py ./minha-habilidade --skip references --timings --budget 50
+    forge_validate.py ./skills --changed-since origin/main
+    forge_validate.py --staged
 
 Verifica:
     - Estrutura de arquivos
@@ -15,21 +24,53 @@ Verifica:
     - Qualidade da descrição
     - Referências a recursos
     - Ausência de arquivos desnecessários
+
+Com --changed-since ou --staged, valida só as habilidades alteradas desde
+a revisão (em HEAD) ou preparadas para commit (no índice), lendo o
+conteúdo direto do git (forge_git), sem tocar na árvore de trabalho.
 """
 
+import os
 import sys
 import re
-import yaml
+from functools import partial
 from pathlib import Path
-from typing import Callable
+from collections.abc import Iterator
+
+from forge_cache import CacheResultados
+from forge_documento import DocumentoHabilidade, carregar_documento
+from forge_regras import (
+    MotorRegras, entradas_disponiveis, formatar_tempos, nomes_de_regras, regra, regras_de
+)
+from forge_perfil import configurar, trecho
+
+
+# Versão do conjunto de regras: incrementar ao alterar qualquer validação
+# para invalidar resultados guardados em cache
+VERSAO_REGRAS = 1
+
+# Diretórios que nunca contêm habilidades na busca por biblioteca
+DIRETORIOS_IGNORADOS_BUSCA = {'.git', 'node_modules', '__pycache__', '.venv', 'venv'}
 
 
 class Validador:
     """Validador de habilidades com coleta de erros e avisos."""
     
-    def __init__(self, caminho: Path, verbose: bool = False):
+    def __init__(
+        self,
+        caminho: Path,
+        verbose: bool = False,
+        cache: CacheResultados | None = None,
+        documento: DocumentoHabilidade | None = None,
+        somente: set[str] | None = None,
+        pular: set[str] | None = None
+    ):
         self.caminho = caminho
         self.verbose = verbose
+        self.cache = cache
+        self.documento = documento or carregar_documento(caminho)
+        self.motor = MotorRegras(regras_de(Validador), somente, pular)
+        self.tempos: dict[str, float] = {}
         self.erros: list[str] = []
         self.avisos: list[str] = []
         self.frontmatter: dict = {}
@@ -62,18 +103,45 @@ class Validador:
         if not self.caminho.is_dir():
             return False, f"Caminho não é um diretório: {self.caminho}"
         
-        # Executar validações
-        self._validar_estrutura()
-        self._validar_skill_md()
-        self._validar_frontmatter()
-        self._validar_descricao()
-        self._validar_corpo()
-        self._validar_scripts()
-        self._validar_references()
-        self._validar_assets()
-        self._validar_arquivos_indesejados()
-        
-        # Resultado
+        # Reaproveitar resultado se conteúdo e inventário não mudaram
+        chave = None
+        if self.cache is not None:
+            chave = self._chave_cache()
+            em_cache = self.cache.obter(chave)
+            if em_cache is not None:
+                return self._restaurar(em_cache)
+        
+        # Executar validações (ordem por dependência, puladas sem entradas)
+        self.motor.executar(self, entradas_disponiveis(self.documento))
+        self.tempos = self.motor.tempos
+        
+        if chave is not None:
+            self.cache.gravar(chave, {'erros': self.erros, 'avisos': self.avisos})
+        
+        return self.resultado()
+    
+    def _chave_cache(self) -> str:
+        """Chave do cache: versão das regras, nome, SKILL.md e inventário."""
+        return CacheResultados.chave(
+            str(VERSAO_REGRAS),
+            ','.join(r.nome for r in self.motor.regras),
+            self.caminho.name,
+            self.documento.texto or '',
+            self.documento.inventario.digest(self.cache.hash_completo)
+        )
+    
+    def _restaurar(self, em_cache: dict) -> tuple[bool, str]:
+        """Restaura erros e avisos de uma validação anterior guardada em cache."""
+        if self.verbose:
+            print("♻️  Resultado em cache (conteúdo inalterado)")
+        for mensagem in em_cache['erros']:
+            self.erro(mensagem)
+        for mensagem in em_cache['avisos']:
+            self.aviso(mensagem)
+        return self.resultado()
+    
+    def resultado(self) -> tuple[bool, str]:
+        """Resume erros e avisos coletados em (válido, mensagem)."""
         if self.erros:
             mensagem = f"{len(self.erros)} erro(s) encontrado(s)"
             if self.avisos:
@@ -84,54 +152,50 @@ class Validador:
         else:
             return True, "Habilidade válida!"
     
+    @regra(entradas=('skill_md',), requer=())
     def _validar_estrutura(self):
         """Valida estrutura básica de arquivos."""
         if self.verbose:
             print("📁 Validando estrutura...")
         
-        skill_md = self.caminho / 'SKILL.md'
-        if not skill_md.exists():
+        self.skill_md_content = self.documento.texto or ""
+        if self.documento.texto is None:
             self.erro("SKILL.md não encontrado")
         else:
             self.sucesso("SKILL.md existe")
-            self.skill_md_content = skill_md.read_text(encoding='utf-8')
     
+    @regra(entradas=('frontmatter',), requer=('skill_md',))
     def _validar_skill_md(self):
         """Valida formato básico do SKILL.md."""
-        if not self.skill_md_content:
-            return
+        self.frontmatter = {}
         
         if self.verbose:
             print("📄 Validando SKILL.md...")
         
         # Verificar frontmatter
-        if not self.skill_md_content.startswith('---'):
+        if not self.documento.texto.startswith('---'):
             self.erro("SKILL.md deve começar com frontmatter YAML (---)")
             return
         
         # Extrair frontmatter
-        match = re.match(r'^---\n(.*?)\n---', self.skill_md_content, re.DOTALL)
-        if not match:
+        if self.documento.frontmatter_texto is None:
             self.erro("Frontmatter YAML mal formatado")
             return
         
-        frontmatter_text = match.group(1)
+        if self.documento.erro_frontmatter is not None:
+            self.erro(f"Erro de sintaxe YAML: {self.documento.erro_frontmatter}")
+            return
         
-        try:
-            self.frontmatter = yaml.safe_load(frontmatter_text)
-            if not isinstance(self.frontmatter, dict):
-                self.erro("Frontmatter deve ser um dicionário YAML")
-                return
-            self.sucesso("Frontmatter YAML válido")
-        except yaml.YAMLError as e:
-            self.erro(f"Erro de sintaxe YAML: {e}")
+        if not isinstance(self.documento.frontmatter_yaml, dict):
+            self.erro("Frontmatter deve ser um dicionário YAML")
             return
+        
+        self.frontmatter = self.documento.frontmatter
+        self.sucesso("Frontmatter YAML válido")
     
+    @regra(entradas=('frontmatter',), depende=('skill_md',))
     def _validar_frontmatter(self):
         """Valida campos do frontmatter."""
-        if not self.frontmatter:
-            return
-        
         if self.verbose:
             print("🏷️  Validando frontmatter...")
         
@@ -164,6 +228,7 @@ class Validador:
         if 'description' not in self.frontmatter:
             self.erro("Campo 'description' é obrigatório no frontmatter")
     
+    @regra(entradas=('frontmatter',), depende=('skill_md',))
     def _validar_descricao(self):
         """Valida qualidade da descrição."""
         description = self.frontmatter.get('description', '')
@@ -203,20 +268,14 @@ class Validador:
         else:
             self.sucesso("Descrição parece ter cenários de ativação")
     
+    @regra(entradas=('corpo',))
     def _validar_corpo(self):
         """Valida o corpo do SKILL.md."""
-        if not self.skill_md_content:
-            return
-        
         if self.verbose:
             print("📖 Validando corpo...")
         
-        # Extrair corpo (após frontmatter)
-        match = re.match(r'^---\n.*?\n---\n?(.*)', self.skill_md_content, re.DOTALL)
-        if not match:
-            return
-        
-        corpo = match.group(1).strip()
+        # Corpo (após frontmatter)
+        corpo = self.documento.corpo.strip()
         
         # Verificar título
         if not corpo.startswith('#'):
@@ -225,86 +284,89 @@ class Validador:
             self.sucesso("Corpo tem título principal")
         
         # Verificar TODOs
-        todos = re.findall(r'\[TODO.*?\]|TODO:', corpo)
-        if todos:
-            self.aviso(f"Corpo contém {len(todos)} TODO(s) não resolvidos")
+        estrutura = self.documento.estrutura
+        if estrutura.todos:
+            self.aviso(f"Corpo contém {estrutura.todos} TODO(s) não resolvidos")
         
         # Verificar tamanho
-        linhas = corpo.split('\n')
-        if len(linhas) > 500:
-            self.aviso(f"Corpo muito longo ({len(linhas)} linhas). Considere mover detalhes para references/")
+        linhas = corpo.count('\n') + 1
+        if linhas > 500:
+            self.aviso(f"Corpo muito longo ({linhas} linhas). Considere mover detalhes para references/")
         else:
-            self.sucesso(f"Tamanho do corpo OK ({len(linhas)} linhas)")
+            self.sucesso(f"Tamanho do corpo OK ({linhas} linhas)")
         
         # Verificar seção "Quando Usar"
-        if re.search(r'##.*quando usar|when to use', corpo, re.IGNORECASE):
+        if estrutura.quando_usar:
             self.aviso("Seção 'Quando Usar' deveria estar na descrição do frontmatter, não no corpo")
     
+    @regra(entradas=('scripts',), custo='medio')
     def _validar_scripts(self):
         """Valida diretório scripts/."""
-        scripts_dir = self.caminho / 'scripts'
-        if not scripts_dir.exists():
-            return
+        inventario = self.documento.inventario
         
         if self.verbose:
             print("⚙️  Validando scripts/...")
         
-        scripts = list(scripts_dir.glob('*.py')) + list(scripts_dir.glob('*.sh'))
+        scripts = inventario.arquivos_em('scripts', extensoes={'.py', '.sh'})
         
         for script in scripts:
-            conteudo = script.read_text(encoding='utf-8')
-            
-            # Verificar shebang
-            if script.suffix == '.py' and not conteudo.startswith('#!/'):
-                self.aviso(f"{script.name}: falta shebang (#!/usr/bin/env python3)")
-            
-            # Verificar docstring
-            if script.suffix == '.py' and '"""' not in conteudo[:500]:
-                self.aviso(f"{script.name}: falta docstring")
+            # Shebang e docstring ficam no início: ler só o prefixo
+            if script.sufixo == '.py':
+                inicio = self.documento.ler_prefixo(script.relativo, 500)
+                
+                # Verificar shebang
+                if not inicio.startswith('#!/'):
+                    self.aviso(f"{script.nome}: falta shebang (#!/usr/bin/env python3)")
+                
+                # Verificar docstring
+                if '"""' not in inicio:
+                    self.aviso(f"{script.nome}: falta docstring")
             
             # Verificar se é placeholder
-            if 'placeholder' in conteudo.lower() or 'exemplo' in script.name.lower():
-                self.aviso(f"{script.name}: parece ser placeholder/exemplo")
+            if 'exemplo' in script.nome.lower() or self._tem_placeholder(script.relativo):
+                self.aviso(f"{script.nome}: parece ser placeholder/exemplo")
         
         if scripts:
             self.sucesso(f"Encontrados {len(scripts)} script(s)")
     
+    @regra(entradas=('references', 'frontmatter', 'corpo'), requer=('references', 'skill_md'), custo='medio')
     def _validar_references(self):
         """Valida diretório references/."""
-        refs_dir = self.caminho / 'references'
-        if not refs_dir.exists():
-            return
+        inventario = self.documento.inventario
+        skill_md_content = self.documento.texto or ""
         
         if self.verbose:
             print("📚 Validando references/...")
         
-        refs = list(refs_dir.glob('*.md'))
+        refs = inventario.arquivos_em('references', extensoes={'.md'})
         
         for ref in refs:
             # Verificar se é referenciado no SKILL.md
-            if ref.name not in self.skill_md_content:
-                self.aviso(f"references/{ref.name}: não parece ser referenciado no SKILL.md")
+            if ref.nome not in skill_md_content:
+                self.aviso(f"references/{ref.nome}: não parece ser referenciado no SKILL.md")
             
             # Verificar se é placeholder
-            conteudo = ref.read_text(encoding='utf-8')
-            if 'placeholder' in conteudo.lower() or 'exemplo' in ref.name.lower():
-                self.aviso(f"references/{ref.name}: parece ser placeholder/exemplo")
+            if 'exemplo' in ref.nome.lower() or self._tem_placeholder(ref.relativo):
+                self.aviso(f"references/{ref.nome}: parece ser placeholder/exemplo")
         
         if refs:
             self.sucesso(f"Encontrados {len(refs)} arquivo(s) de referência")
     
+    def _tem_placeholder(self, relativo: str) -> bool:
+        """Procura 'placeholder' no arquivo em blocos, sem carregá-lo inteiro."""
+        return bool(self.documento.procurar(relativo, ['placeholder'], ignorar_caixa=True))
+    
+    @regra(entradas=('assets',))
     def _validar_assets(self):
         """Valida diretório assets/."""
-        assets_dir = self.caminho / 'assets'
-        if not assets_dir.exists():
-            return
+        inventario = self.documento.inventario
         
         if self.verbose:
             print("🎨 Validando assets/...")
         
         # Contar assets (excluindo placeholders)
-        assets = [f for f in assets_dir.rglob('*') if f.is_file()]
-        placeholders = [f for f in assets if 'placeholder' in f.name.lower()]
+        assets = inventario.arquivos_em('assets', recursivo=True)
+        placeholders = [f for f in assets if 'placeholder' in f.nome.lower()]
         
         if placeholders:
             self.aviso(f"assets/ contém {len(placeholders)} placeholder(s)")
@@ -313,6 +375,7 @@ class Validador:
         if reais > 0:
             self.sucesso(f"Encontrados {reais} asset(s)")
     
+    @regra(entradas=('arvore',))
     def _validar_arquivos_indesejados(self):
         """Verifica ausência de arquivos que não deveriam existir."""
         if self.verbose:
@@ -325,67 +388,408 @@ class Validador:
             '.DS_Store', 'Thumbs.db'
         ]
         
+        inventario = self.documento.inventario
         for nome in indesejados:
-            caminho = self.caminho / nome
-            if caminho.exists():
+            # Ignorados ficam fora do inventário, mas continuam na árvore
+            if inventario.existe(nome) or nome in inventario.ignorados:
                 if nome in ['README.md', 'CHANGELOG.md', 'INSTALLATION.md']:
                     self.aviso(f"Arquivo desnecessário: {nome}")
                 else:
                     self.aviso(f"Arquivo/diretório indesejado: {nome}")
         
-        # Verificar arquivos temporários
-        for ext in ['*.tmp', '*.bak', '*.swp', '*~']:
-            for arquivo in self.caminho.rglob(ext):
-                self.aviso(f"Arquivo temporário: {arquivo.relative_to(self.caminho)}")
+        # Verificar arquivos temporários (os que estão dentro de diretórios
+        # ignorados, como node_modules, não são percorridos e não aparecem)
+        temporarios = [e.relativo for e in inventario.com_extensao('.tmp', '.bak', '.swp')]
+        temporarios += [e.relativo for e in inventario.arquivos if e.nome.endswith('~')]
+        temporarios += sorted(i for i in inventario.ignorados if i.endswith(('.tmp', '.bak', '.swp')))
+        for relativo in temporarios:
+            self.aviso(f"Arquivo temporário: {relativo}")
 
 
-def validar_habilidade(caminho: str, verbose: bool = False) -> tuple[bool, str]:
+def validar_habilidade(
+    caminho: str,
+    verbose: bool = False,
+    cache: CacheResultados | None = None,
+    somente: set[str] | None = None,
+    pular: set[str] | None = None
+) -> tuple[bool, str]:
     """
     Valida uma habilidade e retorna resultado.
     
     Args:
         caminho: Caminho para o diretório da habilidade
         verbose: Se True, imprime detalhes durante validação
+        cache: Cache de resultados (opcional)
+        somente: Executa apenas estas regras e suas dependências (opcional)
+        pular: Não executa estas regras nem as que dependem delas (opcional)
     
     Returns:
         Tupla (válido, mensagem)
     """
-    validador = Validador(Path(caminho).resolve(), verbose)
+    validador = Validador(Path(caminho).resolve(), verbose, cache, somente=somente, pular=pular)
     return validador.validar()
 
 
-def main():
-    verbose = '--verbose' in sys.argv
-    args = [a for a in sys.argv[1:] if a != '--verbose']
+def encontrar_habilidades(raiz: Path) -> list[Path]:
+    """
+    Encontra todos os diretórios que contêm SKILL.md abaixo da raiz.
+    
+    A busca não desce dentro de uma habilidade já encontrada nem em
+    diretórios ocultos ou de dependências.
+    
+    Args:
+        raiz: Diretório raiz da biblioteca
+    
+    Returns:
+        Lista ordenada de diretórios de habilidades
+    """
+    habilidades = []
+    for diretorio, subdiretorios, arquivos in os.walk(raiz):
+        if 'SKILL.md' in arquivos:
+            habilidades.append(Path(diretorio))
+            subdiretorios.clear()
+            continue
+        subdiretorios[:] = [
+            d for d in subdiretorios
+            if d not in DIRETORIOS_IGNORADOS_BUSCA and not d.startswith('.')
+        ]
+    return sorted(habilidades)
+
+
+def _validar_em_processo(
+    caminho: Path,
+    cache: CacheResultados | None = None,
+    somente: set[str] | None = None,
+    pular: set[str] | None = None
+) -> tuple[Path, bool, str, list[str], list[str], dict[str, float]]:
+    """Valida uma habilidade dentro de um processo do pool."""
+    # Documento próprio: não reter todas as habilidades na memória do processo
+    caminho = caminho.resolve()
+    validador = Validador(
+        caminho, cache=cache, documento=DocumentoHabilidade(caminho),
+        somente=somente, pular=pular
+    )
+    valido, mensagem = validador.validar()
+    return caminho, valido, mensagem, validador.erros, validador.avisos, validador.tempos
+
+
+def processos_disponiveis() -> int:
+    """Retorna o número de núcleos disponíveis para este processo."""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def validar_biblioteca(
+    raiz: str,
+    processos: int | None = None,
+    cache: CacheResultados | None = None,
+    somente: set[str] | None = None,
+    pular: set[str] | None = None
+) -> Iterator[tuple[Path, bool, str, list[str], list[str], dict[str, float]]]:
+    """
+    Valida todas as habilidades de uma biblioteca em paralelo.
+    
+    Args:
+        raiz: Diretório raiz da biblioteca
+        processos: Número de processos (padrão: núcleos disponíveis)
+        cache: Cache de resultados compartilhado entre os processos (opcional)
+        somente: Executa apenas estas regras e suas dependências (opcional)
+        pular: Não executa estas regras nem as que dependem delas (opcional)
+    
+    Yields:
+        Tupla (caminho, válido, mensagem, erros, avisos, tempos) por
+        habilidade, na ordem de encontrar_habilidades()
+    """
+    yield from validar_habilidades(
+        encontrar_habilidades(Path(raiz).resolve()), processos, cache, somente, pular
+    )
+
+
+def validar_habilidades(
+    habilidades: list[Path],
+    processos: int | None = None,
+    cache: CacheResultados | None = None,
+    somente: set[str] | None = None,
+    pular: set[str] | None = None
+) -> Iterator[tuple[Path, bool, str, list[str], list[str], dict[str, float]]]:
+    """
+    Valida uma lista de habilidades em paralelo (ver validar_biblioteca).
+    
+    Yields:
+        Tupla (caminho, válido, mensagem, erros, avisos, tempos) por
+        habilidade, na ordem da lista
+    """
+    if not habilidades:
+        return
+    
+    validar = partial(_validar_em_processo, cache=cache, somente=somente, pular=pular)
+    processos = min(processos or processos_disponiveis(), len(habilidades))
+    
+    # Um único processo: evitar o custo de criar o pool
+    if processos <= 1:
+        yield from map(validar, habilidades)
+        return
+    
+    # Lotes grandes o bastante para amortizar o IPC, pequenos o bastante
+    # para balancear a carga entre os processos
+    lote = max(1, len(habilidades) // (processos * 4))
+    # Importado só aqui: multiprocessing pesa na partida de cada validação
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        yield from executor.map(validar, habilidades, chunksize=lote)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    args = configurar(args)
+    verbose = '--verbose' in args
+    mostrar_tempos = '--timings' in args
+    args = [a for a in args if a not in ('--verbose', '--timings')]
+    
+    biblioteca = None
+    processos = None
+    usar_cache = False
+    diretorio_cache = None
+    hash_completo = False
+    somente = None
+    pular = None
+    orcamento_ms = None
+    desde = None
+    indice = False
+    posicionais = []
     
-    if len(args) != 1:
+    i = 0
+    while i < len(args):
+        if args[i] == '--library' and i + 1 < len(args):
+            biblioteca = args[i + 1]
+            i += 2
+        elif args[i] == '--jobs' and i + 1 < len(args) and args[i + 1].isdigit():
+            processos = int(args[i + 1])
+            i += 2
+        elif args[i] == '--cache':
+            usar_cache = True
+            i += 1
+        elif args[i] == '--cache-dir' and i + 1 < len(args):
+            usar_cache = True
+            diretorio_cache = args[i + 1]
+            i += 2
+        elif args[i] == '--full-hash':
+            hash_completo = True
+            i += 1
+        elif args[i] == '--only' and i + 1 < len(args):
+            somente = nomes_de_regras(args[i + 1])
+            i += 2
+        elif args[i] == '--skip' and i + 1 < len(args):
+            pular = nomes_de_regras(args[i + 1])
+            i += 2
+        elif args[i] == '--budget' and i + 1 < len(args):
+            try:
+                orcamento_ms = float(args[i + 1])
+            except ValueError:
+                orcamento_ms = None
+            if orcamento_ms is None or not 0 < orcamento_ms < float('inf'):
+                print(f"❌ Erro: --budget espera um tempo positivo em ms, recebeu: {args[i + 1]}")
+                print("Use --help para ver as opções")
+                return 1
+            i += 2
+        elif args[i] == '--changed-since' and i + 1 < len(args):
+            desde = args[i + 1]
+            i += 2
+        elif args[i] == '--staged':
+            indice = True
+            i += 1
+        else:
+            posicionais.append(args[i])
+            i += 1
+    
+    modo_git = desde is not None or indice
+    if modo_git:
+        uso_invalido = bool(biblioteca) or len(posicionais) > 1 or (desde is not None and indice)
+    else:
+        uso_invalido = (biblioteca is None and len(posicionais) != 1) or bool(biblioteca and posicionais)
+    
+    if uso_invalido:
         print("Forge Validate — Valida estrutura e conteúdo de uma habilidade")
         print()
-        print("Uso: forge_validate.py <caminho-da-habilidade> [--verbose]")
+        print("Uso: forge_validate.py <caminho-da-habilidade> [--verbose] [--cache]")
+        print("     forge_validate.py --library <diretorio-raiz> [--jobs <n>] [--verbose] [--cache]")
+        print("     forge_validate.py [<diretorio>] --changed-since <ref> | --staged [--jobs <n>]")
         print()
         print("Opções:")
-        print("  --verbose    Mostra detalhes de cada verificação")
+        print("  --verbose           Mostra detalhes de cada verificação")
+        print("  --library <dir>     Valida todas as habilidades abaixo do diretório")
+        print("  --jobs <n>          Processos paralelos (padrão: núcleos disponíveis)")
+        print("  --cache             Reaproveita resultados de habilidades inalteradas")
+        print("                      (diretório: $FORGE_CACHE_DIR ou ~/.cache/skill-forge)")
+        print("  --cache-dir <dir>   Usa cache no diretório indicado")
+        print("  --full-hash         Chave de cache pelo conteúdo dos arquivos, não mtime")
+        print("  --only <r1,r2>      Executa apenas estas regras (e suas dependências)")
+        print("  --skip <r1,r2>      Não executa estas regras (nem as que dependem delas)")
+        print("  --timings           Mostra o tempo gasto em cada regra")
+        print("  --budget <ms>       Falha se a validação de uma habilidade passar do tempo")
+        print("  --changed-since <r> Só habilidades alteradas entre <r> e HEAD (lidas do git)")
+        print("  --staged            Só habilidades com alterações no índice (pre-commit)")
+        print()
+        print(f"Regras: {', '.join(r.nome for r in regras_de(Validador))}")
         print()
         print("Exemplos:")
         print("  forge_validate.py ./minha-habilidade")
         print("  forge_validate.py ./minha-habilidade --verbose")
-        sys.exit(1)
+        print("  forge_validate.py --library ./skills --jobs 8")
+        print("  forge_validate.py --library ./skills --cache-dir /tmp/forge-cache --full-hash")
+        print("  forge_validate.py ./minha-habilidade --skip scripts,references --timings")
+        print("  forge_validate.py ./skills --changed-since origin/main")
+        print("  forge_validate.py --staged")
+        return 1
+    
+    # Verificar nomes de regras antes de começar
+    try:
+        MotorRegras(regras_de(Validador), somente, pular)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    
+    cache = None
+    if usar_cache:
+        # Cópias lidas do git têm mtime novo a cada execução: chave pelo conteúdo
+        cache = CacheResultados.padrao('validate', diretorio_cache, hash_completo or modo_git)
+    
+    if modo_git:
+        return _main_git(
+            posicionais[0] if posicionais else '.', desde, indice,
+            processos, verbose, cache, somente, pular, mostrar_tempos, orcamento_ms
+        )
     
-    caminho = args[0]
+    if biblioteca:
+        return _main_biblioteca(
+            biblioteca, processos, verbose, cache, somente, pular, mostrar_tempos, orcamento_ms
+        )
+    
+    caminho = posicionais[0]
     
     if not verbose:
         print(f"🔍 Validando: {caminho}")
     
-    valido, mensagem = validar_habilidade(caminho, verbose)
+    with trecho('validação', 'habilidade', caminho=caminho):
+        validador = Validador(Path(caminho).resolve(), verbose, cache, somente=somente, pular=pular)
+        valido, mensagem = validador.validar()
+    
+    if mostrar_tempos:
+        print()
+        print(formatar_tempos(validador.tempos, regras_de(Validador)))
     
     print()
+    if orcamento_ms is not None and sum(validador.tempos.values()) * 1000 > orcamento_ms:
+        print(f"❌ Orçamento de tempo excedido: "
+              f"{sum(validador.tempos.values()) * 1000:.1f} ms > {orcamento_ms:g} ms")
+        valido = False
+    
     if valido:
         print(f"✅ {mensagem}")
-        sys.exit(0)
+        return 0
     else:
         print(f"❌ {mensagem}")
-        sys.exit(1)
+        return 1
+
+
+def _main_biblioteca(
+    raiz: str,
+    processos: int | None,
+    verbose: bool,
+    cache: CacheResultados | None,
+    somente: set[str] | None,
+    pular: set[str] | None,
+    mostrar_tempos: bool,
+    orcamento_ms: float | None
+) -> int:
+    """Valida uma biblioteca inteira e retorna o código de saída agregado."""
+    if not Path(raiz).is_dir():
+        print(f"❌ Caminho não é um diretório: {raiz}")
+        return 1
+    
+    print(f"📚 Validando biblioteca: {raiz}")
+    print()
+    
+    with trecho('biblioteca', 'habilidade', raiz=raiz):
+        resultados = validar_biblioteca(raiz, processos, cache, somente, pular)
+        return _relatar(resultados, {}, verbose, mostrar_tempos, orcamento_ms)
+
+
+def _main_git(
+    caminho: str,
+    desde: str | None,
+    indice: bool,
+    processos: int | None,
+    verbose: bool,
+    cache: CacheResultados | None,
+    somente: set[str] | None,
+    pular: set[str] | None,
+    mostrar_tempos: bool,
+    orcamento_ms: float | None
+) -> int:
+    """Valida só as habilidades alteradas (--changed-since / --staged)."""
+    from forge_git import ErroGit, habilidades_do_git  # só nos modos git
+    
+    origem = "preparadas para commit" if indice else f"alteradas desde {desde}"
+    print(f"📚 Validando habilidades {origem}: {caminho}")
+    print()
+    
+    try:
+        with habilidades_do_git(Path(caminho), desde, indice) as habilidades:
+            if not habilidades:
+                print("✅ Nenhuma habilidade alterada")
+                return 0
+            rotulos = {copia.resolve(): relativo or '.' for relativo, copia in habilidades}
+            resultados = validar_habilidades(list(rotulos), processos, cache, somente, pular)
+            return _relatar(resultados, rotulos, verbose, mostrar_tempos, orcamento_ms)
+    except ErroGit as e:
+        print(f"❌ {e}")
+        return 1
+
+
+def _relatar(
+    resultados: Iterator[tuple[Path, bool, str, list[str], list[str], dict[str, float]]],
+    rotulos: dict[Path, str],
+    verbose: bool,
+    mostrar_tempos: bool,
+    orcamento_ms: float | None
+) -> int:
+    """Imprime o resultado de cada habilidade e o resumo; retorna o código de saída."""
+    total = 0
+    invalidas = 0
+    tempos_totais: dict[str, float] = {}
+    for caminho, valido, mensagem, erros, avisos, tempos in resultados:
+        total += 1
+        for nome, segundos in tempos.items():
+            tempos_totais[nome] = tempos_totais.get(nome, 0.0) + segundos
+        
+        gasto_ms = sum(tempos.values()) * 1000
+        if orcamento_ms is not None and gasto_ms > orcamento_ms:
+            valido = False
+            mensagem += f"; orçamento de tempo excedido ({gasto_ms:.1f} ms > {orcamento_ms:g} ms)"
+        
+        if not valido:
+            invalidas += 1
+        print(f"{'✅' if valido else '❌'} {rotulos.get(caminho, caminho)}: {mensagem}")
+        if verbose:
+            for erro in erros:
+                print(f"    ❌ {erro}")
+            for aviso in avisos:
+                print(f"    ⚠️  {aviso}")
+    
+    print()
+    if total == 0:
+        print("❌ Nenhuma habilidade (SKILL.md) encontrada")
+        return 1
+    
+    if mostrar_tempos:
+        print(formatar_tempos(tempos_totais, regras_de(Validador)))
+        print()
+    
+    print(f"📊 {total} habilidade(s): {total - invalidas} válida(s), {invalidas} inválida(s)")
+    return 1 if invalidas else 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+Forge Watch — Revalida habilidades continuamente enquanto são editadas
+
+Uso:
+    forge_watch.py <caminho-da-habilidade-ou-biblioteca> [--poll] [--interval <s>]
+
+Exemplos:
+    forge_watch.py ./minha-habilidade
+    forge_watch.py ./skills --poll --interval 1
+
+Funcionamento:
+    - Recebe eventos do sistema de arquivos via inotify (Linux) ou, na
+      falta dele, por varredura periódica (--poll)
+    - Mapeia cada caminho alterado para as regras do Validador e do
+      Analisador que o declaram como entrada (editar o frontmatter reexecuta apenas
+      as validações de frontmatter e descrição; um novo script reexecuta
+      apenas a validação de scripts)
+    - Atualiza o documento e o inventário só nos caminhos alterados, sem
+      reler a habilidade inteira e sem reiniciar o processo
+    - Não observa os diretórios que o filtro da habilidade ignora (o mesmo
+      do inventário: padrões fixos e .forgeignore, ver forge_ignorar);
+      editar o .forgeignore reexecuta todas as regras
+"""
+
+import os
+import sys
+import time
+import select
+import struct
+import ctypes
+import ctypes.util
+from pathlib import Path
+from typing import Callable, Iterator
+
+from forge_documento import DocumentoHabilidade
+from forge_ignorar import ARQUIVO_IGNORAR, PADROES_PADRAO, FiltroIgnorar
+from forge_regras import ENTRADAS, MotorRegras, entradas_disponiveis, regras_de
+from forge_validate import Validador, encontrar_habilidades
+from forge_analyze import Analisador
+from forge_perfil import configurar
+
+
+# Janela para agrupar rajadas de eventos de um mesmo salvamento
+JANELA_AGRUPAMENTO = 0.02
+
+
+class ObservadorInotify:
+    """Observa uma árvore de diretórios via inotify (Linux, sem dependências)."""
+    
+    IN_MODIFY = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_Q_OVERFLOW = 0x4000
+    IN_ISDIR = 0x40000000
+    MASCARA = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    
+    def __init__(self, raiz: Path, ignorar_diretorio: Callable[[Path], bool]):
+        self.raiz = raiz
+        self.ignorar_diretorio = ignorar_diretorio
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falhou")
+        self._diretorios: dict[int, Path] = {}
+        self._observar_arvore(raiz)
+    
+    def _observar_arvore(self, inicio: Path):
+        """Adiciona watches para o diretório e os subdiretórios não ignorados."""
+        for diretorio, subdiretorios, _ in os.walk(inicio):
+            subdiretorios[:] = [d for d in subdiretorios if not self.ignorar_diretorio(Path(diretorio) / d)]
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(diretorio), self.MASCARA)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch falhou: {diretorio}")
+            self._diretorios[wd] = Path(diretorio)
+    
+    def _ler(self) -> tuple[set[Path], bool]:
+        """Lê eventos pendentes. Retorna (caminhos, houve_estouro_da_fila)."""
+        caminhos = set()
+        estouro = False
+        try:
+            dados = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return caminhos, estouro
+        
+        deslocamento = 0
+        while deslocamento < len(dados):
+            wd, mascara, _, tamanho = struct.unpack_from('iIII', dados, deslocamento)
+            deslocamento += 16
+            nome = dados[deslocamento:deslocamento + tamanho].rstrip(b'\0')
+            deslocamento += tamanho
+            
+            if mascara & self.IN_Q_OVERFLOW:
+                estouro = True
+                continue
+            if wd not in self._diretorios or not nome:
+                continue
+            
+            caminho = self._diretorios[wd] / os.fsdecode(nome)
+            caminhos.add(caminho)
+            
+            # Novo diretório: passar a observá-lo também (se não for ignorado)
+            if mascara & self.IN_ISDIR and mascara & (self.IN_CREATE | self.IN_MOVED_TO):
+                if not self.ignorar_diretorio(caminho):
+                    self._observar_arvore(caminho)
+        
+        return caminhos, estouro
+    
+    def reobservar(self, inicio: Path):
+        """Observa diretórios que deixaram de ser ignorados (após mudar o .forgeignore)."""
+        self._observar_arvore(inicio)
+    
+    def eventos(self) -> Iterator[set[Path] | None]:
+        """Produz conjuntos de caminhos alterados (None: reavaliar tudo)."""
+        while True:
+            select.select([self._fd], [], [])
+            caminhos, estouro = self._ler()
+            
+            # Agrupar a rajada de eventos de um mesmo salvamento
+            while select.select([self._fd], [], [], JANELA_AGRUPAMENTO)[0]:
+                mais, estourou = self._ler()
+                caminhos |= mais
+                estouro = estouro or estourou
+            
+            if estouro:
+                yield None
+            elif caminhos:
+                yield caminhos
+
+
+class ObservadorPolling:
+    """Observa uma árvore comparando tamanho e mtime em varreduras periódicas."""
+    
+    def __init__(self, raiz: Path, ignorar_diretorio: Callable[[Path], bool], intervalo: float = 0.5):
+        self.raiz = raiz
+        self.ignorar_diretorio = ignorar_diretorio
+        self.intervalo = intervalo
+        self._estado = self._capturar()
+    
+    def _capturar(self) -> dict[Path, tuple[int, int]]:
+        estado = {}
+        for diretorio, subdiretorios, arquivos in os.walk(self.raiz):
+            for nome in subdiretorios + arquivos:
+                caminho = Path(diretorio) / nome
+                try:
+                    info = caminho.stat()
+                except OSError:
+                    continue
+                estado[caminho] = (info.st_size, info.st_mtime_ns)
+            # O diretório ignorado conta (criado ou removido), o conteúdo não
+            subdiretorios[:] = [d for d in subdiretorios if not self.ignorar_diretorio(Path(diretorio) / d)]
+        return estado
+    
+    def reobservar(self, inicio: Path):
+        """Nada a fazer: cada varredura já consulta o filtro atual."""
+    
+    def eventos(self) -> Iterator[set[Path] | None]:
+        """Produz conjuntos de caminhos alterados a cada varredura."""
+        while True:
+            time.sleep(self.intervalo)
+            novo = self._capturar()
+            alterados = {
+                c for c in self._estado.keys() | novo.keys()
+                if self._estado.get(c) != novo.get(c)
+            }
+            self._estado = novo
+            if alterados:
+                yield alterados
+
+
+def criar_observador(
+    raiz: Path,
+    ignorar_diretorio: Callable[[Path], bool],
+    polling: bool = False,
+    intervalo: float = 0.5
+):
+    """
+    Cria observador inotify, ou por varredura se indisponível ou solicitado.
+    
+    Args:
+        raiz: Diretório observado
+        ignorar_diretorio: Se um diretório não deve ser percorrido
+        polling: Se True, usa varredura periódica
+        intervalo: Intervalo da varredura periódica em segundos
+    """
+    if not polling and sys.platform.startswith('linux'):
+        try:
+            return ObservadorInotify(raiz, ignorar_diretorio)
+        except (OSError, AttributeError) as e:
+            print(f"⚠️  inotify indisponível ({e}). Usando varredura periódica.")
+    return ObservadorPolling(raiz, ignorar_diretorio, intervalo)
+
+
+class SessaoHabilidade:
+    """Habilidade observada: documento em memória e resultados por regra."""
+    
+    def __init__(self, caminho: Path):
+        self.caminho = caminho
+        self.documento = DocumentoHabilidade(caminho)
+        self.validador = Validador(caminho, documento=self.documento)
+        self.analisador = Analisador(caminho, documento=self.documento)
+        self.validacoes: dict[str, tuple[list[str], list[str]]] = {}
+        self.analises: dict[str, list[str]] = {}
+    
+    def executar(self, entradas: set[str] | None = None) -> int:
+        """
+        Reexecuta as regras que leem alguma das entradas alteradas.
+        
+        Args:
+            entradas: Partes alteradas (ver forge_regras.ENTRADAS); None
+                reexecuta todas as regras
+        
+        Returns:
+            Número de regras executadas
+        """
+        disponiveis = entradas_disponiveis(self.documento)
+        validador = self.validador
+        
+        def guardar_validacao(regra):
+            self.validacoes[regra.nome] = (validador.erros, validador.avisos)
+            validador.erros, validador.avisos = [], []
+        
+        motor = MotorRegras(regras_de(Validador), _regras_que_leem(Validador, entradas))
+        validador.erros, validador.avisos = [], []
+        motor.executar(validador, disponiveis, ao_concluir=guardar_validacao)
+        # Regra pulada por falta de entrada não tem mais o que reportar
+        for nome in motor.puladas:
+            self.validacoes.pop(nome, None)
+        executadas = len(motor.tempos)
+        
+        # Sem SKILL.md o Analisador não tem o que analisar
+        analisador = self.analisador
+        if self.documento.texto is None:
+            self.analises.clear()
+            return executadas
+        
+        def guardar_analise(regra):
+            self.analises[regra.nome] = analisador.sugestoes
+            analisador.sugestoes = []
+        
+        analisador.skill_md_content = self.documento.texto
+        analisador.frontmatter = self.documento.frontmatter
+        motor = MotorRegras(regras_de(Analisador), _regras_que_leem(Analisador, entradas))
+        analisador.sugestoes = []
+        motor.executar(analisador, disponiveis, ao_concluir=guardar_analise)
+        for nome in motor.puladas:
+            self.analises.pop(nome, None)
+        return executadas + len(motor.tempos)
+    
+    def entradas_afetadas(self, relativos: set[str]) -> set[str]:
+        """Atualiza o documento e retorna as entradas que os caminhos alteram."""
+        texto_antes = self.documento.texto
+        frontmatter_antes = self.documento.frontmatter_texto
+        corpo_antes = self.documento.corpo
+        self.documento.invalidar(relativos)
+        
+        # Outros padrões: o conjunto de arquivos pode ter mudado em qualquer lugar
+        if ARQUIVO_IGNORAR in relativos:
+            return set(ENTRADAS)
+        
+        entradas = set()
+        for relativo in relativos:
+            topo, _, resto = relativo.partition('/')
+            if relativo == 'SKILL.md':
+                if (texto_antes is None) != (self.documento.texto is None):
+                    entradas |= {'skill_md', 'frontmatter', 'corpo'}
+                if self.documento.frontmatter_texto != frontmatter_antes:
+                    entradas.add('frontmatter')
+                if self.documento.corpo != corpo_antes:
+                    entradas.add('corpo')
+            elif topo in ('scripts', 'references', 'assets'):
+                entradas.add(topo)
+            # Entradas na raiz e arquivos temporários em qualquer nível
+            if relativo != 'SKILL.md' and (not resto or relativo.endswith(('.tmp', '.bak', '.swp', '~'))):
+                entradas.add('arvore')
+        return entradas
+    
+    def mensagens(self) -> tuple[list[str], list[str], list[str]]:
+        """Erros, avisos e sugestões atuais, na ordem original das regras."""
+        erros, avisos, sugestoes = [], [], []
+        for regra in regras_de(Validador):
+            e, a = self.validacoes.get(regra.nome, ([], []))
+            erros += e
+            avisos += a
+        for regra in regras_de(Analisador):
+            sugestoes += self.analises.get(regra.nome, [])
+        return erros, avisos, sugestoes
+    
+    def resumo(self) -> tuple[bool, str]:
+        """Resultado no mesmo formato de Validador.validar()."""
+        erros, avisos, sugestoes = self.mensagens()
+        self.validador.erros, self.validador.avisos = erros, avisos
+        valido, mensagem = self.validador.resultado()
+        if sugestoes:
+            mensagem += f" · {len(sugestoes)} sugestão(ões)"
+        return valido, mensagem
+
+
+def _regras_que_leem(classe: type, entradas: set[str] | None) -> set[str] | None:
+    """Nomes das regras da classe que declaram alguma das entradas."""
+    if entradas is None:
+        return None
+    return {r.nome for r in regras_de(classe) if entradas.intersection(r.entradas)}
+
+
+def _imprimir_diferencas(antes: tuple, depois: tuple):
+    """Imprime mensagens novas (+) e resolvidas (-) entre dois resultados."""
+    for simbolo, anteriores, atuais in zip(('❌', '⚠️ ', '💡'), antes, depois):
+        for mensagem in atuais:
+            if mensagem not in anteriores:
+                print(f"  + {simbolo} {mensagem}")
+        for mensagem in anteriores:
+            if mensagem not in atuais:
+                print(f"  - {simbolo} {mensagem}")
+
+
+def observar(caminho: str, polling: bool = False, intervalo: float = 0.5):
+    """
+    Valida e analisa continuamente uma habilidade ou biblioteca.
+    
+    Args:
+        caminho: Diretório da habilidade ou raiz da biblioteca
+        polling: Se True, usa varredura periódica em vez de inotify
+        intervalo: Intervalo da varredura periódica em segundos
+    """
+    raiz = Path(caminho).resolve()
+    sessoes: dict[Path, SessaoHabilidade] = {}
+    padrao = FiltroIgnorar(PADROES_PADRAO)
+    
+    def ignorar_diretorio(diretorio: Path) -> bool:
+        """Filtro da habilidade que contém o diretório (fora delas, os padrões fixos)."""
+        habilidade = next((p for p in diretorio.parents if p in sessoes), None)
+        if habilidade is None:
+            return padrao.ignorado(diretorio.name, diretorio=True)
+        filtro = sessoes[habilidade].documento.inventario.filtro
+        return filtro.ignorado(diretorio.relative_to(habilidade).as_posix(), diretorio=True)
+    
+    for habilidade in encontrar_habilidades(raiz):
+        sessao = SessaoHabilidade(habilidade)
+        sessao.executar()
+        sessoes[habilidade] = sessao
+        valido, mensagem = sessao.resumo()
+        print(f"{'✅' if valido else '❌'} {habilidade.name}: {mensagem}")
+    
+    observador = criar_observador(raiz, ignorar_diretorio, polling, intervalo)
+    print(f"\n👀 Observando {raiz} ({type(observador).__name__}). Ctrl+C para sair.\n")
+    
+    for alterados in observador.eventos():
+        inicio = time.perf_counter()
+        
+        # Estouro da fila de eventos: reavaliar tudo do zero
+        if alterados is None:
+            sessoes = {h: SessaoHabilidade(h) for h in encontrar_habilidades(raiz)}
+            for sessao in sessoes.values():
+                sessao.executar()
+            print("♻️  Fila de eventos estourou: biblioteca reavaliada por completo")
+            continue
+        
+        # Agrupar caminhos alterados por habilidade
+        por_habilidade: dict[Path, set[str]] = {}
+        for alterado in alterados:
+            habilidade = next(
+                (p for p in (alterado, *alterado.parents) if p in sessoes), None
+            )
+            if habilidade is None and alterado.name == 'SKILL.md':
+                habilidade = alterado.parent
+                sessoes[habilidade] = SessaoHabilidade(habilidade)
+                sessoes[habilidade].executar()
+            if habilidade is None or habilidade == alterado:
+                continue
+            por_habilidade.setdefault(habilidade, set()).add(
+                alterado.relative_to(habilidade).as_posix()
+            )
+        
+        for habilidade, relativos in sorted(por_habilidade.items()):
+            sessao = sessoes[habilidade]
+            antes = sessao.mensagens()
+            regras = sessao.executar(sessao.entradas_afetadas(relativos))
+            if ARQUIVO_IGNORAR in relativos:
+                observador.reobservar(habilidade)
+            decorrido = (time.perf_counter() - inicio) * 1000
+            
+            valido, mensagem = sessao.resumo()
+            print(f"[{time.strftime('%H:%M:%S')}] {habilidade.name}: "
+                  f"{', '.join(sorted(relativos))} → {regras} regra(s) em {decorrido:.1f} ms")
+            print(f"  {'✅' if valido else '❌'} {mensagem}")
+            _imprimir_diferencas(antes, sessao.mensagens())
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    args = configurar(args)
+    
+    if not args or '--help' in args or '-h' in args:
+        print("Forge Watch — Revalida habilidades continuamente enquanto são editadas")
+        print()
+        print("Uso: forge_watch.py <caminho-da-habilidade-ou-biblioteca> [--poll] [--interval <s>]")
+        print()
+        print("Opções:")
+        print("  --poll             Usa varredura periódica em vez de inotify")
+        print("  --interval <s>     Intervalo da varredura periódica (padrão: 0.5)")
+        print()
+        print("Exemplos:")
+        print("  forge_watch.py ./minha-habilidade")
+        print("  forge_watch.py ./skills --poll --interval 1")
+        return 0
+    
+    caminho = None
+    polling = False
+    intervalo = 0.5
+    
+    i = 0
+    while i < len(args):
+        if args[i] == '--poll':
+            polling = True
+            i += 1
+        elif args[i] == '--interval' and i + 1 < len(args):
+            try:
+                intervalo = float(args[i + 1])
+            except ValueError:
+                intervalo = None
+            if intervalo is None or not 0 < intervalo < float('inf'):
+                print(f"❌ Erro: --interval espera um tempo positivo em segundos, recebeu: {args[i + 1]}")
+                print("Use --help para ver as opções")
+                return 1
+            i += 2
+        elif not args[i].startswith('--'):
+            caminho = args[i]
+            i += 1
+        else:
+            print(f"❌ Argumento desconhecido: {args[i]}")
+            return 1
+    
+    if not caminho or not Path(caminho).is_dir():
+        print(f"❌ Erro: Caminho não é um diretório: {caminho}")
+        return 1
+    
+    try:
+        observar(caminho, polling, intervalo)
+    except KeyboardInterrupt:
+        print()
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+"""
+Forge Zip — Escrita de .skill (ZIP) com cópia direta de membros inalterados
+
+Uso (como módulo):
+    from forge_zip import EscritorZip, membros_anteriores
+
+    nivel, motivo = PoliticaCompressao().escolher(Path('x/SKILL.md'), 'SKILL.md')
+    anteriores = membros_anteriores(Path('dist/x.skill'))    # (formato, sha256) -> membro
+    chave = (formato_compressao(nivel), sha256)
+    with open('dist/x.skill', 'rb') as antigo, EscritorZip(Path('novo.skill'), data, tarefas=8) as zipf:
+        if chave in anteriores:
+            zipf.copiar(antigo, anteriores[chave], 'x/SKILL.md', 0o644, sha256)
+        else:
+            zipf.adicionar(Path('x/SKILL.md'), 'x/SKILL.md', 0o644, sha256, nivel)
+        zipf.comentario = b'...'
+
+O zipfile da biblioteca padrão só sabe gravar um membro descomprimindo
+e recomprimindo o conteúdo. Aqui cada membro pode:
+    - ser comprimido (deflate, mesmo nível do zipfile) em várias threads:
+      o arquivo é dividido em pedaços de 1 MB comprimidos de forma
+      independente (como o pigz), cada um com os últimos 32 KB do
+      anterior como dicionário; os pedaços são gravados em ordem, então
+      os bytes não dependem do número de threads
+    - ser copiado de um ZIP anterior: os bytes comprimidos, o CRC e os
+      tamanhos vão como estão, sem passar pelo zlib; só os cabeçalhos
+      (nome, data, permissões, deslocamento) são escritos de novo
+
+O nível de cada membro vem de PoliticaCompressao: regras por glob
+(--compress 'assets/*.svg=max') ou, sem regra, uma amostra dos primeiros
+8 KB comprimida com deflate rápido. Conteúdo que já vem comprimido
+(PNG, JPEG, PDF, fontes, zip) é gravado sem compressão (STORED), dados
+pouco compressíveis usam deflate rápido e texto usa deflate máximo (ou
+o padrão, acima de 1 MB, onde o máximo custa caro e quase não ganha).
+
+O formato da compressão e o SHA-256 do conteúdo de cada membro ficam no
+comentário do membro, no diretório central, e é por eles que
+membros_anteriores() acha o que pode ser copiado (mesmo que o arquivo
+tenha mudado de nome). Cabeçalhos,
+datas e permissões seguem o que foi pedido, então o resultado é
+reproduzível. Zip64 é usado quando tamanhos, deslocamentos ou o número
+de membros passam dos limites do formato clássico.
+"""
+
+import os
+import zlib
+import stat
+import struct
+import zipfile
+import posixpath
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import BinaryIO
+from collections import deque
+
+from forge_perfil import trecho
+
+
+# Tamanho de cada bloco lido do disco (e do ZIP anterior)
+TAMANHO_BLOCO = 1024 * 1024
+
+# Nível do deflate (o padrão do zlib, o mesmo do zipfile)
+NIVEL_PADRAO = 6
+
+# Níveis de compressão por nome (linha de comando e relatório); 0 é STORED
+NIVEIS = {'store': 0, 'fast': 1, 'default': NIVEL_PADRAO, 'max': 9}
+NOMES_NIVEIS = {nivel: nome for nome, nivel in NIVEIS.items()}
+
+# Início de cada arquivo comprimido (deflate rápido) para estimar o ganho
+TAMANHO_AMOSTRA = 8 * 1024
+
+# Razão comprimido/original da amostra: a partir de LIMIAR_ARMAZENAR o
+# conteúdo já é comprimido (PNG, JPEG, PDF, fontes, zip) e vai sem
+# deflate; abaixo de LIMIAR_MAXIMO (texto, dados repetitivos) o deflate
+# máximo compensa; entre os dois, deflate rápido
+LIMIAR_ARMAZENAR = 0.9
+LIMIAR_MAXIMO = 0.5
+
+# Deflate máximo custa ~3x o padrão para ~1% a menos: acima deste tamanho
+# o texto fica no nível padrão
+TAMANHO_MAXIMO = 1024 * 1024
+
+# Acima disto o membro usa zip64 (mesmo limite conservador do zipfile)
+LIMITE_ZIP64 = (1 << 31) - 1
+LIMITE_MEMBROS = 0xFFFF
+
+# Pedaço comprimido de forma independente (e em paralelo) nos arquivos grandes
+TAMANHO_PEDACO = 1024 * 1024
+
+# Janela do deflate: o final de cada pedaço vira o dicionário do seguinte
+JANELA_DEFLATE = 32 * 1024
+
+# Comentário de cada membro: "<formato> sha256:<conteúdo>"
+SEPARADOR_SHA256 = ' sha256:'
+
+# Estruturas do formato (APPNOTE.TXT)
+CABECALHO_LOCAL = struct.Struct('<IHHHHHIIIHH')
+CABECALHO_CENTRAL = struct.Struct('<IHHHHHHIIIHHHHHII')
+FIM_DIRETORIO = struct.Struct('<IHHHHIIH')
+FIM_DIRETORIO_ZIP64 = struct.Struct('<IQHHIIQQQQ')
+LOCALIZADOR_ZIP64 = struct.Struct('<IIQI')
+ASSINATURA_LOCAL = 0x04034b50
+ASSINATURA_CENTRAL = 0x02014b50
+ASSINATURA_FIM = 0x06054b50
+ASSINATURA_FIM_ZIP64 = 0x06064b50
+ASSINATURA_LOCALIZADOR_ZIP64 = 0x07064b50
+VERSAO_CLASSICA = 20
+VERSAO_ZIP64 = 45
+SISTEMA_UNIX = 3
+NOMES_UTF8 = 0x800
+
+
+class MembroZip:
+    """Membro gravado: o que o diretório central precisa saber dele."""
+    
+    __slots__ = (
+        'nome', 'modo', 'metodo', 'formato', 'crc', 'comprimido', 'tamanho', 'deslocamento', 'comentario'
+    )
+    
+    def __init__(self, nome: str, modo: int, formato: str, sha256: str):
+        self.nome = nome
+        self.modo = modo
+        self.formato = formato
+        self.metodo = zipfile.ZIP_STORED if formato == FORMATO_ARMAZENADO else zipfile.ZIP_DEFLATED
+        self.comentario = f"{formato}{SEPARADOR_SHA256}{sha256}".encode('ascii')
+        self.crc = 0
+        self.comprimido = 0
+        self.tamanho = 0
+        self.deslocamento = 0
+    
+    def __repr__(self) -> str:
+        return f"MembroZip({self.nome!r}, {self.tamanho} -> {self.comprimido})"
+
+
+# Formato dos membros gravados sem compressão
+FORMATO_ARMAZENADO = 'stored'
+
+
+def formato_compressao(nivel: int) -> str:
+    """Identificação da compressão de um membro: membros só são copiados entre formatos iguais."""
+    return FORMATO_ARMAZENADO if nivel == 0 else f"deflate-{nivel}/{TAMANHO_PEDACO}"
+
+
+def estimar_nivel(arquivo: Path) -> tuple[int, float]:
+    """
+    Nível de compressão sugerido pela amostra do início do arquivo.
+    
+    Returns:
+        Tupla (nível, razão comprimido/original da amostra)
+    """
+    with open(arquivo, 'rb') as f:
+        amostra = f.read(TAMANHO_AMOSTRA)
+    if not amostra:
+        return NIVEIS['store'], 1.0
+    compressor = zlib.compressobj(1, zlib.DEFLATED, -15)
+    razao = len(compressor.compress(amostra) + compressor.flush()) / len(amostra)
+    if razao >= LIMIAR_ARMAZENAR:
+        return NIVEIS['store'], razao
+    if razao >= LIMIAR_MAXIMO:
+        return NIVEIS['fast'], razao
+    if os.path.getsize(arquivo) > TAMANHO_MAXIMO:
+        return NIVEIS['default'], razao
+    return NIVEIS['max'], razao
+
+
+class PoliticaCompressao:
+    """Nível de compressão de cada arquivo: regras por glob e, sem regra, a amostra."""
+    
+    def __init__(self, regras: list[tuple[str, int]] | None = None):
+        """
+        Args:
+            regras: (glob, nível) na ordem de prioridade; o glob é comparado
+                ao caminho relativo à habilidade ('assets/*.png') ou, sem
+                '/', só ao nome do arquivo ('*.svg')
+        """
+        self.regras = list(regras or [])
+    
+    def adicionar_regra(self, texto: str):
+        """Acrescenta uma regra no formato '<glob>=<store|fast|default|max>'."""
+        padrao, separador, nome = texto.rpartition('=')
+        if not separador or not padrao or nome not in NIVEIS:
+            raise ValueError(f"Regra de compressão inválida: {texto} (use <glob>={'|'.join(NIVEIS)})")
+        self.regras.append((padrao, NIVEIS[nome]))
+    
+    def escolher(self, arquivo: Path, relativo: str) -> tuple[int, str]:
+        """
+        Escolhe o nível de um arquivo.
+        
+        Args:
+            arquivo: Arquivo no disco (para a amostra)
+            relativo: Caminho relativo à habilidade, com '/'
+        
+        Returns:
+            Tupla (nível, motivo para o relatório)
+        """
+        for padrao, nivel in self.regras:
+            alvo = relativo if '/' in padrao else posixpath.basename(relativo)
+            if fnmatchcase(alvo, padrao):
+                return nivel, f"regra {padrao}"
+        nivel, razao = estimar_nivel(arquivo)
+        return nivel, f"amostra {razao:.0%}"
+
+
+def membros_anteriores(arquivo: Path) -> dict[tuple[str, str], zipfile.ZipInfo]:
+    """
+    Membros de um .skill anterior que podem ser copiados, pelo formato e SHA-256 do conteúdo.
+    
+    Args:
+        arquivo: ZIP gravado antes por EscritorZip
+    
+    Returns:
+        (formato, SHA-256) -> ZipInfo do membro ({} se o arquivo não existe
+        ou não é ZIP)
+    """
+    try:
+        with zipfile.ZipFile(arquivo) as zipf:
+            infos = zipf.infolist()
+    except (OSError, zipfile.BadZipFile):
+        return {}
+    anteriores = {}
+    for info in infos:
+        formato, separador, sha256 = info.comment.decode('ascii', 'replace').partition(SEPARADOR_SHA256)
+        if separador:
+            anteriores[formato, sha256] = info
+    return anteriores
+
+
+def _data_dos(data: tuple[int, ...]) -> tuple[int, int]:
+    """Data e hora no formato MS-DOS (resolução de 2 segundos)."""
+    ano, mes, dia, hora, minuto, segundo = data[:6]
+    return (ano - 1980) << 9 | mes << 5 | dia, hora << 11 | minuto << 5 | segundo // 2
+
+
+def _comprimir_pedaco(dados: bytes, dicionario: bytes, nivel: int, final: bool) -> bytes:
+    """
+    Deflate de um pedaço de arquivo, independente dos demais.
+    
+    Os pedaços não finais terminam em Z_SYNC_FLUSH (fronteira de byte, sem
+    bloco final), então a concatenação em ordem é um único fluxo deflate.
+    O dicionário (últimos 32 KB do pedaço anterior) mantém a taxa de
+    compressão perto da de um fluxo contínuo.
+    """
+    with trecho('deflate', 'zip', bytes=len(dados)):
+        if dicionario:
+            compressor = zlib.compressobj(nivel, zlib.DEFLATED, -15, zdict=dicionario)
+        else:
+            compressor = zlib.compressobj(nivel, zlib.DEFLATED, -15)
+        return compressor.compress(dados) + compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class _Pronto:
+    """Resultado já calculado, com a interface de Future (escrita sem threads)."""
+    
+    __slots__ = ('valor',)
+    
+    def __init__(self, valor):
+        self.valor = valor
+    
+    def result(self):
+        return self.valor
+
+
+class EscritorZip:
+    """ZIP gravado membro a membro, com cabeçalhos reproduzíveis e deflate em paralelo."""
+    
+    def __init__(self, destino: Path, data: tuple[int, ...], nivel: int = NIVEL_PADRAO, tarefas: int = 1):
+        """
+        Args:
+            destino: Arquivo a criar (sobrescrito)
+            data: Data de todos os membros (ano, mês, dia, hora, min, seg)
+            nivel: Nível do deflate dos membros comprimidos aqui
+            tarefas: Threads de compressão (o zlib libera o GIL); o
+                resultado é o mesmo para qualquer número de threads
+        """
+        self.destino = destino
+        self.nivel = nivel
+        self.data_dos, self.hora_dos = _data_dos(data)
+        self.comentario = b''
+        self.membros: list[MembroZip] = []
+        
+        # Operações na ordem do arquivo; os pedaços comprimem em paralelo e
+        # são gravados em ordem, com no máximo _limite pedaços na memória
+        self._fila: deque[tuple] = deque()
+        self._pedacos_pendentes = 0
+        self._limite = 4 * max(tarefas, 1)
+        self._pool = None
+        if tarefas > 1:
+            from concurrent.futures import ThreadPoolExecutor  # só com várias threads
+            self._pool = ThreadPoolExecutor(tarefas)
+        self._arquivo = open(destino, 'wb')
+    
+    def _flags(self, nome: str) -> int:
+        return 0 if nome.isascii() else NOMES_UTF8
+    
+    def _cabecalho_local(self, membro: MembroZip, zip64: bool) -> bytes:
+        nome = membro.nome.encode('utf-8')
+        extra = b''
+        comprimido, tamanho = membro.comprimido, membro.tamanho
+        if zip64:
+            extra = struct.pack('<HHQQ', 1, 16, tamanho, comprimido)
+            comprimido = tamanho = 0xFFFFFFFF
+        return CABECALHO_LOCAL.pack(
+            ASSINATURA_LOCAL, VERSAO_ZIP64 if zip64 else VERSAO_CLASSICA, self._flags(membro.nome),
+            membro.metodo, self.hora_dos, self.data_dos, membro.crc, comprimido, tamanho,
+            len(nome), len(extra)
+        ) + nome + extra
+    
+    def _enfileirar(self, *operacao):
+        self._fila.append(operacao)
+        if operacao[0] == 'pedaco':
+            self._pedacos_pendentes += 1
+        while self._pedacos_pendentes > self._limite:
+            self._gravar_proxima()
+    
+    def _gravar_proxima(self):
+        """Grava a primeira operação da fila (esperando a compressão, se for um pedaço)."""
+        operacao, membro, valor = self._fila.popleft()
+        if operacao == 'inicio':
+            # Cabeçalho provisório; CRC e tamanhos são reescritos no 'fim'
+            membro.deslocamento = self._arquivo.tell()
+            self._arquivo.write(self._cabecalho_local(membro, valor))
+        elif operacao == 'pedaco':
+            self._pedacos_pendentes -= 1
+            dados = valor.result()
+            membro.comprimido += len(dados)
+            self._arquivo.write(dados)
+        elif operacao == 'fim':
+            if not valor and max(membro.tamanho, membro.comprimido) > LIMITE_ZIP64:
+                raise ValueError(f"{membro.nome} cresceu durante o empacotamento")
+            fim = self._arquivo.tell()
+            self._arquivo.seek(membro.deslocamento)
+            self._arquivo.write(self._cabecalho_local(membro, valor))
+            self._arquivo.seek(fim)
+            self.membros.append(membro)
+        else:
+            self._copiar_dados(membro, *valor)
+    
+    def adicionar(self, origem: Path, nome: str, modo: int, sha256: str, nivel: int | None = None):
+        """
+        Comprime um arquivo (deflate ou STORED) e grava como membro.
+        
+        O arquivo é lido aqui, em pedaços de TAMANHO_PEDACO; a compressão
+        de cada pedaço vai para as threads e a gravação acontece em ordem.
+        
+        Args:
+            origem: Arquivo a comprimir
+            nome: Nome no ZIP (com '/')
+            modo: Permissões (0o644, 0o755...)
+            sha256: SHA-256 do conteúdo, guardado no comentário do membro
+            nivel: Nível do deflate, 0 para gravar sem compressão (padrão:
+                o nível do escritor)
+        """
+        nivel = self.nivel if nivel is None else nivel
+        membro = MembroZip(nome, modo, formato_compressao(nivel), sha256)
+        # Zip64 decidido antes de comprimir: o cabeçalho local tem tamanho fixo
+        zip64 = origem.stat().st_size * 1.05 > LIMITE_ZIP64
+        self._enfileirar('inicio', membro, zip64)
+        
+        dicionario = b''
+        with open(origem, 'rb') as f:
+            dados = f.read(TAMANHO_PEDACO)
+            while True:
+                seguinte = f.read(TAMANHO_PEDACO) if dados else b''
+                membro.crc = zlib.crc32(dados, membro.crc)
+                membro.tamanho += len(dados)
+                argumentos = (dados, dicionario, nivel, not seguinte)
+                if nivel == 0:
+                    self._enfileirar('pedaco', membro, _Pronto(dados))
+                elif self._pool is None:
+                    self._enfileirar('pedaco', membro, _Pronto(_comprimir_pedaco(*argumentos)))
+                else:
+                    self._enfileirar('pedaco', membro, self._pool.submit(_comprimir_pedaco, *argumentos))
+                if not seguinte:
+                    break
+                dicionario = dados[-JANELA_DEFLATE:]
+                dados = seguinte
+        self._enfileirar('fim', membro, zip64)
+    
+    def copiar(self, zip_anterior: BinaryIO, anterior: zipfile.ZipInfo, nome: str, modo: int, sha256: str):
+        """
+        Copia os bytes comprimidos de um membro de outro ZIP, sem descomprimir.
+        
+        Args:
+            zip_anterior: ZIP de origem, aberto em modo binário até fechar()
+            anterior: Membro de origem (ver membros_anteriores)
+            nome: Nome no novo ZIP
+            modo: Permissões
+            sha256: SHA-256 do conteúdo
+        """
+        formato = anterior.comment.decode('ascii', 'replace').partition(SEPARADOR_SHA256)[0]
+        membro = MembroZip(nome, modo, formato, sha256)
+        membro.metodo = anterior.compress_type
+        membro.crc = anterior.CRC
+        membro.comprimido = anterior.compress_size
+        membro.tamanho = anterior.file_size
+        self._enfileirar('copiar', membro, (zip_anterior, anterior))
+    
+    def _copiar_dados(self, membro: MembroZip, zip_anterior: BinaryIO, anterior: zipfile.ZipInfo):
+        membro.deslocamento = self._arquivo.tell()
+        zip64 = max(membro.tamanho, membro.comprimido) > LIMITE_ZIP64
+        self._arquivo.write(self._cabecalho_local(membro, zip64))
+        
+        # Dados começam após o cabeçalho local do ZIP de origem (nome e extra variáveis)
+        zip_anterior.seek(anterior.header_offset)
+        cabecalho = zip_anterior.read(CABECALHO_LOCAL.size)
+        campos = CABECALHO_LOCAL.unpack(cabecalho)
+        if campos[0] != ASSINATURA_LOCAL:
+            raise zipfile.BadZipFile(f"Cabeçalho local inválido: {anterior.filename}")
+        zip_anterior.seek(campos[9] + campos[10], 1)
+        restante = membro.comprimido
+        while restante:
+            dados = zip_anterior.read(min(restante, TAMANHO_BLOCO))
+            if not dados:
+                raise zipfile.BadZipFile(f"Membro truncado: {anterior.filename}")
+            self._arquivo.write(dados)
+            restante -= len(dados)
+        self.membros.append(membro)
+    
+    def _registro_central(self, membro: MembroZip) -> bytes:
+        nome = membro.nome.encode('utf-8')
+        extra = []
+        comprimido, tamanho, deslocamento = membro.comprimido, membro.tamanho, membro.deslocamento
+        if tamanho > LIMITE_ZIP64:
+            extra.append(tamanho)
+            tamanho = 0xFFFFFFFF
+        if comprimido > LIMITE_ZIP64:
+            extra.append(comprimido)
+            comprimido = 0xFFFFFFFF
+        if deslocamento > LIMITE_ZIP64:
+            extra.append(deslocamento)
+            deslocamento = 0xFFFFFFFF
+        extra = struct.pack(f'<HH{len(extra)}Q', 1, 8 * len(extra), *extra) if extra else b''
+        versao = VERSAO_ZIP64 if extra else VERSAO_CLASSICA
+        return CABECALHO_CENTRAL.pack(
+            ASSINATURA_CENTRAL, SISTEMA_UNIX << 8 | versao, versao, self._flags(membro.nome),
+            membro.metodo, self.hora_dos, self.data_dos, membro.crc, comprimido, tamanho,
+            len(nome), len(extra), len(membro.comentario), 0, 0,
+            (stat.S_IFREG | membro.modo) << 16, deslocamento
+        ) + nome + extra + membro.comentario
+    
+    def fechar(self):
+        """Grava o que falta da fila, o diretório central e o comentário do ZIP e fecha o arquivo."""
+        if len(self.comentario) > 0xFFFF:
+            raise ValueError("Comentário do ZIP acima de 64 KB")
+        while self._fila:
+            self._gravar_proxima()
+        if self._pool is not None:
+            self._pool.shutdown()
+        inicio = self._arquivo.tell()
+        for membro in self.membros:
+            self._arquivo.write(self._registro_central(membro))
+        fim = self._arquivo.tell()
+        tamanho = fim - inicio
+        quantidade = len(self.membros)
+        
+        if quantidade > LIMITE_MEMBROS or inicio > LIMITE_ZIP64 or tamanho > LIMITE_ZIP64:
+            self._arquivo.write(FIM_DIRETORIO_ZIP64.pack(
+                ASSINATURA_FIM_ZIP64, FIM_DIRETORIO_ZIP64.size - 12,
+                SISTEMA_UNIX << 8 | VERSAO_ZIP64, VERSAO_ZIP64, 0, 0,
+                quantidade, quantidade, tamanho, inicio
+            ))
+            self._arquivo.write(LOCALIZADOR_ZIP64.pack(ASSINATURA_LOCALIZADOR_ZIP64, 0, fim, 1))
+            quantidade = min(quantidade, LIMITE_MEMBROS)
+            tamanho = min(tamanho, 0xFFFFFFFF)
+            inicio = min(inicio, 0xFFFFFFFF)
+        self._arquivo.write(FIM_DIRETORIO.pack(
+            ASSINATURA_FIM, 0, 0, quantidade, quantidade, tamanho, inicio, len(self.comentario)
+        ))
+        self._arquivo.write(self.comentario)
+        self._arquivo.close()
+    
+    def __enter__(self) -> 'EscritorZip':
+        return self
+    
+    def __exit__(self, tipo, *_):
+        if tipo is None:
+            self.fechar()
+        else:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+            self._arquivo.close()